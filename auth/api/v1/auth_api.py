@@ -1,19 +1,22 @@
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from auth.api.v1.oauth.base_oauth_router import vk_router, yandex_router
 from auth.core.decorators import validate_roles
-from auth.db.crud import AccessLogRepository
+from auth.db.crud import AccessLogRepository, UserRepository
 from auth.db.postgres import get_session
 from auth.db.redis_db import get_redis
+from auth.schemas.access_log_schema import AccessLogCursor, AccessLogPageResponse
 from auth.schemas.auth_schema import (
     AuthRequest,
     CurrentUserResponse,
     LogoutResponse,
+    PermissionsVersionsRequest,
+    PermissionsVersionsResponse,
     TokenResponse
 )
 from auth.schemas.entity import UserCreate
@@ -22,6 +25,7 @@ from auth.schemas.password_schema import (
     PasswordChangeResponse
 )
 from auth.services.auth_service import AuthService
+from auth.services.password_hasher import PasswordHasherOverloaded
 from auth.services.token_service import TokenService
 
 router = APIRouter(
@@ -37,6 +41,15 @@ router = APIRouter(
 oauth2_scheme = HTTPBearer()
 
 
+def hashing_overloaded(e: PasswordHasherOverloaded) -> HTTPException:
+    """Ответ при сбросе нагрузки пулом хеширования паролей"""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=str(e),
+        headers={"Retry-After": str(e.retry_after)},
+    )
+
+
 async def get_auth_service(
     session: AsyncSession = Depends(get_session), redis_cli: Redis = Depends(get_redis)
 ) -> AuthService:
@@ -66,6 +79,8 @@ async def login(
         )
 
         return TokenResponse(**tokens)
+    except PasswordHasherOverloaded as e:
+        raise hashing_overloaded(e)
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
 
@@ -120,6 +135,8 @@ async def register(
             auth_request.username, auth_request.password
         )
         return TokenResponse(**tokens)
+    except PasswordHasherOverloaded as e:
+        raise hashing_overloaded(e)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -131,9 +148,15 @@ async def register(
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(oauth2_scheme),
     token_service: TokenService = Depends(get_token_service),
+    from_claims: bool = Query(
+        False,
+        description="Ответить только по проверенным claims токена, без обращения к БД",
+    ),
 ) -> CurrentUserResponse:
     try:
-        user_data = await token_service.get_current_user(credentials.credentials)
+        user_data = await token_service.get_current_user(
+            credentials.credentials, from_claims=from_claims
+        )
         if not user_data:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found"
@@ -146,6 +169,35 @@ async def get_current_user(
         )
 
 
+@router.post(
+    "/permissions_versions",
+    response_model=PermissionsVersionsResponse,
+    summary="Текущие версии прав пользователей",
+    description=(
+        "Возвращает текущую permissions_version для списка пользователей. "
+        "Сервис, закэшировавший права по claim permissions_version из токена, "
+        "сверяет версию одним запросом вместо повторной загрузки пользователя "
+        "и ролей. Неизвестные пользователи в ответ не попадают. "
+        "Доступно только ролям admin и service."
+    ),
+)
+async def get_permissions_versions(
+    request: PermissionsVersionsRequest,
+    session: AsyncSession = Depends(get_session),
+    current_user=Depends(validate_roles(["admin", "service"])),
+) -> PermissionsVersionsResponse:
+    try:
+        versions = await UserRepository(session).get_permissions_versions(
+            request.user_ids
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to get permissions versions. " + str(e),
+        )
+    return PermissionsVersionsResponse(versions=versions)
+
+
 @router.patch(
     "/change_password",
     response_model=PasswordChangeResponse,
@@ -154,7 +206,7 @@ async def get_current_user(
 async def change_password(
     change_password_request: PasswordChangeRequest,
     auth_service: AuthService = Depends(get_auth_service),
-    current_user=validate_roles(),
+    current_user=Depends(validate_roles()),
 ):
     try:
         await auth_service.change_password(
@@ -162,6 +214,8 @@ async def change_password(
             old_password=change_password_request.current_password,
             new_password=change_password_request.new_password,
         )
+    except PasswordHasherOverloaded as e:
+        raise hashing_overloaded(e)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -169,16 +223,38 @@ async def change_password(
         )
 
 
-@router.get("/access_logs", dependencies=[Depends(oauth2_scheme)])
+@router.get(
+    "/access_logs",
+    response_model=AccessLogPageResponse,
+    dependencies=[Depends(oauth2_scheme)],
+)
 async def get_access_logs(
-    page: int,
-    access_log: AccessLogRepository = Depends(get_session),
-    current_user=validate_roles(),
-):
+    cursor: Optional[str] = Query(
+        None, description="next_cursor из предыдущей страницы"
+    ),
+    limit: int = Query(10, ge=1, le=100),
+    session: AsyncSession = Depends(get_session),
+    current_user=Depends(validate_roles()),
+) -> AccessLogPageResponse:
     try:
-        return await access_log.get_user_logs(current_user["id"], page)
+        after = AccessLogCursor.decode(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    try:
+        logs = await AccessLogRepository(session).get_user_logs(
+            current_user["id"],
+            limit=limit,
+            after=(after.accessed_at, after.id) if after else None,
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to get logs. " + str(e),
         )
+
+    next_cursor = None
+    if len(logs) == limit:
+        last = logs[-1]
+        next_cursor = AccessLogCursor(accessed_at=last.accessed_at, id=last.id).encode()
+    return AccessLogPageResponse(items=logs, next_cursor=next_cursor)
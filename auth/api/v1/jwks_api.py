@@ -0,0 +1,28 @@
+import hashlib
+
+from fastapi import APIRouter, Request, Response, status
+
+from auth.core.config import TokenConfig
+from auth.services.token_service import key_ring
+
+router = APIRouter()
+
+# Набор ключей меняется только при перезапуске: ответ собирается один раз
+JWKS_BODY = key_ring.jwks_json if key_ring is not None else b'{"keys":[]}'
+JWKS_HEADERS = {
+    "Cache-Control": f"public, max-age={TokenConfig().jwks_max_age}",
+    "ETag": f'"{hashlib.sha256(JWKS_BODY).hexdigest()[:32]}"',
+}
+
+
+@router.get("/.well-known/jwks.json", include_in_schema=False)
+async def get_jwks(request: Request) -> Response:
+    """
+    Публичные ключи проверки токенов (RFC 7517).
+
+    Сервисы кэшируют документ по Cache-Control и перечитывают его, только
+    встретив токен с незнакомым kid. При HS256 список ключей пуст.
+    """
+    if request.headers.get("if-none-match") == JWKS_HEADERS["ETag"]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=JWKS_HEADERS)
+    return Response(content=JWKS_BODY, media_type="application/json", headers=JWKS_HEADERS)
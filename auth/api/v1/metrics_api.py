@@ -0,0 +1,21 @@
+from typing import Dict
+
+from fastapi import APIRouter, Depends, status
+
+from auth.core.decorators import validate_roles
+from auth.core.metrics import collect_metrics
+
+router = APIRouter(
+    responses={
+        status.HTTP_401_UNAUTHORIZED: {"description": "Unauthorized"},
+        status.HTTP_403_FORBIDDEN: {"description": "Forbidden"},
+    }
+)
+
+
+@router.get("/")
+async def get_metrics(
+    current_user=Depends(validate_roles(["admin"])),
+) -> Dict[str, Dict]:
+    """Внутренние метрики воркера: кэши, пулы соединений, фоновые задачи"""
+    return collect_metrics()
@@ -1,5 +1,5 @@
 import uuid
-from typing import List
+from typing import Dict, List, Optional
 
 from fastapi import (
     APIRouter,
@@ -13,10 +13,15 @@ from fastapi import (
 
 from auth.core.decorators import validate_roles
 from auth.schemas.role_schema import (
+    BulkRoleAssignmentResponse,
     CreateRoleResponse,
     RoleListResponse,
+    RoleMembersPage,
     RoleResponse,
     UpdateRoleRequest,
+    UserAssignmentResult,
+    UserAssignmentStatus,
+    UserBrief,
     UserRoleAssignment
 )
 from auth.services.role_service import RoleService, logger
@@ -31,6 +36,20 @@ router = APIRouter(
 )
 
 
+def bulk_assignment_response(
+    role_id: uuid.UUID, results: Dict[uuid.UUID, UserAssignmentStatus]
+) -> BulkRoleAssignmentResponse:
+    changed = {UserAssignmentStatus.ASSIGNED, UserAssignmentStatus.REMOVED}
+    return BulkRoleAssignmentResponse(
+        role_id=role_id,
+        changed=sum(1 for result in results.values() if result in changed),
+        results=[
+            UserAssignmentResult(user_id=user_id, status=result)
+            for user_id, result in results.items()
+        ],
+    )
+
+
 @router.get("/", response_model=RoleListResponse)
 async def get_roles(
     current_user=Depends(validate_roles(["admin"])),
@@ -150,9 +169,12 @@ async def delete_role(
 
 @router.post(
     "/{role_id}/users",
-    status_code=status.HTTP_204_NO_CONTENT,
+    response_model=BulkRoleAssignmentResponse,
     summary="Назначить роль пользователям",
-    description="Назначает роль списку пользователей по их идентификаторам.",
+    description=(
+        "Назначает роль списку пользователей по их идентификаторам "
+        "и возвращает результат по каждому пользователю."
+    ),
 )
 async def assign_users_to_role(
     current_user=Depends(validate_roles(["admin"])),
@@ -161,20 +183,16 @@ async def assign_users_to_role(
     role_service: RoleService = Depends(),
 ):
     try:
-        role = await role_service.get_by_id(role_id)
-        if not role:
+        results = await role_service.assign_role_to_users(
+            role_id, assignment.user_ids, assigned_by=current_user.get("id")
+        )
+        if results is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Role with ID {role_id} not found",
             )
 
-        for user_id in assignment.user_ids:
-            success = await role_service.give_role_to_user(user_id, role_id)
-            if not success:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Failed to assign role to user {user_id}",
-                )
+        return bulk_assignment_response(role_id, results)
     except HTTPException:
         raise
     except Exception as e:
@@ -186,9 +204,12 @@ async def assign_users_to_role(
 
 @router.delete(
     "/{role_id}/users",
-    status_code=status.HTTP_204_NO_CONTENT,
+    response_model=BulkRoleAssignmentResponse,
     summary="Удалить роль у пользователей",
-    description="Удаляет роль у списка пользователей по их идентификаторам.",
+    description=(
+        "Удаляет роль у списка пользователей по их идентификаторам "
+        "и возвращает результат по каждому пользователю."
+    ),
 )
 async def remove_users_from_role(
     current_user=Depends(validate_roles(["admin"])),
@@ -197,20 +218,14 @@ async def remove_users_from_role(
     role_service: RoleService = Depends(),
 ):
     try:
-        role = await role_service.get_by_id(role_id)
-        if not role:
+        results = await role_service.remove_role_from_users(role_id, assignment.user_ids)
+        if results is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Role with ID {role_id} not found",
             )
 
-        for user_id in assignment.user_ids:
-            success = await role_service.delete_role_from_user(user_id, role_id)
-            if not success:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Failed to remove role from user {user_id}",
-                )
+        return bulk_assignment_response(role_id, results)
     except HTTPException:
         raise
     except Exception as e:
@@ -251,12 +266,25 @@ async def create_role(
         )
 
 
-@router.get("/{role_id}/users", response_model=UserRoleAssignment)
+@router.get(
+    "/{role_id}/users",
+    response_model=RoleMembersPage,
+    summary="Участники роли",
+    description=(
+        "Постраничный список пользователей с ролью. Общее число участников "
+        "возвращается на первой странице, следующая страница запрашивается "
+        "с cursor из next_cursor."
+    ),
+)
 async def get_users_by_role(
     current_user=Depends(validate_roles(["admin"])),
     role_id: uuid.UUID = Path(..., description="UUID роли"),
+    cursor: Optional[uuid.UUID] = Query(
+        None, description="Курсор следующей страницы (next_cursor)"
+    ),
+    limit: int = Query(100, ge=1, le=1000, description="Размер страницы"),
     role_service: RoleService = Depends(),
-):
+) -> RoleMembersPage:
     try:
         role = await role_service.get_by_id(role_id)
         if not role:
@@ -265,8 +293,18 @@ async def get_users_by_role(
                 detail=f"Role with ID {role_id} not found",
             )
 
-        users = await role_service.get_users_by_role(role_id)
-        return [user["id"] for user in users]
+        members, total = await role_service.get_role_members(
+            role_id, limit=limit, after=cursor
+        )
+        return RoleMembersPage(
+            role_id=role_id,
+            member_count=total,
+            items=[
+                UserBrief(id=user_id, username=username)
+                for user_id, username in members
+            ],
+            next_cursor=members[-1][0] if len(members) == limit else None,
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -276,7 +314,7 @@ async def get_users_by_role(
         )
 
 
-@router.get("/me/roles", response_model=RoleListResponse)
+@router.get("/me/roles", response_model=List[RoleResponse])
 async def get_current_user_roles(
     current_user=Depends(validate_roles()), role_service: RoleService = Depends()
 ):
@@ -290,7 +328,7 @@ async def get_current_user_roles(
         )
 
 
-@router.get("/users/{user_id}/roles", response_model=RoleListResponse)
+@router.get("/users/{user_id}/roles", response_model=List[RoleResponse])
 async def get_user_roles(
     current_user=Depends(validate_roles(["admin"])),
     user_id: uuid.UUID = Path(..., description="UUID пользователя"),
@@ -0,0 +1,116 @@
+"""
+Бенчмарк задержек логина и /me при хешировании паролей.
+
+Одновременно идут логины (проверка пароля werkzeug) и поток легких
+запросов /me (проверка подписи JWT). Сравниваются прежняя схема, где
+check_password_hash выполняется прямо в event loop, и PasswordHasher
+с ограниченным пулом потоков. Печатаются p50/p99 задержек обоих типов
+запросов и число логинов, отклоненных при переполнении очереди.
+
+Запуск из корня репозитория:
+    python -m auth.benchmarks.password_hashing
+"""
+
+import asyncio
+import time
+import uuid
+from typing import List
+
+import jwt
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from auth.services.password_hasher import PasswordHasher, PasswordHasherOverloaded
+
+LOGINS = 64
+LOGIN_CONCURRENCY = 16
+ME_CONCURRENCY = 32
+SECRET = "benchmark_secret_key"
+PASSWORD = "benchmark_password"
+
+
+def percentile(samples: List[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * q))] * 1000
+
+
+async def me_traffic(token: str, latencies: List[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        # Отдаем управление, как при обычном I/O запроса
+        await asyncio.sleep(0)
+        jwt.decode(token, SECRET, algorithms=["HS256"])
+        latencies.append(time.perf_counter() - started)
+        await asyncio.sleep(0.001)
+
+
+async def inline_login(password_hash: str) -> None:
+    await asyncio.sleep(0)
+    check_password_hash(password_hash, PASSWORD)
+
+
+async def run(label: str, login, password_hash: str) -> None:
+    token = jwt.encode(
+        {"sub": str(uuid.uuid4()), "exp": int(time.time()) + 3600},
+        SECRET,
+        algorithm="HS256",
+    )
+    me_latencies: List[float] = []
+    login_latencies: List[float] = []
+    rejected = 0
+    stop = asyncio.Event()
+    semaphore = asyncio.Semaphore(LOGIN_CONCURRENCY)
+
+    async def one_login() -> None:
+        nonlocal rejected
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await login(password_hash)
+            except PasswordHasherOverloaded:
+                rejected += 1
+                return
+            login_latencies.append(time.perf_counter() - started)
+
+    me_tasks = [
+        asyncio.create_task(me_traffic(token, me_latencies, stop))
+        for _ in range(ME_CONCURRENCY)
+    ]
+    started = time.perf_counter()
+    await asyncio.gather(*(one_login() for _ in range(LOGINS)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await asyncio.gather(*me_tasks)
+
+    print(
+        f"{label:<22} logins p50={percentile(login_latencies, 0.5):>7.1f}ms "
+        f"p99={percentile(login_latencies, 0.99):>7.1f}ms  "
+        f"/me p50={percentile(me_latencies, 0.5):>6.2f}ms "
+        f"p99={percentile(me_latencies, 0.99):>7.2f}ms  "
+        f"/me req/sec={len(me_latencies) / elapsed:>8,.0f}  rejected={rejected}"
+    )
+
+
+async def main() -> None:
+    password_hash = generate_password_hash(PASSWORD)
+    single_hash = time.perf_counter()
+    check_password_hash(password_hash, PASSWORD)
+    print(f"one check_password_hash: {(time.perf_counter() - single_hash) * 1000:.1f}ms")
+
+    await run("inline (event loop)", inline_login, password_hash)
+
+    for workers, max_queue in ((4, 64), (4, 4)):
+        hasher = PasswordHasher(workers=workers, max_queue=max_queue)
+        try:
+            await run(
+                f"pool {workers}w/{max_queue}q",
+                lambda h: hasher.verify(h, PASSWORD),
+                password_hash,
+            )
+        finally:
+            hasher.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
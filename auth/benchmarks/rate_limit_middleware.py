@@ -0,0 +1,86 @@
+"""
+Бенчмарк пропускной способности middleware ограничения запросов.
+
+Прогоняет запросы к /api/v1/auth/me через request_limit_middleware для
+каждого алгоритма, с локальным пред-лимитером и без него: обычная
+нагрузка от многих клиентов и поток от одного злоупотребляющего клиента.
+Redis по умолчанию эмулируется fakeredis; для замеров на реальном Redis
+передайте его адрес:
+    python -m auth.benchmarks.rate_limit_middleware redis://localhost:6379/1
+"""
+
+import asyncio
+import sys
+import time
+from typing import Optional
+
+from fakeredis import FakeAsyncRedis
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from redis.asyncio import Redis
+
+from auth.core.middleware.http import request_limit_middleware
+from auth.core.middleware.request_limit import LocalPreLimiter, RequestLimit
+from auth.core.middleware.tracker import RequestTracker
+
+REQUESTS = 5_000
+CLIENTS = 500
+
+
+def build_request(client_ip: str) -> Request:
+    return Request(
+        scope={
+            "type": "http",
+            "headers": [],
+            "method": "GET",
+            "path": "/api/v1/auth/me",
+            "client": (client_ip, 1234),
+        }
+    )
+
+
+async def call_next(request: Request) -> JSONResponse:
+    return JSONResponse(content={"status": "ok"})
+
+
+async def measure(
+    redis: Redis, algorithm: str, pre_limit: bool, clients: int
+) -> None:
+    await redis.flushdb()
+    limiter = RequestLimit(
+        redis,
+        algorithm=algorithm,
+        pre_limiter=LocalPreLimiter() if pre_limit else None,
+    )
+    tracker = RequestTracker()
+    requests = [build_request(f"10.0.{i // 256}.{i % 256}") for i in range(clients)]
+
+    limited = 0
+    start = time.perf_counter()
+    for i in range(REQUESTS):
+        response = await request_limit_middleware(
+            requests[i % clients], call_next, limiter, tracker
+        )
+        limited += response.status_code == 429
+    elapsed = time.perf_counter() - start
+
+    label = f"{algorithm}{' +pre' if pre_limit else ''}"
+    print(
+        f"{label:<18} clients={clients:<4} {REQUESTS / elapsed:>10,.0f} req/sec  "
+        f"({limited} rejected)"
+    )
+
+
+async def main(redis_url: Optional[str]) -> None:
+    redis = Redis.from_url(redis_url) if redis_url else FakeAsyncRedis()
+    try:
+        for clients in (CLIENTS, 1):
+            for algorithm in RequestLimit.ALGORITHMS:
+                for pre_limit in (False, True):
+                    await measure(redis, algorithm, pre_limit, clients)
+    finally:
+        await redis.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1] if len(sys.argv) > 1 else None))
@@ -0,0 +1,179 @@
+"""
+Регрессионный бенчмарк чтения ролей при миллионе участников.
+
+В базе создается роль с MEMBERS участниками и сравнивается прежнее
+чтение роли с selectinload(Role.users) с текущими облегченными запросами
+RoleService: get_by_id, get_all, get_user_roles, постраничным списком
+участников (первая и последняя страницы) и их подсчетом. Все данные
+создаются в одной транзакции и откатываются в конце, поэтому нужна
+любая база с примененными миграциями (настройки POSTGRES_* как у сервиса).
+
+Если облегченный запрос выходит за LEAN_BUDGET_MS, бенчмарк завершается
+с ошибкой, так что его можно запускать как проверку регрессии.
+
+Запуск из корня репозитория:
+    python -m auth.benchmarks.role_members
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from typing import Awaitable, Callable, List
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import selectinload
+
+from auth.core.config import config
+from auth.models.role import Role
+from auth.services.role_service import RoleService
+
+MEMBERS = 1_000_000
+ITERATIONS = 20
+EAGER_ITERATIONS = 3
+PAGE_SIZE = 100
+LEAN_BUDGET_MS = 100.0
+
+
+async def seed(session: AsyncSession, role_id: uuid.UUID) -> uuid.UUID:
+    await session.execute(
+        text(
+            "INSERT INTO roles (id, name, description, is_active, is_deleted, "
+            "created_at, updated_at) "
+            "VALUES (:id, :name, 'benchmark', true, false, now(), now())"
+        ),
+        {"id": role_id, "name": f"bench_{role_id.hex[:8]}"},
+    )
+    await session.execute(
+        text(
+            "INSERT INTO users (id, username, is_superuser, is_active, "
+            "created_at, updated_at) "
+            "SELECT gen_random_uuid(), :prefix || i, false, true, now(), now() "
+            "FROM generate_series(1, :members) AS i"
+        ),
+        {"prefix": f"bench_{role_id.hex[:8]}_", "members": MEMBERS},
+    )
+    await session.execute(
+        text(
+            "INSERT INTO user_roles (user_id, role_id, assigned_at, "
+            "created_at, updated_at) "
+            "SELECT id, :role_id, now(), now(), now() FROM users "
+            "WHERE username LIKE :pattern"
+        ),
+        {"role_id": role_id, "pattern": f"bench_{role_id.hex[:8]}_%"},
+    )
+    await session.execute(text("ANALYZE users"))
+    await session.execute(text("ANALYZE user_roles"))
+    last_member = await session.scalar(
+        text(
+            "SELECT user_id FROM user_roles WHERE role_id = :role_id "
+            "ORDER BY user_id DESC OFFSET :offset LIMIT 1"
+        ),
+        {"role_id": role_id, "offset": PAGE_SIZE},
+    )
+    return last_member
+
+
+async def measure(
+    session: AsyncSession, query: Callable[[], Awaitable], iterations: int
+) -> List[float]:
+    samples = []
+    for _ in range(iterations):
+        # Каждый прогон читает из базы, а не из identity map сессии
+        session.expunge_all()
+        started = time.perf_counter()
+        await query()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def report(label: str, samples: List[float]) -> float:
+    median = statistics.median(samples)
+    print(f"{label:<40} median {median:9.2f} ms   max {max(samples):9.2f} ms")
+    return median
+
+
+async def main() -> None:
+    engine = create_async_engine(config.db_url)
+    role_id = uuid.uuid4()
+    over_budget = []
+
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        session = AsyncSession(bind=connection, join_transaction_mode="create_savepoint")
+        try:
+            started = time.perf_counter()
+            deep_cursor = await seed(session, role_id)
+            print(
+                f"Seeded role with {MEMBERS} members "
+                f"in {time.perf_counter() - started:.1f}s\n"
+            )
+            service = RoleService(session, None)
+            members = service.user_role_repository
+            member_id = await session.scalar(
+                text("SELECT user_id FROM user_roles WHERE role_id = :role_id LIMIT 1"),
+                {"role_id": role_id},
+            )
+
+            async def eager_get_by_id():
+                stmt = (
+                    select(Role)
+                    .options(selectinload(Role.users))
+                    .where(Role.id == role_id)
+                )
+                return (await session.execute(stmt)).scalar_one()
+
+            async def eager_get_all():
+                stmt = select(Role).options(selectinload(Role.users)).limit(100)
+                return (await session.execute(stmt)).scalars().all()
+
+            report(
+                "get_by_id, selectinload(Role.users)",
+                await measure(session, eager_get_by_id, EAGER_ITERATIONS),
+            )
+            report(
+                "get_all, selectinload(Role.users)",
+                await measure(session, eager_get_all, EAGER_ITERATIONS),
+            )
+            print()
+
+            lean = {
+                "get_by_id": lambda: service.get_by_id(role_id),
+                "get_all": lambda: service.get_all(limit=100),
+                "get_user_roles": lambda: service.get_user_roles(member_id),
+                "members, first page": lambda: members.get_role_members(
+                    role_id, limit=PAGE_SIZE
+                ),
+                "members, last page": lambda: members.get_role_members(
+                    role_id, limit=PAGE_SIZE, after=deep_cursor
+                ),
+            }
+            for label, query in lean.items():
+                median = report(label, await measure(session, query, ITERATIONS))
+                if median > LEAN_BUDGET_MS:
+                    over_budget.append(label)
+
+            # Подсчет идет только с первой страницей; в бенчмарке он медленнее,
+            # чем в проде: в незафиксированной транзакции index-only скан
+            # все равно читает heap, поэтому в бюджет он не входит
+            report(
+                "member count",
+                await measure(
+                    session, lambda: members.count_role_members(role_id), ITERATIONS
+                ),
+            )
+        finally:
+            await session.close()
+            await transaction.rollback()
+
+    await engine.dispose()
+
+    if over_budget:
+        print(f"\nOver {LEAN_BUDGET_MS} ms budget: {', '.join(over_budget)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
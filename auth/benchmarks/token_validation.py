@@ -0,0 +1,89 @@
+"""
+Микробенчмарк валидации access-токенов.
+
+Сравнивает прежнюю схему (подпись проверяется дважды: в проверке
+черного списка и при декодировании) с текущим TokenService.validate_token,
+который декодирует токен один раз, — без кэша claims и с ним.
+
+Запуск из корня репозитория:
+    python -m auth.benchmarks.token_validation
+"""
+
+import asyncio
+import time
+import uuid
+from unittest.mock import AsyncMock
+
+import jwt
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from auth.services.token_service import TokenService, VerifiedClaimsCache
+
+ITERATIONS = 20_000
+
+
+class FakeRedis:
+    """Минимальная замена Redis: пустой черный список, breaker закрыт."""
+
+    async def get(self, key: str):
+        return None
+
+    async def evalsha(self, sha: str, numkeys: int, *keys_and_args):
+        return b"CLOSED"
+
+    async def exists(self, key: str) -> int:
+        return 0
+
+
+def build_service(claims_cache: VerifiedClaimsCache) -> TokenService:
+    service = TokenService(
+        FakeRedis(), AsyncMock(spec=AsyncSession), claims_cache=claims_cache
+    )
+    service.config.secret_key = "benchmark_secret_key"
+    service.config.algorithm = "HS256"
+    return service
+
+
+async def legacy_validate(service: TokenService, token: str) -> dict:
+    """Прежний путь: отдельный decode для черного списка и для payload."""
+    blacklist_payload = jwt.decode(
+        token,
+        service.config.secret_key,
+        algorithms=[service.config.algorithm],
+        options={"verify_exp": False},
+    )
+    await service.redis_client.exists(f"blacklist_token:{blacklist_payload['jti']}")
+    return jwt.decode(
+        token,
+        service.config.secret_key,
+        algorithms=[service.config.algorithm],
+        options={"require": ["exp", "iat", "jti"]},
+    )
+
+
+async def measure(name: str, validate, token: str) -> float:
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        await validate(token)
+    elapsed = time.perf_counter() - start
+    rate = ITERATIONS / elapsed
+    print(f"{name:<12} {rate:>12,.0f} tokens/sec")
+    return rate
+
+
+async def main() -> None:
+    service = build_service(VerifiedClaimsCache(maxsize=0))
+    cached_service = build_service(VerifiedClaimsCache())
+    token = await service.create_access_token(
+        user_id=uuid.uuid4(), username="bench", is_superuser=False, roles=["user"]
+    )
+
+    legacy = service.circuit_breaker(legacy_validate)
+    before = await measure("before", lambda t: legacy(service, t), token)
+    after = await measure("after", service.validate_token, token)
+    cached = await measure("cached", cached_service.validate_token, token)
+    print(f"speedup      {after / before:>12.2f}x (cached {cached / before:.2f}x)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
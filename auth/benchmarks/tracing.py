@@ -0,0 +1,151 @@
+"""
+Бенчмарк накладных расходов трассировки запросов.
+
+Прогоняет запросы через ASGI приложения FastAPI с тем же http-middleware,
+что и в auth (request id и дополнение span), в нескольких режимах:
+трассировка выключена, прежняя схема (span send/receive от инструментации
+и пустой span в RequestTracker на каждый запрос) и единый серверный span
+при разных долях сэмплирования. Span экспортируются пакетно в экспортер,
+который их отбрасывает, так что сеть и Jaeger в замер не входят.
+
+Запуск из корня репозитория:
+    python -m auth.benchmarks.tracing
+"""
+
+import asyncio
+import time
+from typing import Optional, Sequence
+
+from fastapi import FastAPI, Request
+from opentelemetry import trace
+from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    SpanExporter,
+    SpanExportResult
+)
+from opentelemetry.trace.propagation.tracecontext import (
+    TraceContextTextMapPropagator
+)
+
+from auth.core.config import TracingSettings
+from auth.core.middleware.tracker import RequestTracker
+from auth.core.tracer import build_sampler
+
+REQUESTS = 10_000
+PATH = "/api/v1/auth/me"
+
+
+class DroppingExporter(SpanExporter):
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        return SpanExportResult.SUCCESS
+
+
+class LegacyRequestTracker(RequestTracker):
+    """Прежний setup_tracing: копия заголовков и пустой span на каждый запрос"""
+
+    def __init__(self, provider: TracerProvider):
+        super().__init__()
+        self.tracer = provider.get_tracer(__name__)
+        self.propagator = TraceContextTextMapPropagator()
+
+    def setup_tracing(self, request: Request, request_id: str) -> None:
+        context = self.propagator.extract(carrier=dict(request.headers))
+        with self.tracer.start_as_current_span(
+            f"{request.method} {request.url.path}",
+            context=context,
+            kind=trace.SpanKind.SERVER,
+        ) as span:
+            span.set_attribute("request_id", request_id)
+            span.set_attribute("http.method", request.method)
+            span.set_attribute("http.url", str(request.url))
+            span.set_attribute("http.target", request.url.path)
+
+
+def build_app(mode: str, ratio: Optional[float]) -> FastAPI:
+    app = FastAPI()
+    provider = None
+    tracker = RequestTracker()
+
+    if mode != "off":
+        provider = TracerProvider(
+            sampler=build_sampler(TracingSettings(TRACE_SAMPLE_RATIO=ratio))
+        )
+        provider.add_span_processor(BatchSpanProcessor(DroppingExporter()))
+        if mode == "legacy":
+            tracker = LegacyRequestTracker(provider)
+
+    @app.middleware("http")
+    async def middleware(request: Request, call_next):
+        request_id = tracker.get_or_generate_request_id(request)
+        tracker.setup_tracing(request, request_id)
+        response = await call_next(request)
+        response.headers["X-Request-Id"] = request_id
+        return response
+
+    @app.get(PATH)
+    async def me():
+        return {"status": "ok"}
+
+    if mode == "legacy":
+        FastAPIInstrumentor.instrument_app(app, tracer_provider=provider)
+    elif mode == "unified":
+        FastAPIInstrumentor.instrument_app(
+            app, tracer_provider=provider, exclude_spans=["receive", "send"]
+        )
+    return app
+
+
+async def measure(label: str, app: FastAPI) -> float:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": PATH,
+        "raw_path": PATH.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"auth"), (b"x-request-id", b"benchmark")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("auth", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(dict(scope), receive, send)
+
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        await app(dict(scope), receive, send)
+    elapsed = time.perf_counter() - start
+
+    per_request = elapsed / REQUESTS * 1_000_000
+    print(
+        f"{label:<22} {REQUESTS / elapsed:>10,.0f} req/sec  "
+        f"{per_request:7.1f} us/req"
+    )
+    return per_request
+
+
+async def main() -> None:
+    baseline = await measure("tracing off", build_app("off", None))
+    cases = [
+        ("legacy, ratio 1.0", "legacy", 1.0),
+        ("unified, ratio 1.0", "unified", 1.0),
+        ("unified, ratio 0.1", "unified", 0.1),
+        ("unified, ratio 0.0", "unified", 0.0),
+    ]
+    for label, mode, ratio in cases:
+        per_request = await measure(label, build_app(mode, ratio))
+        print(f"{'':<22} overhead {per_request - baseline:+7.1f} us/req")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,13 +1,16 @@
-import asyncio
+import hashlib
 import json
 import logging
+import time
 from datetime import UTC, datetime
 from enum import Enum
 from functools import wraps
-from typing import Callable, Optional
+from typing import Callable, Dict, List, Optional, Tuple, Type
 from uuid import UUID
 
+from fastapi import HTTPException
 from redis.asyncio import Redis
+from redis.exceptions import NoScriptError
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +21,78 @@ class CircuitState(Enum):
     HALF_OPEN = "HALF_OPEN"
 
 
+# Переход OPEN -> HALF_OPEN по истечении recovery_timeout.
+# KEYS: state, last_failure, half_open_tries; ARGV: now, recovery_timeout
+ACQUIRE_SCRIPT = """
+local state = redis.call('GET', KEYS[1])
+if state == 'OPEN' then
+    local last_failure = tonumber(redis.call('GET', KEYS[2]) or '0')
+    if tonumber(ARGV[1]) - last_failure > tonumber(ARGV[2]) then
+        redis.call('SET', KEYS[1], 'HALF_OPEN')
+        redis.call('SET', KEYS[3], '0')
+        return 'HALF_OPEN'
+    end
+    return 'OPEN'
+end
+return state or 'CLOSED'
+"""
+
+# Успешный вызов в HALF_OPEN: после half_open_max_tries успехов -> CLOSED.
+# KEYS: state, failures, half_open_tries; ARGV: half_open_max_tries
+SUCCESS_SCRIPT = """
+local state = redis.call('GET', KEYS[1]) or 'CLOSED'
+if state ~= 'HALF_OPEN' then
+    return state
+end
+local tries = redis.call('INCR', KEYS[3])
+if tries >= tonumber(ARGV[1]) then
+    redis.call('SET', KEYS[1], 'CLOSED')
+    redis.call('DEL', KEYS[2], KEYS[3])
+    return 'CLOSED'
+end
+return 'HALF_OPEN'
+"""
+
+# Сбой: счетчик живет recovery_timeout секунд, при достижении порога
+# или сбое в HALF_OPEN цепь размыкается.
+# KEYS: state, failures, last_failure; ARGV: failure_threshold, now, window
+FAILURE_SCRIPT = """
+local failures = redis.call('INCR', KEYS[2])
+if failures == 1 then
+    redis.call('EXPIRE', KEYS[2], ARGV[3])
+end
+local state = redis.call('GET', KEYS[1]) or 'CLOSED'
+if state == 'HALF_OPEN' or failures >= tonumber(ARGV[1]) then
+    redis.call('SET', KEYS[1], 'OPEN')
+    redis.call('SET', KEYS[3], ARGV[2])
+    return 'OPEN'
+end
+return state
+"""
+
+_SCRIPT_SHAS = {
+    script: hashlib.sha1(script.encode()).hexdigest()
+    for script in (ACQUIRE_SCRIPT, SUCCESS_SCRIPT, FAILURE_SCRIPT)
+}
+
+
 class AsyncCircuitBreaker:
+    """
+    Circuit breaker with state shared between workers through Redis.
+
+    Every state transition is a single Lua script call. A CLOSED state seen
+    in Redis is remembered in-process for ``state_cache_ttl`` seconds, so
+    the happy path does not touch the network at all; a worker therefore
+    notices a breaker opened by another worker with at most that delay.
+
+    Client errors (``HTTPException`` with a 4xx status) and exceptions listed
+    in ``ignored_exceptions`` are re-raised without counting as failures:
+    they say nothing about the health of the protected dependency.
+    """
+
+    # Локальный кэш состояния CLOSED: prefix -> момент истечения (monotonic)
+    _closed_until: Dict[str, float] = {}
+
     def __init__(
         self,
         redis: Redis,
@@ -27,6 +101,8 @@ class AsyncCircuitBreaker:
         recovery_timeout: int = 60,
         half_open_max_tries: int = 3,
         cache_ttl: int = 300,
+        state_cache_ttl: float = 1.0,
+        ignored_exceptions: Tuple[Type[BaseException], ...] = (),
     ):
         self.redis = redis
         self.service_name = service_name
@@ -34,6 +110,8 @@ class AsyncCircuitBreaker:
         self.recovery_timeout = recovery_timeout
         self.half_open_max_tries = half_open_max_tries
         self.cache_ttl = cache_ttl
+        self.state_cache_ttl = state_cache_ttl
+        self.ignored_exceptions = ignored_exceptions
 
         self._prefix = f"circuit_breaker:{service_name}"
         self.state_key = f"{self._prefix}:state"
@@ -41,11 +119,49 @@ class AsyncCircuitBreaker:
         self.last_failure_key = f"{self._prefix}:last_failure"
         self.half_open_tries_key = f"{self._prefix}:half_open_tries"
 
+    @classmethod
+    def reset_local_state(cls) -> None:
+        """Сбрасывает локальный кэш состояний (для тестов)"""
+        cls._closed_until.clear()
+
     async def get_state(self) -> CircuitState:
         """Получение текущего состояния"""
         state = await self.redis.get(self.state_key)
         return CircuitState(state.decode()) if state else CircuitState.CLOSED
 
+    def _is_locally_closed(self) -> bool:
+        return self._closed_until.get(self._prefix, 0.0) > time.monotonic()
+
+    def _remember_state(self, state: CircuitState) -> None:
+        if state == CircuitState.CLOSED and self.state_cache_ttl > 0:
+            self._closed_until[self._prefix] = time.monotonic() + self.state_cache_ttl
+        else:
+            self._closed_until.pop(self._prefix, None)
+
+    async def _run_script(
+        self, script: str, keys: List[str], args: List
+    ) -> CircuitState:
+        """Выполняет Lua-скрипт за один запрос (EVALSHA с откатом на EVAL)"""
+        try:
+            result = await self.redis.evalsha(
+                _SCRIPT_SHAS[script], len(keys), *keys, *args
+            )
+        except NoScriptError:
+            result = await self.redis.eval(script, len(keys), *keys, *args)
+
+        if isinstance(result, bytes):
+            result = result.decode()
+        state = CircuitState(result)
+        self._remember_state(state)
+        return state
+
+    async def _acquire(self) -> CircuitState:
+        return await self._run_script(
+            ACQUIRE_SCRIPT,
+            [self.state_key, self.last_failure_key, self.half_open_tries_key],
+            [time.time(), self.recovery_timeout],
+        )
+
     async def _get_cached_token(self, user_id: str) -> Optional[dict]:
         """Получение токена из кэша"""
         cache_key = f"auth_token_cache:{user_id}"
@@ -61,20 +177,37 @@ class AsyncCircuitBreaker:
         await self.redis.setex(cache_key, self.cache_ttl, json.dumps(token_data))
         logger.debug(f"Cached token for user {user_id}")
 
-    async def _record_failure(self):
-        """Запись информации о сбое"""
-        current_time = asyncio.get_event_loop().time()
-
-        failures = await self.redis.get(self.failures_key)
-        current_failures = int(failures.decode()) if failures else 0
-        current_failures += 1
-
-        await self.redis.set(self.failures_key, str(current_failures))
+    def _is_failure(self, error: Exception) -> bool:
+        """Считается ли исключение сбоем защищаемой зависимости"""
+        if isinstance(error, self.ignored_exceptions):
+            return False
+        if isinstance(error, HTTPException) and error.status_code < 500:
+            return False
+        return True
 
-        if current_failures >= self.failure_threshold:
-            await self.redis.set(self.state_key, CircuitState.OPEN.value)
-            await self.redis.set(self.last_failure_key, str(current_time))
-            logger.warning(f"Circuit breaker opened after {current_failures} failures")
+    async def _record_failure(self) -> CircuitState:
+        """Запись информации о сбое"""
+        state = await self._run_script(
+            FAILURE_SCRIPT,
+            [self.state_key, self.failures_key, self.last_failure_key],
+            [self.failure_threshold, time.time(), self.recovery_timeout],
+        )
+        if state == CircuitState.OPEN:
+            logger.warning(f"Circuit breaker {self.service_name} is open")
+        return state
+
+    async def _record_success(self) -> CircuitState:
+        """Запись успешного вызова в состоянии HALF_OPEN"""
+        state = await self._run_script(
+            SUCCESS_SCRIPT,
+            [self.state_key, self.failures_key, self.half_open_tries_key],
+            [self.half_open_max_tries],
+        )
+        if state == CircuitState.CLOSED:
+            logger.info("Circuit breaker closed after successful recovery")
+        else:
+            logger.info("Circuit breaker remains in HALF-OPEN state")
+        return state
 
     async def _get_validate_token_fallback(self) -> dict:
         """Fallback для метода validate_token"""
@@ -157,51 +290,36 @@ class AsyncCircuitBreaker:
     def __call__(self, func: Callable):
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            current_state = await self.get_state()
+            if self._is_locally_closed():
+                current_state = CircuitState.CLOSED
+            else:
+                current_state = await self._acquire()
 
             if current_state == CircuitState.OPEN:
-                last_failure_bytes = await self.redis.get(self.last_failure_key)
-                last_failure = (
-                    float(last_failure_bytes.decode()) if last_failure_bytes else 0
-                )
+                method_name = func.__name__
+                user_id = kwargs.get("user_id")
+                if not user_id and len(args) > 1:
+                    user_id = str(args[1])
+                return await self._handle_fallback(method_name, user_id)
 
-                if (
-                    asyncio.get_event_loop().time() - last_failure
-                    > self.recovery_timeout
-                ):
-                    await self.redis.set(self.state_key, CircuitState.HALF_OPEN.value)
-                    await self.redis.set(self.half_open_tries_key, "0")
-                    logger.info("Circuit breaker entering HALF_OPEN state")
-                else:
-                    method_name = func.__name__
-                    user_id = kwargs.get("user_id")
-                    if not user_id and len(args) > 1:
-                        user_id = str(args[1])
-                    return await self._handle_fallback(method_name, user_id)
+            if current_state == CircuitState.HALF_OPEN:
+                logger.info("Circuit breaker is HALF_OPEN, probing the call")
 
             try:
                 result = await func(*args, **kwargs)
-
-                if current_state == CircuitState.HALF_OPEN:
-                    tries = int(await self.redis.incr(self.half_open_tries_key))
-
-                    if tries >= self.half_open_max_tries:
-                        await self.redis.set(self.state_key, CircuitState.CLOSED.value)
-                        await self.redis.delete(self.failures_key)
-                        logger.info("Circuit breaker closed after successful recovery")
-                    else:
-                        logger.info(
-                            f"Circuit breaker remains in HALF-OPEN state, successful tries: {tries}"
-                        )
-
-                if "user_id" in kwargs:
-                    await self._cache_token(kwargs["user_id"], result)
-
-                return result
-
             except Exception as e:
+                if not self._is_failure(e):
+                    raise e
                 await self._record_failure()
                 logger.error(f"Operation failed: {str(e)}")
                 raise e
 
+            if current_state == CircuitState.HALF_OPEN:
+                await self._record_success()
+
+            if "user_id" in kwargs:
+                await self._cache_token(kwargs["user_id"], result)
+
+            return result
+
         return wrapper
@@ -1,6 +1,6 @@
 import os
 from logging import config as logging_config
-from typing import Optional
+from typing import Dict, Literal, Optional
 
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field
@@ -20,6 +20,18 @@ class RabbitMQSettings(BaseSettings):
     user: str = Field(..., alias="RABBITMQ_USER")
     password: str = Field(..., alias="RABBITMQ_PASS")
     user_created_queue: str = Field(..., alias="RABBIT_USER_CREATED_QUEUE")
+    port: int = Field(default=5672, alias="RABBITMQ_PORT")
+    publisher_channels: int = Field(default=4, alias="RABBITMQ_PUBLISHER_CHANNELS")
+    publisher_outbox_size: int = Field(
+        default=10000, alias="RABBITMQ_PUBLISHER_OUTBOX_SIZE"
+    )
+    publisher_batch_size: int = Field(
+        default=100, alias="RABBITMQ_PUBLISHER_BATCH_SIZE"
+    )
+
+    @property
+    def url(self) -> str:
+        return f"amqp://{self.user}:{self.password}@{self.host}:{self.port}/"
 
     model_config = SettingsConfigDict(
         env_file=".env", env_file_encoding="utf-8", extra="ignore"
@@ -98,10 +110,27 @@ class TokenConfig(BaseSettings):
 
     secret_key: str = Field(..., alias="SECRET_KEY")
     algorithm: str = Field(default="HS256", alias="ALGORITHM")
+    # RS256/EdDSA: каталог с PEM-ключами подписи и kid активного ключа
+    signing_keys_dir: Optional[str] = Field(default=None, alias="JWT_SIGNING_KEYS_DIR")
+    active_kid: Optional[str] = Field(default=None, alias="JWT_ACTIVE_KID")
+    # Принимать HS256-токены без kid, выпущенные до перехода на ключи
+    accept_legacy_hs256: bool = Field(default=False, alias="JWT_ACCEPT_LEGACY_HS256")
+    jwks_max_age: int = Field(default=300, alias="JWKS_MAX_AGE")
     access_token_expire_minutes: int = Field(
         default=30, alias="ACCESS_TOKEN_EXPIRE_MINUTES"
     )
     refresh_token_expire_days: int = Field(default=7, alias="REFRESH_TOKEN_EXPIRE_DAYS")
+    claims_cache_size: int = Field(default=10000, alias="TOKEN_CLAIMS_CACHE_SIZE")
+    user_projection_ttl: int = Field(default=300, alias="USER_PROJECTION_CACHE_TTL")
+    blacklist_filter_capacity: int = Field(
+        default=100000, alias="BLACKLIST_FILTER_CAPACITY"
+    )
+    blacklist_filter_error_rate: float = Field(
+        default=0.01, alias="BLACKLIST_FILTER_ERROR_RATE"
+    )
+    blacklist_filter_rebuild_seconds: int = Field(
+        default=300, alias="BLACKLIST_FILTER_REBUILD_SECONDS"
+    )
 
     model_config = SettingsConfigDict(
         env_file=".env", env_file_encoding="utf-8", extra="ignore"
@@ -114,12 +143,109 @@ class RedisSettings(BaseSettings):
     host: str = Field(default="localhost", alias="REDIS_HOST")
     port: int = Field(default=6379, alias="REDIS_PORT")
     db: int = Field(default=0, alias="REDIS_DATABASES")
+    max_connections: int = Field(default=50, alias="REDIS_MAX_CONNECTIONS")
+    pool_timeout: float = Field(default=5.0, alias="REDIS_POOL_TIMEOUT")
+    health_check_interval: int = Field(default=30, alias="REDIS_HEALTH_CHECK_INTERVAL")
+    socket_connect_timeout: float = Field(
+        default=5.0, alias="REDIS_SOCKET_CONNECT_TIMEOUT"
+    )
 
     model_config = SettingsConfigDict(
         extra="ignore", env_file_encoding="utf-8", populate_by_name=True
     )
 
 
+class RateLimitSettings(BaseSettings):
+    """Настройки ограничения частоты запросов к /api/v1/auth."""
+
+    algorithm: Literal["fixed_window", "sliding_log", "gcra"] = Field(
+        default="gcra", alias="RATE_LIMIT_ALGORITHM"
+    )
+    pre_limit_enabled: bool = Field(default=True, alias="RATE_LIMIT_PRE_LIMIT")
+    pre_limit_factor: float = Field(default=2.0, alias="RATE_LIMIT_PRE_LIMIT_FACTOR")
+    pre_limit_max_keys: int = Field(
+        default=100000, alias="RATE_LIMIT_PRE_LIMIT_MAX_KEYS"
+    )
+
+    model_config = SettingsConfigDict(
+        env_file=".env", env_file_encoding="utf-8", extra="ignore"
+    )
+
+
+class AccessLogSettings(BaseSettings):
+    """Настройки пакетной записи журнала входов."""
+
+    batch_size: int = Field(default=500, alias="ACCESS_LOG_BATCH_SIZE")
+    flush_interval: float = Field(default=1.0, alias="ACCESS_LOG_FLUSH_INTERVAL")
+    max_buffer: int = Field(default=50000, alias="ACCESS_LOG_MAX_BUFFER")
+    retention_months: int = Field(default=12, alias="ACCESS_LOG_RETENTION_MONTHS")
+    partitions_ahead: int = Field(default=3, alias="ACCESS_LOG_PARTITIONS_AHEAD")
+    retention_interval: int = Field(
+        default=86400, alias="ACCESS_LOG_RETENTION_INTERVAL"
+    )
+
+    model_config = SettingsConfigDict(
+        env_file=".env", env_file_encoding="utf-8", extra="ignore"
+    )
+
+
+class OutboxSettings(BaseSettings):
+    """Настройки фоновой отправки событий из таблицы outbox_events."""
+
+    relay_enabled: bool = Field(default=True, alias="OUTBOX_RELAY_ENABLED")
+    batch_size: int = Field(default=100, alias="OUTBOX_RELAY_BATCH_SIZE")
+    poll_interval: float = Field(default=1.0, alias="OUTBOX_RELAY_POLL_INTERVAL")
+
+    model_config = SettingsConfigDict(
+        env_file=".env", env_file_encoding="utf-8", extra="ignore"
+    )
+
+
+class PasswordHashingSettings(BaseSettings):
+    """Настройки пула потоков для хеширования паролей."""
+
+    workers: int = Field(default=4, alias="PASSWORD_HASH_WORKERS")
+    max_queue: int = Field(default=64, alias="PASSWORD_HASH_MAX_QUEUE")
+    retry_after: int = Field(default=1, alias="PASSWORD_HASH_RETRY_AFTER")
+
+    model_config = SettingsConfigDict(
+        env_file=".env", env_file_encoding="utf-8", extra="ignore"
+    )
+
+
+class DatabasePoolSettings(BaseSettings):
+    """Настройки пула соединений с Postgres (на один процесс воркера)."""
+
+    pool_size: int = Field(default=5, alias="DB_POOL_SIZE")
+    max_overflow: int = Field(default=5, alias="DB_MAX_OVERFLOW")
+    pool_timeout: float = Field(default=10, alias="DB_POOL_TIMEOUT")
+    pool_recycle: int = Field(default=1800, alias="DB_POOL_RECYCLE")
+    pool_pre_ping: bool = Field(default=True, alias="DB_POOL_PRE_PING")
+    echo: bool = Field(default=False, alias="DB_ECHO")
+    query_cache_size: int = Field(default=500, alias="DB_QUERY_CACHE_SIZE")
+    # 0 — за pgbouncer в режиме transaction
+    statement_cache_size: int = Field(default=100, alias="DB_STATEMENT_CACHE_SIZE")
+
+    model_config = SettingsConfigDict(
+        env_file=".env", env_file_encoding="utf-8", extra="ignore"
+    )
+
+
+class TracingSettings(BaseSettings):
+    """Настройки трассировки: один серверный span на запрос с head-сэмплированием."""
+
+    enabled: bool = Field(default=True, alias="TRACING_ENABLED")
+    sample_ratio: float = Field(default=1.0, ge=0, le=1, alias="TRACE_SAMPLE_RATIO")
+    # JSON: префикс пути -> доля трассируемых запросов, например {"/api/v1/metrics": 0}
+    route_sample_ratios: Dict[str, float] = Field(
+        default_factory=dict, alias="TRACE_ROUTE_SAMPLE_RATIOS"
+    )
+
+    model_config = SettingsConfigDict(
+        env_file=".env", env_file_encoding="utf-8", extra="ignore"
+    )
+
+
 class Config(BaseSettings):
     """Модель валидирующая конфиги из .env файла."""
 
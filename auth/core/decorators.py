@@ -3,6 +3,8 @@ from typing import Callable, List, Optional
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from auth.db.postgres import get_session
 from auth.db.redis_db import get_redis
@@ -11,12 +13,16 @@ from auth.services.token_service import TokenService
 oauth2_scheme = HTTPBearer()
 
 
+async def get_token_service(
+    session: AsyncSession = Depends(get_session), redis: Redis = Depends(get_redis)
+) -> TokenService:
+    return TokenService(redis, session)
+
+
 def validate_roles(required_roles: Optional[List[str]] = None):
     async def validate_token(
         credentials: HTTPAuthorizationCredentials = Depends(oauth2_scheme),
-        token_service: TokenService = Depends(
-            lambda: TokenService(get_redis(), get_session())
-        ),
+        token_service: TokenService = Depends(get_token_service),
     ):
         try:
             user = await token_service.get_current_user(credentials.credentials)
@@ -0,0 +1,16 @@
+from typing import Callable, Dict
+
+MetricsProvider = Callable[[], Dict]
+
+# Реестр поставщиков метрик процесса (кэши, пулы соединений, фоновые задачи)
+_providers: Dict[str, MetricsProvider] = {}
+
+
+def register_metrics(name: str, provider: MetricsProvider) -> None:
+    """Регистрирует функцию, возвращающую текущие значения метрик компонента"""
+    _providers[name] = provider
+
+
+def collect_metrics() -> Dict[str, Dict]:
+    """Собирает метрики всех зарегистрированных компонентов"""
+    return {name: provider() for name, provider in _providers.items()}
@@ -3,7 +3,9 @@ from typing import Callable
 from fastapi import FastAPI, Request, Response, status
 from fastapi.responses import ORJSONResponse
 
-from .request_limit import RequestLimit
+from auth.core.config import RateLimitSettings
+
+from .request_limit import LocalPreLimiter, RequestLimit
 from .tracker import RequestTracker
 
 
@@ -47,7 +49,15 @@ async def request_limit_middleware(
 
 def setup_middleware(app: FastAPI, redis_client) -> None:
 
-    limiter = RequestLimit(redis_client)
+    settings = RateLimitSettings()
+    pre_limiter = None
+    if settings.pre_limit_enabled:
+        pre_limiter = LocalPreLimiter(
+            factor=settings.pre_limit_factor, max_keys=settings.pre_limit_max_keys
+        )
+    limiter = RequestLimit(
+        redis_client, algorithm=settings.algorithm, pre_limiter=pre_limiter
+    )
     tracker = RequestTracker()
 
     @app.middleware("http")
@@ -1,4 +1,5 @@
 import time
+from collections import OrderedDict
 from typing import Callable, Optional
 from uuid import uuid4
 
@@ -6,15 +7,109 @@ from fastapi import FastAPI, Request, Response, status
 from fastapi.responses import ORJSONResponse
 from redis.asyncio import Redis
 
+# Скользящий журнал запросов в ZSET.
+# KEYS: log; ARGV: now_ms, window_ms, max_requests, member
+SLIDING_LOG_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local max_requests = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, now - window)
+local count = redis.call('ZCARD', KEYS[1])
+if count >= max_requests then
+    return {1, 0}
+end
+redis.call('ZADD', KEYS[1], now, ARGV[4])
+redis.call('PEXPIRE', KEYS[1], window)
+return {0, max_requests - count - 1}
+"""
+
+# GCRA (token bucket): в ключе хранится theoretical arrival time.
+# KEYS: tat; ARGV: now_ms, emission_interval_ms, burst_ms
+GCRA_SCRIPT = """
+local now = tonumber(ARGV[1])
+local interval = tonumber(ARGV[2])
+local burst = tonumber(ARGV[3])
+local tat = tonumber(redis.call('GET', KEYS[1]) or ARGV[1])
+if tat < now then
+    tat = now
+end
+local new_tat = tat + interval
+if new_tat - burst > now then
+    return {1, 0}
+end
+redis.call('SET', KEYS[1], new_tat, 'PX', math.ceil(new_tat - now))
+return {0, math.floor((burst - (new_tat - now)) / interval)}
+"""
+
+
+class LocalPreLimiter:
+    """
+    In-process counter that rejects obviously abusive clients without Redis.
+
+    A key is rejected locally only when this worker alone has seen more than
+    ``factor`` times the global limit within the window, so requests the
+    shared limiter would allow are never rejected here.
+    """
+
+    def __init__(self, factor: float = 2.0, max_keys: int = 100000):
+        self.factor = factor
+        self.max_keys = max_keys
+        self._windows: OrderedDict[str, tuple[int, int]] = OrderedDict()
+
+    def is_abusive(self, key: str, max_requests: int, window: int) -> bool:
+        current_window = int(time.time()) // window
+        started, count = self._windows.get(key, (current_window, 0))
+        if started != current_window:
+            started, count = current_window, 0
+
+        count += 1
+        self._windows[key] = (started, count)
+        self._windows.move_to_end(key)
+        if len(self._windows) > self.max_keys:
+            self._windows.popitem(last=False)
+
+        return count > max_requests * self.factor
+
 
 class RequestLimit:
 
-    def __init__(self, redis_client: Redis, prefix: str = "rate_limit"):
+    ALGORITHMS = ("fixed_window", "sliding_log", "gcra")
+
+    def __init__(
+        self,
+        redis_client: Redis,
+        prefix: str = "rate_limit",
+        algorithm: str = "fixed_window",
+        pre_limiter: Optional[LocalPreLimiter] = None,
+    ):
+        if algorithm not in self.ALGORITHMS:
+            raise ValueError(f"Unknown rate limit algorithm: {algorithm}")
+
         self.redis_client = redis_client
         self.prefix = prefix
+        self.algorithm = algorithm
+        self.pre_limiter = pre_limiter
+
+        self._script = None
+        if algorithm == "sliding_log":
+            self._script = redis_client.register_script(SLIDING_LOG_SCRIPT)
+        elif algorithm == "gcra":
+            self._script = redis_client.register_script(GCRA_SCRIPT)
 
     async def is_rate_limit(
         self, key: str, max_requests: int, window: int
+    ) -> tuple[bool, int]:
+        if self.pre_limiter and self.pre_limiter.is_abusive(key, max_requests, window):
+            return True, 0
+
+        if self.algorithm == "sliding_log":
+            return await self._sliding_log(key, max_requests, window)
+        if self.algorithm == "gcra":
+            return await self._gcra(key, max_requests, window)
+        return await self._fixed_window(key, max_requests, window)
+
+    async def _fixed_window(
+        self, key: str, max_requests: int, window: int
     ) -> tuple[bool, int]:
         current_time = int(time.time())
 
@@ -29,3 +124,21 @@ class RequestLimit:
         remaining = max_requests - count
 
         return count > max_requests, remaining
+
+    async def _sliding_log(
+        self, key: str, max_requests: int, window: int
+    ) -> tuple[bool, int]:
+        now_ms = int(time.time() * 1000)
+        is_limited, remaining = await self._script(
+            keys=[f"{self.prefix}:log:{key}"],
+            args=[now_ms, window * 1000, max_requests, f"{now_ms}:{uuid4().hex}"],
+        )
+        return bool(is_limited), int(remaining)
+
+    async def _gcra(self, key: str, max_requests: int, window: int) -> tuple[bool, int]:
+        window_ms = window * 1000
+        is_limited, remaining = await self._script(
+            keys=[f"{self.prefix}:gcra:{key}"],
+            args=[int(time.time() * 1000), window_ms / max_requests, window_ms],
+        )
+        return bool(is_limited), int(remaining)
@@ -3,16 +3,11 @@ from uuid import uuid4
 
 from fastapi import Request
 from opentelemetry import trace
-from opentelemetry.trace.propagation.tracecontext import (
-    TraceContextTextMapPropagator
-)
 
 
 class RequestTracker:
 
     def __init__(self):
-        self.tracer = trace.get_tracer(__name__)
-        self.propagator = TraceContextTextMapPropagator()
         self.logger = getLogger(__name__)
 
     def get_or_generate_request_id(self, request: Request) -> str:
@@ -22,15 +17,8 @@ class RequestTracker:
         return request_id
 
     def setup_tracing(self, request: Request, request_id: str) -> None:
-
-        context = self.propagator.extract(carrier=dict(request.headers))
-
-        with self.tracer.start_as_current_span(
-            f"{request.method} {request.url.path}",
-            context=context,
-            kind=trace.SpanKind.SERVER,
-        ) as span:
+        # Серверный span запроса открывает FastAPIInstrumentor, здесь он только
+        # дополняется; для несэмплированного запроса span не записывается
+        span = trace.get_current_span()
+        if span.is_recording():
             span.set_attribute("request_id", request_id)
-            span.set_attribute("http.method", request.method)
-            span.set_attribute("http.url", str(request.url))
-            span.set_attribute("http.target", request.url.path)
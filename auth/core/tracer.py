@@ -1,20 +1,97 @@
-from core.config import config
+from typing import Dict, Optional, Sequence
+
 from opentelemetry import trace
+from opentelemetry.context import Context
 from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
     OTLPSpanExporter
 )
 from opentelemetry.sdk.resources import Resource
 from opentelemetry.sdk.trace import TracerProvider
 from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from opentelemetry.sdk.trace.sampling import (
+    ParentBased,
+    Sampler,
+    SamplingResult,
+    TraceIdRatioBased
+)
+from opentelemetry.trace import Link, SpanKind
+from opentelemetry.trace.span import TraceState
+from opentelemetry.util.types import Attributes
+
+from auth.core.config import TracingSettings, config
+
+
+class RouteRatioSampler(Sampler):
+    """
+    Head sampling with a ratio per request path.
+
+    The ratio of the longest matching path prefix from ``route_ratios``
+    applies, ``default_ratio`` otherwise. The path is taken from the
+    attributes the ASGI instrumentation passes when it starts the server
+    span; spans without a path use the default.
+    """
+
+    def __init__(self, default_ratio: float, route_ratios: Dict[str, float]):
+        self.default = TraceIdRatioBased(default_ratio)
+        self.routes = sorted(
+            (
+                (prefix, TraceIdRatioBased(ratio))
+                for prefix, ratio in route_ratios.items()
+            ),
+            key=lambda route: len(route[0]),
+            reverse=True,
+        )
+
+    def sampler_for(self, attributes: Attributes) -> Sampler:
+        path = None
+        if attributes:
+            path = attributes.get("http.target") or attributes.get("url.path")
+        if path:
+            for prefix, sampler in self.routes:
+                if path.startswith(prefix):
+                    return sampler
+        return self.default
+
+    def should_sample(
+        self,
+        parent_context: Optional[Context],
+        trace_id: int,
+        name: str,
+        kind: Optional[SpanKind] = None,
+        attributes: Attributes = None,
+        links: Optional[Sequence[Link]] = None,
+        trace_state: Optional[TraceState] = None,
+    ) -> SamplingResult:
+        return self.sampler_for(attributes).should_sample(
+            parent_context, trace_id, name, kind, attributes, links, trace_state
+        )
+
+    def get_description(self) -> str:
+        routes = ", ".join(
+            f"{prefix}={sampler.rate}" for prefix, sampler in self.routes
+        )
+        return f"RouteRatioSampler{{default={self.default.rate}, {routes}}}"
+
+
+def build_sampler(settings: TracingSettings) -> Sampler:
+    # Решение принимается на корневом span; входящий traceparent его задает
+    return ParentBased(
+        root=RouteRatioSampler(settings.sample_ratio, settings.route_sample_ratios)
+    )
+
 
+def configure_tracer(settings: Optional[TracingSettings] = None) -> bool:
+    """Install the Jaeger tracer provider; False when tracing is disabled"""
+    settings = settings or TracingSettings()
+    if not settings.enabled:
+        return False
 
-def configure_tracer() -> None:
     COLLECTOR_ENDPOINT = config.jaeger_collector_endpoint
     COLLECTOR_PORT = config.jaeger_collector_port
     SERVICE_NAME = config.project_name
 
     resource = Resource(attributes={"service.name": SERVICE_NAME})
-    provider = TracerProvider(resource=resource)
+    provider = TracerProvider(resource=resource, sampler=build_sampler(settings))
     processor = BatchSpanProcessor(
         OTLPSpanExporter(
             endpoint=f"http://{COLLECTOR_ENDPOINT}:{COLLECTOR_PORT}/v1/traces"
@@ -23,3 +100,4 @@ def configure_tracer() -> None:
     provider.add_span_processor(processor)
 
     trace.set_tracer_provider(provider)
+    return True
@@ -12,6 +12,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../.
 
 from auth.core.config import config as cf
 from auth.models.access_log import AccessLog
+from auth.models.outbox import OutboxEvent
 from auth.models.role import Role
 from auth.models.user import User
 from auth.models.user_account import UserSocialAccount
@@ -34,7 +35,7 @@ if config.config_file_name is not None:
 
 metadata = MetaData()
 # Добавляем метаданные всех моделей
-for model in [User, Role, UserRole, AccessLog, UserSocialAccount]:
+for model in [User, Role, UserRole, AccessLog, UserSocialAccount, OutboxEvent]:
     for table in model.metadata.tables.values():
         if table.name not in metadata.tables:
             table.to_metadata(metadata)
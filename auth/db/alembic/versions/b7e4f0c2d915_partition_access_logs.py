@@ -0,0 +1,144 @@
+"""partition access_logs by month
+
+Revision ID: b7e4f0c2d915
+Revises: 9f3c1d2a7b4e
+Create Date: 2026-10-17 12:00:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e4f0c2d915"
+down_revision: Union[str, None] = "9f3c1d2a7b4e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Сколько месяцев вперед создаются секции; дальше их ведет AccessLogRetention
+MONTHS_AHEAD = 3
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE access_logs RENAME TO access_logs_legacy")
+    op.execute(
+        "ALTER TABLE access_logs_legacy "
+        "RENAME CONSTRAINT access_logs_pkey TO access_logs_legacy_pkey"
+    )
+    op.execute("DROP INDEX ix_access_logs_user_id")
+    op.execute("DROP INDEX ix_access_logs_accessed_at")
+    op.execute("DROP INDEX ix_access_logs_ip_address")
+
+    op.execute(
+        """
+        CREATE TABLE access_logs (
+            id UUID NOT NULL,
+            user_id UUID,
+            ip_address INET,
+            user_agent TEXT,
+            accessed_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            updated_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            CONSTRAINT access_logs_pkey PRIMARY KEY (id, accessed_at),
+            CONSTRAINT access_logs_user_id_fkey
+                FOREIGN KEY (user_id) REFERENCES users (id)
+        ) PARTITION BY RANGE (accessed_at)
+        """
+    )
+    op.execute("CREATE TABLE access_logs_default PARTITION OF access_logs DEFAULT")
+
+    # Месячные секции от самой старой записи до текущего месяца + MONTHS_AHEAD
+    op.execute(
+        f"""
+        DO $$
+        DECLARE
+            month_start DATE;
+            last_month DATE;
+        BEGIN
+            SELECT date_trunc('month', COALESCE(min(accessed_at), now()))::date
+              INTO month_start
+              FROM access_logs_legacy;
+            last_month := (
+                date_trunc('month', now()) + interval '{MONTHS_AHEAD} months'
+            )::date;
+
+            WHILE month_start <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF access_logs '
+                    'FOR VALUES FROM (%L) TO (%L)',
+                    'access_logs_' || to_char(month_start, 'YYYY_MM'),
+                    month_start,
+                    (month_start + interval '1 month')::date
+                );
+                month_start := (month_start + interval '1 month')::date;
+            END LOOP;
+        END $$
+        """
+    )
+
+    op.execute(
+        """
+        INSERT INTO access_logs
+            (id, user_id, ip_address, user_agent, accessed_at, created_at, updated_at)
+        SELECT id, user_id, ip_address, user_agent, accessed_at, created_at, updated_at
+          FROM access_logs_legacy
+        """
+    )
+    op.execute("DROP TABLE access_logs_legacy")
+
+    op.create_index(
+        "ix_access_logs_user_id_accessed_at_id",
+        "access_logs",
+        ["user_id", "accessed_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_access_logs_accessed_at", "access_logs", ["accessed_at"], unique=False
+    )
+    op.create_index(
+        "ix_access_logs_ip_address", "access_logs", ["ip_address"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE access_logs_plain (
+            id UUID NOT NULL,
+            user_id UUID,
+            ip_address INET,
+            user_agent TEXT,
+            accessed_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            updated_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            CONSTRAINT access_logs_plain_pkey PRIMARY KEY (id),
+            CONSTRAINT access_logs_id_key UNIQUE (id),
+            CONSTRAINT access_logs_user_id_fkey
+                FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO access_logs_plain
+            (id, user_id, ip_address, user_agent, accessed_at, created_at, updated_at)
+        SELECT id, user_id, ip_address, user_agent, accessed_at, created_at, updated_at
+          FROM access_logs
+        """
+    )
+    # Секции удаляются вместе с родительской таблицей
+    op.execute("DROP TABLE access_logs")
+    op.execute("ALTER TABLE access_logs_plain RENAME TO access_logs")
+    op.execute(
+        "ALTER TABLE access_logs "
+        "RENAME CONSTRAINT access_logs_plain_pkey TO access_logs_pkey"
+    )
+
+    op.create_index("ix_access_logs_user_id", "access_logs", ["user_id"], unique=False)
+    op.create_index(
+        "ix_access_logs_accessed_at", "access_logs", ["accessed_at"], unique=False
+    )
+    op.create_index(
+        "ix_access_logs_ip_address", "access_logs", ["ip_address"], unique=False
+    )
@@ -0,0 +1,34 @@
+"""index user_roles by (role_id, user_id)
+
+Revision ID: d4a8e1f6c302
+Revises: b7e4f0c2d915
+Create Date: 2026-10-17 15:00:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d4a8e1f6c302"
+down_revision: Union[str, None] = "b7e4f0c2d915"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Составной индекс заменяет индекс по role_id: постраничный список
+    # участников роли и их подсчет выполняются index-only сканом
+    op.create_index(
+        "ix_user_roles_role_id_user_id",
+        "user_roles",
+        ["role_id", "user_id"],
+        unique=False,
+    )
+    op.drop_index("ix_user_roles_role_id", table_name="user_roles")
+
+
+def downgrade() -> None:
+    op.create_index("ix_user_roles_role_id", "user_roles", ["role_id"], unique=False)
+    op.drop_index("ix_user_roles_role_id_user_id", table_name="user_roles")
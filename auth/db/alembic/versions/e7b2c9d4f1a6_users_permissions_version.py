@@ -0,0 +1,32 @@
+"""add users.permissions_version
+
+Revision ID: e7b2c9d4f1a6
+Revises: d4a8e1f6c302
+Create Date: 2026-10-17 17:00:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e7b2c9d4f1a6"
+down_revision: Union[str, None] = "d4a8e1f6c302"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Значение по умолчанию константное: столбец добавляется без перезаписи таблицы
+    op.add_column(
+        "users",
+        sa.Column(
+            "permissions_version", sa.BigInteger(), nullable=False, server_default="0"
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("users", "permissions_version")
@@ -1,14 +1,29 @@
 # auth/db/crud.py
 from datetime import datetime
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar
+from typing import Any, Dict, Generic, List, Optional, Set, Tuple, Type, TypeVar
 from uuid import UUID
 
-from sqlalchemy import and_, delete, func, select, update
+from sqlalchemy import (
+    and_,
+    any_,
+    bindparam,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    tuple_,
+    update
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, selectinload
 
 from auth.models.access_log import AccessLog
 from auth.models.base_models import SocialProvider
+from auth.models.outbox import OutboxEvent
 from auth.models.role import Role
 from auth.models.user import User
 from auth.models.user_account import UserSocialAccount
@@ -114,6 +129,40 @@ class UserRepository(BaseRepository[User]):
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def get_existing_ids(self, user_ids: List[UUID]) -> Set[UUID]:
+        """Возвращает те из переданных идентификаторов, что есть в таблице"""
+        stmt = select(self.model.id).where(self.model.id == any_(user_ids))
+        result = await self.session.execute(stmt)
+        return set(result.scalars().all())
+
+    async def get_permissions_versions(self, user_ids: List[UUID]) -> Dict[UUID, int]:
+        stmt = select(self.model.id, self.model.permissions_version).where(
+            self.model.id == any_(user_ids)
+        )
+        result = await self.session.execute(stmt)
+        return {user_id: version for user_id, version in result.all()}
+
+    async def bump_permissions_version(self, user_ids: List[UUID]) -> None:
+        """Увеличивает версию прав пользователей; фиксирует вызывающий"""
+        if not user_ids:
+            return
+        stmt = (
+            update(self.model)
+            .where(self.model.id == any_(list(user_ids)))
+            .values(permissions_version=self.model.permissions_version + 1)
+        )
+        await self.session.execute(stmt)
+
+    async def bump_role_permissions_version(self, role_id: UUID) -> None:
+        """Увеличивает версию прав всех участников роли; фиксирует вызывающий"""
+        members = select(UserRole.user_id).where(UserRole.role_id == role_id)
+        stmt = (
+            update(self.model)
+            .where(self.model.id.in_(members))
+            .values(permissions_version=self.model.permissions_version + 1)
+        )
+        await self.session.execute(stmt)
+
     async def get_with_roles(self, user_id: Mapped[UUID]) -> Optional[User]:
         stmt = (
             select(self.model)
@@ -128,20 +177,17 @@ class RoleRepository(BaseRepository[Role]):
     def __init__(self, session: AsyncSession):
         super().__init__(Role, session)
 
+    # Участники роли не загружаются: у роли "user" их столько же, сколько
+    # пользователей. Для них есть UserRoleRepository.get_role_members
+
     async def get_by_name(self, name: str) -> Optional[Role]:
-        stmt = (
-            select(self.model)
-            .options(selectinload(self.model.users))
-            .where(self.model.name == name)
-        )
+        stmt = select(self.model).where(self.model.name == name)
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
     async def get_active_roles(self) -> List[Role]:
-        stmt = (
-            select(self.model)
-            .options(selectinload(self.model.users))  # Всегда загружаем пользователей
-            .where(and_(self.model.is_active == True, self.model.is_deleted == False))
+        stmt = select(self.model).where(
+            and_(self.model.is_active == True, self.model.is_deleted == False)
         )
         result = await self.session.execute(stmt)
         return result.scalars().all()
@@ -156,6 +202,34 @@ class UserRoleRepository(BaseRepository[UserRole]):
         result = await self.session.execute(stmt)
         return result.scalars().all()
 
+    async def get_role_members(
+        self, role_id: UUID, limit: int = 100, after: Optional[UUID] = None
+    ) -> List[Tuple[UUID, str]]:
+        """
+        Страница участников роли (id, username) по возрастанию user_id.
+        Keyset по индексу (role_id, user_id): глубина страницы не влияет
+        на время запроса.
+        """
+        stmt = (
+            select(UserRole.user_id, User.username)
+            .join(User, User.id == UserRole.user_id)
+            .where(UserRole.role_id == role_id)
+            .order_by(UserRole.user_id)
+            .limit(limit)
+        )
+        if after is not None:
+            stmt = stmt.where(UserRole.user_id > after)
+        result = await self.session.execute(stmt)
+        return [tuple(row) for row in result.all()]
+
+    async def count_role_members(self, role_id: UUID) -> int:
+        stmt = (
+            select(func.count())
+            .select_from(UserRole)
+            .where(UserRole.role_id == role_id)
+        )
+        return (await self.session.execute(stmt)).scalar_one()
+
     async def assign_role(
         self, user_id: UUID, role_id: UUID, assigned_by: Optional[UUID] = None
     ) -> UserRole:
@@ -166,22 +240,82 @@ class UserRoleRepository(BaseRepository[UserRole]):
         }
         return await self.create(user_role_data)
 
+    async def add_role_to_users(
+        self, role_id: UUID, user_ids: List[UUID], assigned_by: Optional[UUID] = None
+    ) -> Set[UUID]:
+        """
+        Назначает роль всем пользователям одним INSERT ... ON CONFLICT DO NOTHING.
+        Возвращает пользователей, которым роль назначена этим запросом.
+        Транзакцию не фиксирует.
+        """
+        now = datetime.utcnow()
+        rows = select(
+            func.unnest(bindparam("user_ids", user_ids, type_=ARRAY(PG_UUID))),
+            literal(role_id, PG_UUID),
+            literal(now),
+            literal(assigned_by, PG_UUID),
+            literal(now),
+            literal(now),
+        )
+        stmt = (
+            pg_insert(self.model)
+            .from_select(
+                [
+                    "user_id",
+                    "role_id",
+                    "assigned_at",
+                    "assigned_by",
+                    "created_at",
+                    "updated_at",
+                ],
+                rows,
+            )
+            .on_conflict_do_nothing(index_elements=["user_id", "role_id"])
+            .returning(self.model.user_id)
+        )
+        result = await self.session.execute(stmt)
+        return set(result.scalars().all())
+
+    async def remove_role_from_users(
+        self, role_id: UUID, user_ids: List[UUID]
+    ) -> Set[UUID]:
+        """
+        Снимает роль со всех пользователей одним DELETE.
+        Возвращает пользователей, у которых роль была. Транзакцию не фиксирует.
+        """
+        stmt = (
+            delete(self.model)
+            .where(
+                self.model.role_id == role_id, self.model.user_id == any_(user_ids)
+            )
+            .returning(self.model.user_id)
+        )
+        result = await self.session.execute(stmt)
+        return set(result.scalars().all())
+
 
 class AccessLogRepository(BaseRepository[AccessLog]):
     def __init__(self, session: AsyncSession):
         super().__init__(AccessLog, session)
 
     async def get_user_logs(
-        self, user_id: UUID, page: int = 1, page_size: int = 10
+        self,
+        user_id: UUID,
+        limit: int = 10,
+        after: Optional[Tuple[datetime, UUID]] = None,
     ) -> List[AccessLog]:
-        offset = (page - 1) * page_size
-        stmt = (
-            select(self.model)
-            .where(self.model.user_id == user_id)
-            .order_by(self.model.accessed_at.desc())
-            .limit(page_size)
-            .offset(offset)
-        )
+        """
+        Keyset-пагинация журнала пользователя от новых записей к старым.
+        after - (accessed_at, id) последней записи предыдущей страницы.
+        """
+        stmt = select(self.model).where(self.model.user_id == user_id)
+        if after is not None:
+            stmt = stmt.where(
+                tuple_(self.model.accessed_at, self.model.id) < tuple_(*after)
+            )
+        stmt = stmt.order_by(
+            self.model.accessed_at.desc(), self.model.id.desc()
+        ).limit(limit)
         result = await self.session.execute(stmt)
         return result.scalars().all()
 
@@ -195,6 +329,13 @@ class AccessLogRepository(BaseRepository[AccessLog]):
         }
         return await self.create(log_data)
 
+    async def create_many(self, logs: List[Dict[str, Any]]) -> None:
+        """Вставляет пачку записей одним многострочным INSERT"""
+        if not logs:
+            return
+        await self.session.execute(insert(self.model).values(logs))
+        await self.session.commit()
+
 
 class SocialAccountRepository(BaseRepository[UserSocialAccount]):
     def __init__(self, session: AsyncSession):
@@ -227,3 +368,31 @@ class SocialAccountRepository(BaseRepository[UserSocialAccount]):
         )
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
+
+
+class OutboxRepository(BaseRepository[OutboxEvent]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(OutboxEvent, session)
+
+    def add(
+        self, event_type: str, routing_key: str, payload: Dict[str, Any]
+    ) -> OutboxEvent:
+        """Добавляет событие в текущую транзакцию, не фиксируя ее"""
+        event = OutboxEvent(event_type, routing_key, payload)
+        self.session.add(event)
+        return event
+
+    async def claim_batch(self, limit: int) -> List[OutboxEvent]:
+        """Блокирует самые старые события; занятые другим воркером пропускаются"""
+        stmt = (
+            select(self.model)
+            .order_by(self.model.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def delete_published(self, event_ids: List[int]) -> None:
+        stmt = delete(self.model).where(self.model.id.in_(event_ids))
+        await self.session.execute(stmt)
@@ -0,0 +1,134 @@
+"""
+Фабрика асинхронных движков SQLAlchemy с настраиваемым пулом.
+
+Размер пула задается на процесс: при gunicorn с N воркерами сервис держит
+до N * (pool_size + max_overflow) соединений, и это число должно
+укладываться в max_connections Postgres.
+
+Пул считает, сколько запросы ждут свободное соединение: pool_stats(engine)
+отдает число выдач, суммарное и максимальное ожидание, распределение по
+корзинам и число таймаутов вместе с текущим состоянием пула.
+"""
+
+import time
+from typing import Dict, Type
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+# Верхние границы корзин времени ожидания соединения, секунды
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class PoolWaitStats:
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.buckets = [0] * (len(WAIT_BUCKETS) + 1)
+
+    def observe(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.wait_total += seconds
+        self.wait_max = max(self.wait_max, seconds)
+        for index, bound in enumerate(WAIT_BUCKETS):
+            if seconds <= bound:
+                self.buckets[index] += 1
+                return
+        self.buckets[-1] += 1
+
+    def to_dict(self) -> Dict:
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_seconds_total": round(self.wait_total, 6),
+            "wait_seconds_max": round(self.wait_max, 6),
+            "wait_ms_avg": (
+                round(self.wait_total / self.checkouts * 1000, 3)
+                if self.checkouts
+                else 0.0
+            ),
+            "wait_buckets": {
+                **{
+                    f"le_{bound}": count
+                    for bound, count in zip(WAIT_BUCKETS, self.buckets)
+                },
+                "le_inf": self.buckets[-1],
+            },
+        }
+
+
+def timed_pool_class(stats: PoolWaitStats) -> Type[AsyncAdaptedQueuePool]:
+    """
+    Queue pool measuring how long each checkout waits for a connection.
+
+    The class carries its stats so that a pool recreated by
+    ``engine.dispose()`` keeps reporting into the same counters.
+    """
+
+    class TimedQueuePool(AsyncAdaptedQueuePool):
+        wait_stats = stats
+
+        def _do_get(self):
+            started = time.perf_counter()
+            try:
+                connection = super()._do_get()
+            except PoolTimeoutError:
+                self.wait_stats.timeouts += 1
+                raise
+            self.wait_stats.observe(time.perf_counter() - started)
+            return connection
+
+    return TimedQueuePool
+
+
+def create_engine(
+    url: str,
+    *,
+    pool_size: int = 5,
+    max_overflow: int = 5,
+    pool_timeout: float = 10,
+    pool_recycle: int = 1800,
+    pool_pre_ping: bool = True,
+    echo: bool = False,
+    query_cache_size: int = 500,
+    statement_cache_size: int = 100,
+) -> AsyncEngine:
+    """
+    Create an async engine with a sized, measured connection pool.
+
+    ``query_cache_size`` is SQLAlchemy's compiled statement cache;
+    ``statement_cache_size`` is asyncpg's per-connection prepared
+    statement cache and must be 0 behind pgbouncer in transaction mode.
+    """
+    connect_args = {}
+    if url.startswith("postgresql+asyncpg"):
+        connect_args["prepared_statement_cache_size"] = statement_cache_size
+
+    return create_async_engine(
+        url,
+        echo=echo,
+        poolclass=timed_pool_class(PoolWaitStats()),
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+        pool_recycle=pool_recycle,
+        pool_pre_ping=pool_pre_ping,
+        query_cache_size=query_cache_size,
+        connect_args=connect_args,
+    )
+
+
+def pool_stats(engine: AsyncEngine) -> Dict:
+    pool = engine.pool
+    stats = {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
+    wait_stats = getattr(pool, "wait_stats", None)
+    if wait_stats is not None:
+        stats.update(wait_stats.to_dict())
+    return stats
@@ -1,15 +1,14 @@
-from sqlalchemy.ext.asyncio import (
-    AsyncSession,
-    async_sessionmaker,
-    create_async_engine
-)
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 
-from auth.core.config import config
+from auth.core.config import DatabasePoolSettings, config
+from auth.core.metrics import register_metrics
+from auth.db.engine import create_engine, pool_stats
 
 Base = declarative_base()
 
-engine = create_async_engine(config.db_url, echo=True, future=True)
+engine = create_engine(config.db_url, **DatabasePoolSettings().model_dump())
+register_metrics("db_pool", lambda: pool_stats(engine))
 
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
@@ -1,40 +1,85 @@
 # db/redis_db.py
-from contextlib import asynccontextmanager
-from typing import Optional
+import time
+from typing import Dict, Optional
 
-from redis.asyncio import Redis
+from redis.asyncio import BlockingConnectionPool, Redis
+from redis.exceptions import ConnectionError as RedisConnectionError
 
 from auth.core.config import RedisSettings
+from auth.core.metrics import register_metrics
 
 redis: Optional[Redis] = None
 
 db_settings = RedisSettings()
-DSN = db_settings.model_dump()
+
+
+class InstrumentedConnectionPool(BlockingConnectionPool):
+    """Блокирующий пул соединений, который считает выдачи и время ожидания."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    async def get_connection(self, command_name, *keys, **options):
+        started = time.perf_counter()
+        try:
+            return await super().get_connection(command_name, *keys, **options)
+        except RedisConnectionError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def stats(self) -> Dict:
+        in_use = len(self._in_use_connections)
+        available = len(self._available_connections)
+        return {
+            "max_connections": self.max_connections,
+            "in_use": in_use,
+            "available": available,
+            "created": in_use + available,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_seconds_avg": (
+                self.wait_seconds_total / self.checkouts if self.checkouts else 0.0
+            ),
+            "wait_seconds_max": self.wait_seconds_max,
+        }
+
+
+def create_pool(settings: RedisSettings = db_settings) -> InstrumentedConnectionPool:
+    return InstrumentedConnectionPool(
+        host=settings.host,
+        port=settings.port,
+        db=settings.db,
+        max_connections=settings.max_connections,
+        timeout=settings.pool_timeout,
+        health_check_interval=settings.health_check_interval,
+        socket_connect_timeout=settings.socket_connect_timeout,
+        socket_keepalive=True,
+    )
 
 
 def get_redis() -> Redis:
-    """Redis клиент."""
+    """Redis клиент поверх общего для приложения пула соединений."""
+    global redis
     if redis is None:
-        return Redis(**DSN)
+        pool = create_pool()
+        redis = Redis(connection_pool=pool)
+        register_metrics("redis_pool", pool.stats)
     return redis
 
 
-# @asynccontextmanager
-# async def get_redis() -> Redis:
-#     """Контекстный менеджер для Redis клиента."""
-#     global redis
-#     if redis is None:
-#         redis = Redis(**DSN)
-#     try:
-#         yield redis
-#     finally:
-#         await redis.aclose()
-#         redis = None
-
-
-# await redis.set('key', 'value')  # Положить значение по ключу
-# await redis.expire('key', 10)  # Установить время жизни ключа в секундах
-#
-# # А можно последние две операции сделать за один запрос к Redis.
-# await redis.setex('key', 15, 'value')  # Положить значение по ключу с ограничением времени жизни в секундах
-# value = await redis.get('key')  # Получить значение по ключу
+async def close_redis() -> None:
+    """Закрывает общий клиент и все соединения пула."""
+    global redis
+    if redis is not None:
+        await redis.aclose()
+        await redis.connection_pool.disconnect()
+        redis = None
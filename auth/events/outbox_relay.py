@@ -0,0 +1,114 @@
+import asyncio
+import json
+from datetime import datetime
+from logging import getLogger
+from typing import Callable, Dict, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from auth.db.crud import OutboxRepository
+from auth.events.publisher import OutgoingMessage, RabbitPublisher
+from auth.models.outbox import OutboxEvent
+
+logger = getLogger(__name__)
+
+
+class OutboxRelay:
+    """
+    Background task that moves events from ``outbox_events`` to RabbitMQ.
+
+    Each round locks the oldest ``batch_size`` rows with SKIP LOCKED (so
+    several workers can relay concurrently), publishes them with publisher
+    confirms and deletes only the confirmed rows in the same transaction.
+    Delivery is at-least-once: a crash between the confirm and the commit
+    re-sends the batch, consumers deduplicate by ``message_id``.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        publisher: RabbitPublisher,
+        batch_size: int = 100,
+        poll_interval: float = 1.0,
+    ):
+        self.session_factory = session_factory
+        self.publisher = publisher
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+
+        self._task: Optional[asyncio.Task] = None
+
+        self.relayed = 0
+        self.failed = 0
+        self.errors = 0
+        self.lag_seconds = 0.0
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    @staticmethod
+    def _to_message(event: OutboxEvent) -> OutgoingMessage:
+        return OutgoingMessage(
+            routing_key=event.routing_key,
+            body=json.dumps(event.payload).encode(),
+            headers={"event_type": event.event_type},
+            message_id=str(event.id),
+        )
+
+    async def relay_once(self) -> int:
+        """Отправляет одну пачку событий, возвращает число подтвержденных"""
+        async with self.session_factory() as session:
+            async with session.begin():
+                outbox = OutboxRepository(session)
+                events = await outbox.claim_batch(self.batch_size)
+                if not events:
+                    self.lag_seconds = 0.0
+                    return 0
+
+                self.lag_seconds = (
+                    datetime.utcnow() - events[0].created_at
+                ).total_seconds()
+
+                messages = [self._to_message(event) for event in events]
+                failed = await self.publisher.publish_confirmed(messages)
+                failed_ids = {message.message_id for message in failed}
+
+                published_ids = [
+                    event.id for event in events if str(event.id) not in failed_ids
+                ]
+                if published_ids:
+                    await outbox.delete_published(published_ids)
+
+        self.relayed += len(published_ids)
+        self.failed += len(failed_ids)
+        return len(published_ids)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                relayed = await self.relay_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Outbox relay failed: {str(e)}")
+                relayed = 0
+
+            # Полная пачка означает, что в таблице могут остаться события
+            if relayed < self.batch_size:
+                await asyncio.sleep(self.poll_interval)
+
+    def stats(self) -> Dict:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "lag_seconds": self.lag_seconds,
+            "relayed": self.relayed,
+            "failed": self.failed,
+            "errors": self.errors,
+        }
@@ -0,0 +1,260 @@
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from logging import getLogger
+from typing import Deque, Dict, List, Optional
+
+import aio_pika
+from aio_pika.abc import AbstractChannel, AbstractRobustConnection
+from aio_pika.pool import Pool
+from pamqp.commands import Basic
+
+logger = getLogger(__name__)
+
+
+@dataclass
+class OutgoingMessage:
+    routing_key: str
+    body: bytes
+    content_type: str = "application/json"
+    headers: Dict = field(default_factory=dict)
+    message_id: Optional[str] = None
+    enqueued_at: float = field(default_factory=time.monotonic)
+    attempts: int = 0
+
+
+class RabbitPublisher:
+    """
+    Long-lived RabbitMQ publisher shared by the whole worker.
+
+    Messages are put into a bounded in-memory outbox and returned to the
+    caller immediately. ``channels`` sender tasks drain the outbox in
+    batches: each batch is published on a pooled channel with publisher
+    confirms and all confirms of the batch are awaited together. Messages
+    that were not confirmed (broker down, nack, channel error) go back to
+    the head of the outbox and are retried after ``retry_delay``, so short
+    broker outages do not lose events. When the outbox is full the oldest
+    message is dropped and counted. Sender tasks are started with the first
+    message, so a worker that publishes only through ``publish_confirmed``
+    (the outbox relay) keeps no idle senders.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        channels: int = 4,
+        outbox_size: int = 10000,
+        batch_size: int = 100,
+        retry_delay: float = 1.0,
+        confirm_timeout: float = 10.0,
+    ):
+        self.url = url
+        self.channels = channels
+        self.outbox_size = outbox_size
+        self.batch_size = batch_size
+        self.retry_delay = retry_delay
+        self.confirm_timeout = confirm_timeout
+
+        self._connection: Optional[AbstractRobustConnection] = None
+        self._connect_lock = asyncio.Lock()
+        self._channel_pool: Optional[Pool] = None
+        self._declared_queues: set = set()
+        self._outbox: Deque[OutgoingMessage] = deque()
+        self._has_messages = asyncio.Event()
+        self._workers: List[asyncio.Task] = []
+        self._started = False
+
+        self.published = 0
+        self.failed_batches = 0
+        self.dropped = 0
+        self.batches = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._outbox)
+
+    async def start(self) -> None:
+        """
+        Разрешает отправку; отправители запускаются с первым сообщением,
+        соединение открывается лениво с повторами
+        """
+        self._started = True
+        if self._outbox:
+            self._start_senders()
+
+    def _start_senders(self) -> None:
+        if not self._workers:
+            self._workers = [
+                asyncio.create_task(self._send_forever())
+                for _ in range(self.channels)
+            ]
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """Пытается дослать накопленное за timeout секунд и закрывает соединение"""
+        deadline = time.monotonic() + timeout
+        while self._outbox and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        if self._outbox:
+            logger.warning(f"Dropping {len(self._outbox)} unpublished messages")
+
+        self._started = False
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        if self._channel_pool is not None:
+            await self._channel_pool.close()
+            self._channel_pool = None
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+
+    def publish(
+        self,
+        routing_key: str,
+        body: bytes,
+        content_type: str = "application/json",
+        headers: Optional[Dict] = None,
+    ) -> None:
+        """Кладет сообщение в outbox; подтверждение брокера ждут отправители"""
+        if len(self._outbox) >= self.outbox_size:
+            self._outbox.popleft()
+            self.dropped += 1
+            logger.error("Publisher outbox is full, dropped the oldest message")
+
+        self._outbox.append(
+            OutgoingMessage(
+                routing_key=routing_key,
+                body=body,
+                content_type=content_type,
+                headers=headers or {},
+            )
+        )
+        self._has_messages.set()
+        if self._started:
+            self._start_senders()
+
+    async def publish_confirmed(
+        self, messages: List[OutgoingMessage]
+    ) -> List[OutgoingMessage]:
+        """
+        Публикует сообщения сразу, минуя outbox, и ждет подтверждений.
+        Возвращает сообщения, которые брокер не подтвердил.
+        """
+        try:
+            return await self._publish_batch(messages)
+        except Exception as e:
+            logger.warning(f"RabbitMQ is unavailable: {str(e)}")
+            return list(messages)
+
+    async def _get_connection(self) -> AbstractRobustConnection:
+        async with self._connect_lock:
+            if self._connection is None or self._connection.is_closed:
+                self._connection = await aio_pika.connect_robust(self.url)
+                self._channel_pool = Pool(
+                    self._create_channel, max_size=self.channels
+                )
+                self._declared_queues.clear()
+                logger.info("Connected to RabbitMQ")
+        return self._connection
+
+    async def _create_channel(self) -> AbstractChannel:
+        return await self._connection.channel(publisher_confirms=True)
+
+    def _take_batch(self) -> List[OutgoingMessage]:
+        batch = []
+        while self._outbox and len(batch) < self.batch_size:
+            batch.append(self._outbox.popleft())
+        if not self._outbox:
+            self._has_messages.clear()
+        return batch
+
+    def _requeue(self, messages: List[OutgoingMessage]) -> None:
+        # Возвращаем в голову очереди, сохраняя исходный порядок
+        for message in reversed(messages):
+            message.attempts += 1
+            if len(self._outbox) >= self.outbox_size:
+                self.dropped += 1
+                continue
+            self._outbox.appendleft(message)
+        self._has_messages.set()
+
+    async def _declare(self, channel: AbstractChannel, queue: str) -> None:
+        if queue not in self._declared_queues:
+            await channel.declare_queue(queue, durable=True)
+            self._declared_queues.add(queue)
+
+    async def _publish_one(
+        self, channel: AbstractChannel, message: OutgoingMessage
+    ) -> bool:
+        try:
+            await self._declare(channel, message.routing_key)
+            confirmation = await channel.default_exchange.publish(
+                aio_pika.Message(
+                    body=message.body,
+                    content_type=message.content_type,
+                    headers=message.headers,
+                    message_id=message.message_id,
+                    delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+                ),
+                routing_key=message.routing_key,
+                timeout=self.confirm_timeout,
+            )
+        except Exception as e:
+            logger.warning(f"Failed to publish to {message.routing_key}: {str(e)}")
+            return False
+        return not isinstance(confirmation, (Basic.Nack, Basic.Reject))
+
+    async def _publish_batch(
+        self, batch: List[OutgoingMessage]
+    ) -> List[OutgoingMessage]:
+        """Публикует пачку и возвращает сообщения без подтверждения брокера"""
+        await self._get_connection()
+        async with self._channel_pool.acquire() as channel:
+            if channel.is_closed:
+                await channel.reopen()
+            # Публикуем всю пачку и ждем подтверждения разом
+            confirmed = await asyncio.gather(
+                *(self._publish_one(channel, message) for message in batch)
+            )
+
+        failed = [message for message, ok in zip(batch, confirmed) if not ok]
+        self.published += len(batch) - len(failed)
+        self.batches += 1
+        return failed
+
+    async def _send_forever(self) -> None:
+        while True:
+            await self._has_messages.wait()
+            batch = self._take_batch()
+            if not batch:
+                continue
+            try:
+                failed = await self._publish_batch(batch)
+            except asyncio.CancelledError:
+                self._requeue(batch)
+                raise
+            except Exception as e:
+                logger.warning(f"RabbitMQ is unavailable, will retry: {str(e)}")
+                failed = batch
+
+            if failed:
+                self.failed_batches += 1
+                self._requeue(failed)
+                await asyncio.sleep(self.retry_delay)
+
+    def stats(self) -> Dict:
+        oldest = self._outbox[0].enqueued_at if self._outbox else None
+        return {
+            "connected": bool(self._connection and not self._connection.is_closed),
+            "pending": len(self._outbox),
+            "oldest_pending_seconds": (
+                time.monotonic() - oldest if oldest is not None else 0.0
+            ),
+            "published": self.published,
+            "batches": self.batches,
+            "failed_batches": self.failed_batches,
+            "dropped": self.dropped,
+        }
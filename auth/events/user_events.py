@@ -4,9 +4,12 @@ from dataclasses import dataclass
 from typing import Dict
 from uuid import UUID
 
-import pika
-
-from auth.core.config import RabbitMQSettings
+from auth.core.config import OutboxSettings, RabbitMQSettings, rabbit_config
+from auth.core.metrics import register_metrics
+from auth.db.crud import OutboxRepository
+from auth.db.postgres import async_session
+from auth.events.outbox_relay import OutboxRelay
+from auth.events.publisher import RabbitPublisher
 
 logger = logging.getLogger(__name__)
 
@@ -16,58 +19,47 @@ class UserCreatedEvent:
     user_id: UUID
     email: str
 
-    def to_json(self) -> str:
-        return json.dumps({"user_id": str(self.user_id), "email": str(self.email)})
+    event_type = "user_created"
 
+    def to_payload(self) -> Dict[str, str]:
+        return {"user_id": str(self.user_id), "email": str(self.email)}
 
-class UserEventProducer:
-    def __init__(self, rabbit_config: RabbitMQSettings):  # Указываем тип
-        self.rabbit_config = rabbit_config
+    def to_json(self) -> str:
+        return json.dumps(self.to_payload())
 
-    def _get_connection(self):
-        credentials = pika.PlainCredentials(
-            self.rabbit_config.user,  # Используем как атрибут
-            self.rabbit_config.password,  # Используем как атрибут
-        )
-        return pika.BlockingConnection(
-            pika.ConnectionParameters(
-                host=self.rabbit_config.host,  # Используем как атрибут
-                credentials=credentials,
-                heartbeat=600,
-                blocked_connection_timeout=300,
-            )
-        )
 
-    def publish_user_created(self, event: UserCreatedEvent):
-        connection = None
-        try:
-            logger.info(
-                f"Attempting to publish user created event for user {event.user_id}"
-            )
-            connection = self._get_connection()
-            channel = connection.channel()
+# Одно соединение с RabbitMQ на воркер, запускается в lifespan приложения
+event_publisher = RabbitPublisher(
+    rabbit_config.url,
+    channels=rabbit_config.publisher_channels,
+    outbox_size=rabbit_config.publisher_outbox_size,
+    batch_size=rabbit_config.publisher_batch_size,
+)
+register_metrics("rabbit_publisher", event_publisher.stats)
 
-            queue_name = self.rabbit_config.user_created_queue  # Используем как атрибут
-            logger.info(f"Declaring queue {queue_name}")
+_outbox_settings = OutboxSettings()
 
-            channel.queue_declare(queue=queue_name, durable=True)
+outbox_relay = OutboxRelay(
+    async_session,
+    event_publisher,
+    batch_size=_outbox_settings.batch_size,
+    poll_interval=_outbox_settings.poll_interval,
+)
+register_metrics("outbox_relay", outbox_relay.stats)
 
-            message = event.to_json()
-            logger.info(f"Publishing message: {message}")
 
-            channel.basic_publish(
-                exchange="",
-                routing_key=queue_name,
-                body=message,
-                properties=pika.BasicProperties(
-                    delivery_mode=2, content_type="application/json"
-                ),
-            )
-            logger.info("Message published successfully")
+class UserEventProducer:
+    def __init__(self, rabbit_config: RabbitMQSettings, outbox: OutboxRepository):
+        self.rabbit_config = rabbit_config
+        self.outbox = outbox
 
-        except Exception as e:
-            logger.error(f"Failed to publish message: {str(e)}")
-            raise
-        finally:
-            if connection and not connection.is_closed:
-                connection.close()
+    def stage_user_created(self, event: UserCreatedEvent) -> None:
+        """
+        Записывает событие в outbox в текущей транзакции сессии.
+        В RabbitMQ его отправит OutboxRelay после фиксации транзакции.
+        """
+        self.outbox.add(
+            event.event_type,
+            self.rabbit_config.user_created_queue,
+            event.to_payload(),
+        )
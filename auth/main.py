@@ -1,11 +1,10 @@
 from contextlib import asynccontextmanager
 
 import uvicorn
-from api.v1 import auth_api, role_api
+from api.v1 import auth_api, jwks_api, metrics_api, role_api
 from core.config import config
 from core.middleware.http import setup_middleware
 from core.tracer import configure_tracer
-from db import redis_db
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import ORJSONResponse
@@ -14,19 +13,42 @@ from opentelemetry.instrumentation.requests import RequestsInstrumentor
 from redis.asyncio import Redis
 
 from auth.api.v1.oauth.base_oauth_router import vk_router, yandex_router
-from auth.db.redis_db import get_redis
+from auth.db.postgres import engine
+from auth.db.redis_db import close_redis, get_redis
+from auth.core.config import OutboxSettings
+from auth.events.user_events import event_publisher, outbox_relay
+from auth.services.access_log_retention import access_log_retention
+from auth.services.access_log_writer import access_log_writer
+from auth.services.blacklist_mirror import blacklist_mirror
+from auth.services.password_hasher import password_hasher
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
 
-    redis_client = redis_db.get_redis()
+    # Общий для всего приложения клиент и пул соединений Redis
+    redis_client = get_redis()
+    await blacklist_mirror.start(redis_client)
+    await event_publisher.start()
+    await access_log_writer.start()
+    await access_log_retention.start()
+    relay_enabled = OutboxSettings().relay_enabled
+    if relay_enabled:
+        await outbox_relay.start()
     yield
-    await redis_client.close()
+    if relay_enabled:
+        await outbox_relay.stop()
+    await access_log_retention.stop()
+    await access_log_writer.stop()
+    await event_publisher.stop()
+    await blacklist_mirror.stop()
+    password_hasher.shutdown()
+    await close_redis()
+    await engine.dispose()
 
 
 # Настраиваем Jaeger-трейсер
-configure_tracer()
+tracing_enabled = configure_tracer()
 
 app = FastAPI(
     title=config.project_name,
@@ -67,14 +89,18 @@ app.openapi_components = {
 app.openapi_security = [{"bearerAuth": []}]
 
 setup_middleware(app, get_redis())
-RequestsInstrumentor().instrument()
-FastAPIInstrumentor.instrument_app(app)
+if tracing_enabled:
+    RequestsInstrumentor().instrument()
+    # Один серверный span на запрос, без дочерних span на каждый send/receive
+    FastAPIInstrumentor.instrument_app(app, exclude_spans=["receive", "send"])
 
 # Теги указываем для удобства навигации по документации
 app.include_router(role_api.router, prefix="/api/v1/roles", tags=["roles"])
 app.include_router(auth_api.router, prefix="/api/v1/auth", tags=["auth"])
 app.include_router(vk_router, prefix="/api/v1/auth")
 app.include_router(yandex_router, prefix="/api/v1/auth")
+app.include_router(metrics_api.router, prefix="/api/v1/metrics", tags=["metrics"])
+app.include_router(jwks_api.router)
 
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8001, log_level="info", reload=True)
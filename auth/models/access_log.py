@@ -1,10 +1,10 @@
 from __future__ import annotations
 
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import List, Optional
 
-from sqlalchemy import Column, DateTime, ForeignKey, Index, Text, func
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Text, func, text
 from sqlalchemy.dialects.postgresql import INET, UUID
 from sqlalchemy.orm import Mapped, relationship
 
@@ -13,28 +13,63 @@ from auth.db.postgres import Base
 from .base_models import TimestampMixin
 
 
+def create_partition(target, connection, **kw) -> None:
+    """
+    Creating DEFAULT and current month partitions for access_logs table.
+    Following months are created by the access log retention task.
+    """
+    connection.execute(
+        text(
+            """
+        CREATE TABLE IF NOT EXISTS access_logs_default
+        PARTITION OF access_logs DEFAULT
+    """
+        )
+    )
+
+    current_date = datetime.now().date().replace(day=1)
+    next_month = (current_date + timedelta(days=32)).replace(day=1)
+    connection.execute(
+        text(
+            f"""
+        CREATE TABLE IF NOT EXISTS access_logs_{current_date.strftime('%Y_%m')}
+        PARTITION OF access_logs
+        FOR VALUES FROM ('{current_date}') TO ('{next_month}')
+    """
+        )
+    )
+
+
 class AccessLog(Base, TimestampMixin):
     __tablename__ = "access_logs"
 
+    # Таблица секционирована по месяцам accessed_at, поэтому ключ секционирования
+    # входит в первичный ключ
     id: Mapped[uuid.UUID] = Column(
         UUID(as_uuid=True),
         primary_key=True,
         default=uuid.uuid4,
-        unique=True,
         nullable=False,
     )
     user_id: Mapped[uuid.UUID] = Column(UUID(as_uuid=True), ForeignKey("users.id"))
-    ip_address: Mapped[str] = Column(INET)
+    ip_address: Mapped[Optional[str]] = Column(INET)
     user_agent: Mapped[str] = Column(Text)
-    accessed_at: Mapped[datetime] = Column(DateTime, default=func.now(), nullable=False)
+    accessed_at: Mapped[datetime] = Column(
+        DateTime, default=func.now(), primary_key=True, nullable=False
+    )
 
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="access_logs")
 
     __table_args__ = (
-        Index("ix_access_logs_user_id", "user_id"),
+        # Keyset-пагинация журнала пользователя по (accessed_at, id)
+        Index("ix_access_logs_user_id_accessed_at_id", "user_id", "accessed_at", "id"),
         Index("ix_access_logs_accessed_at", "accessed_at"),
         Index("ix_access_logs_ip_address", "ip_address"),
+        {
+            "postgresql_partition_by": "RANGE (accessed_at)",
+            "listeners": [("after_create", create_partition)],
+        },
     )
 
     def __init__(self, user_id: uuid.UUID, ip_address: str, user_agent: str) -> None:
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict
+
+from sqlalchemy import BigInteger, Column, DateTime, Identity, String
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped
+
+from auth.db.postgres import Base
+
+
+class OutboxEvent(Base):
+    """Событие, записанное в одной транзакции с изменением и ждущее отправки"""
+
+    __tablename__ = "outbox_events"
+
+    # Монотонный идентификатор задает порядок отправки
+    id: Mapped[int] = Column(BigInteger, Identity(), primary_key=True)
+    event_type: Mapped[str] = Column(String(100), nullable=False)
+    routing_key: Mapped[str] = Column(String(255), nullable=False)
+    payload: Mapped[Dict[str, Any]] = Column(JSONB, nullable=False)
+    created_at: Mapped[datetime] = Column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
+
+    def __init__(
+        self, event_type: str, routing_key: str, payload: Dict[str, Any]
+    ) -> None:
+        self.event_type = event_type
+        self.routing_key = routing_key
+        self.payload = payload
+
+    def __repr__(self) -> str:
+        return f"<OutboxEvent id={self.id} type={self.event_type}>"
@@ -3,7 +3,7 @@ from __future__ import annotations
 import uuid
 from typing import List, Optional
 
-from sqlalchemy import Boolean, Column, Index, String
+from sqlalchemy import BigInteger, Boolean, Column, Index, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, relationship
 from werkzeug.security import check_password_hash, generate_password_hash
@@ -34,6 +34,10 @@ class User(Base, TimestampMixin):
     is_active: Mapped[bool] = Column(Boolean, default=True)
     display_name: Mapped[Optional[str]] = Column(String(255), nullable=True)
     avatar_url: Mapped[Optional[str]] = Column(String(500), nullable=True)
+    # Увеличивается при любом изменении ролей пользователя, попадает в access token
+    permissions_version: Mapped[int] = Column(
+        BigInteger, nullable=False, default=0, server_default="0"
+    )
 
     # Relationships
     user_social_accounts: Mapped[List["UserSocialAccount"]] = relationship(
@@ -68,12 +72,16 @@ class User(Base, TimestampMixin):
         password: Optional[str] = None,
         is_superuser: bool = False,
         avatar_url: Optional[str] = None,
+        password_hash: Optional[str] = None,
     ):
         self.username = username
         self.email = email
         self.avatar_url = avatar_url
         if password:
             self.set_password(password)
+        elif password_hash:
+            # Хеш, заранее посчитанный вне event loop (PasswordHasher)
+            self.password_hash = password_hash
         self.is_superuser = is_superuser
 
     def set_password(self, password: str) -> None:
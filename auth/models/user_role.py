@@ -31,7 +31,8 @@ class UserRole(Base, TimestampMixin):
 
     __table_args__ = (
         Index("ix_user_roles_user_id", "user_id"),
-        Index("ix_user_roles_role_id", "role_id"),
+        # Покрывает постраничный список и подсчет участников роли
+        Index("ix_user_roles_role_id_user_id", "role_id", "user_id"),
         Index("ix_user_roles_assigned_by", "assigned_by"),
     )
 
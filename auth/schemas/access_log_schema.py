@@ -1,7 +1,9 @@
+import base64
+import binascii
 from datetime import datetime
 from typing import List, Optional
 
-from pydantic import UUID4, BaseModel, ConfigDict, IPvAnyAddress
+from pydantic import UUID4, BaseModel, ConfigDict, IPvAnyAddress, ValidationError
 
 from .entity import BaseResponse
 
@@ -14,7 +16,7 @@ class UserBrief(BaseResponse):
 class AccessLogResponse(BaseResponse):
     id: UUID4
     user_id: UUID4
-    ip_address: IPvAnyAddress
+    ip_address: Optional[IPvAnyAddress]
     user_agent: str
     accessed_at: datetime
     created_at: datetime
@@ -30,3 +32,29 @@ class AccessLogListResponse(BaseResponse):
     total: int
     page: int
     size: int
+
+
+class AccessLogCursor(BaseModel):
+    """Позиция keyset-пагинации: (accessed_at, id) последней выданной записи"""
+
+    accessed_at: datetime
+    id: UUID4
+
+    def encode(self) -> str:
+        raw = f"{self.accessed_at.isoformat()}|{self.id}".encode()
+        return base64.urlsafe_b64encode(raw).decode()
+
+    @classmethod
+    def decode(cls, cursor: str) -> "AccessLogCursor":
+        try:
+            accessed_at, log_id = (
+                base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+            )
+            return cls(accessed_at=accessed_at, id=log_id)
+        except (binascii.Error, UnicodeDecodeError, ValueError, ValidationError):
+            raise ValueError("Invalid cursor")
+
+
+class AccessLogPageResponse(BaseResponse):
+    items: List[AccessLogResponse]
+    next_cursor: Optional[str] = None
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, EmailStr, Field
@@ -49,6 +49,7 @@ class CurrentUserResponse(BaseResponse):
     username: str = Field(..., description="User's username")
     is_superuser: bool = Field(..., description="Superuser status")
     roles: List[str] = Field(..., description="List of user's roles")
+    permissions_version: int = Field(0, description="Version of the user's role set")
     email: Optional[str] = Field(None, description="User's email address")
 
     class Config:
@@ -59,6 +60,7 @@ class CurrentUserResponse(BaseResponse):
                 "username": "john_doe",
                 "is_superuser": False,
                 "roles": ["user", "admin"],
+                "permissions_version": 3,
                 "email": "john@example.com",
                 "created_at": "2024-01-01T00:00:00",
                 "last_login": "2024-01-01T12:00:00",
@@ -73,3 +75,24 @@ class LogoutResponse(BaseResponse):
 
     class Config:
         json_schema_extra = {"example": {"detail": "Successfully logged out"}}
+
+
+class PermissionsVersionsRequest(BaseModel):
+    """Batch permissions version lookup request schema"""
+
+    user_ids: List[UUID] = Field(
+        ..., description="Users to look up", min_length=1, max_length=1000
+    )
+
+
+class PermissionsVersionsResponse(BaseModel):
+    """Current permissions versions; unknown users are omitted"""
+
+    versions: Dict[UUID, int] = Field(
+        ..., description="Current permissions version by user id"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {"versions": {"123e4567-e89b-12d3-a456-426614174000": 3}}
+        }
@@ -1,5 +1,6 @@
 import uuid
 from datetime import datetime
+from enum import Enum
 from typing import List, Optional
 
 from pydantic import UUID4, BaseModel, ConfigDict, Field
@@ -24,7 +25,6 @@ class RoleResponse(BaseResponse):
     is_deleted: bool = Field(..., description="Role deletion status")
     created_at: datetime = Field(..., description="Role creation timestamp")
     updated_at: datetime = Field(..., description="Role last update timestamp")
-    users: List[UserBrief] = Field(default=[], description="Users with this role")
 
     class Config:
         from_attributes = True
@@ -37,12 +37,6 @@ class RoleResponse(BaseResponse):
                 "is_deleted": False,
                 "created_at": "2024-01-01T00:00:00",
                 "updated_at": "2024-01-01T00:00:00",
-                "users": [
-                    {
-                        "id": "123e4567-e89b-12d3-a456-426614174000",
-                        "username": "john_doe",
-                    }
-                ],
             }
         }
 
@@ -67,12 +61,6 @@ class RoleListResponse(BaseResponse):
                         "is_deleted": False,
                         "created_at": "2024-01-01T00:00:00",
                         "updated_at": "2024-01-01T00:00:00",
-                        "users": [
-                            {
-                                "id": "123e4567-e89b-12d3-a456-426614174000",
-                                "username": "john_doe",
-                            }
-                        ],
                     }
                 ],
                 "total": 100,
@@ -82,14 +70,85 @@ class RoleListResponse(BaseResponse):
         }
 
 
+class RoleMembersPage(BaseResponse):
+    """Keyset-paginated page of role members."""
+
+    role_id: uuid.UUID = Field(..., description="Role UUID")
+    member_count: Optional[int] = Field(
+        None, description="Total number of role members, on the first page only", ge=0
+    )
+    items: List[UserBrief] = Field(..., description="Role members ordered by id")
+    next_cursor: Optional[uuid.UUID] = Field(
+        None, description="Cursor for the next page, absent on the last page"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "role_id": "987fcdeb-51a2-43d7-9012-345678901234",
+                "member_count": 1,
+                "items": [
+                    {
+                        "id": "123e4567-e89b-12d3-a456-426614174000",
+                        "username": "john_doe",
+                    }
+                ],
+                "next_cursor": None,
+            }
+        }
+
+
 class UserRoleAssignment(BaseModel):
     """Role assignment schema."""
 
     user_ids: List[uuid.UUID] = Field(
-        ..., description="User UUIDs for role assignment/removal"
+        ...,
+        description="User UUIDs for role assignment/removal",
+        max_length=10000,
     )
 
 
+class UserAssignmentStatus(str, Enum):
+    ASSIGNED = "assigned"
+    ALREADY_ASSIGNED = "already_assigned"
+    USER_NOT_FOUND = "user_not_found"
+    REMOVED = "removed"
+    NOT_ASSIGNED = "not_assigned"
+
+
+class UserAssignmentResult(BaseModel):
+    """Result of a role change for a single user."""
+
+    user_id: uuid.UUID = Field(..., description="User UUID")
+    status: UserAssignmentStatus = Field(..., description="Outcome for this user")
+
+
+class BulkRoleAssignmentResponse(BaseModel):
+    """Per-user results of a bulk role assignment/removal."""
+
+    role_id: uuid.UUID = Field(..., description="Role UUID")
+    changed: int = Field(..., description="Number of users actually changed", ge=0)
+    results: List[UserAssignmentResult] = Field(..., description="Per-user results")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "role_id": "987fcdeb-51a2-43d7-9012-345678901234",
+                "changed": 1,
+                "results": [
+                    {
+                        "user_id": "123e4567-e89b-12d3-a456-426614174000",
+                        "status": "assigned",
+                    },
+                    {
+                        "user_id": "223e4567-e89b-12d3-a456-426614174000",
+                        "status": "user_not_found",
+                    },
+                ],
+            }
+        }
+
+
 class UpdateRoleRequest(BaseModel):
     """Role update schema."""
 
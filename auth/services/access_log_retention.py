@@ -0,0 +1,190 @@
+"""
+Обслуживание месячных секций журнала входов access_logs.
+
+Создает секции на несколько месяцев вперед, чтобы записи не попадали в
+секцию DEFAULT, и отсоединяет и удаляет секции старше срока хранения.
+Запускается фоновой задачей приложения или отдельно, например из cron:
+    python -m auth.services.access_log_retention
+"""
+
+import asyncio
+import re
+from dataclasses import dataclass
+from datetime import date
+from logging import getLogger
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from auth.core.config import AccessLogSettings
+from auth.core.metrics import register_metrics
+from auth.db.postgres import async_session
+
+logger = getLogger(__name__)
+
+PARENT_TABLE = "access_logs"
+PARTITION_NAME = re.compile(r"^access_logs_(\d{4})_(\d{2})$")
+
+# Ключ advisory lock: обслуживание выполняет только один воркер за раз
+RETENTION_LOCK_KEY = 7_240_001
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_{month.year:04d}_{month.month:02d}"
+
+
+@dataclass
+class PartitionPlan:
+    create: List[Tuple[str, date, date]]
+    drop: List[str]
+
+
+def plan_partitions(
+    existing: Iterable[str], today: date, months_ahead: int, retention_months: int
+) -> PartitionPlan:
+    """Решает, какие месячные секции создать и какие удалить"""
+    existing = set(existing)
+    current = date(today.year, today.month, 1)
+
+    create = []
+    for offset in range(months_ahead + 1):
+        start = add_months(current, offset)
+        name = partition_name(start)
+        if name not in existing:
+            create.append((name, start, add_months(start, 1)))
+
+    # Секция удаляется, когда все ее записи старше срока хранения
+    oldest_kept = add_months(current, -retention_months)
+    drop = []
+    for name in sorted(existing):
+        match = PARTITION_NAME.match(name)
+        if match and date(int(match[1]), int(match[2]), 1) < oldest_kept:
+            drop.append(name)
+
+    return PartitionPlan(create=create, drop=drop)
+
+
+class AccessLogRetention:
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        retention_months: int = 12,
+        months_ahead: int = 3,
+        interval: int = 86400,
+    ):
+        self.session_factory = session_factory
+        self.retention_months = retention_months
+        self.months_ahead = months_ahead
+        self.interval = interval
+
+        self._task: Optional[asyncio.Task] = None
+
+        self.runs = 0
+        self.created = 0
+        self.dropped = 0
+        self.errors = 0
+
+    @staticmethod
+    async def _existing_partitions(session: AsyncSession) -> List[str]:
+        result = await session.execute(
+            text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE parent.relname = :parent"
+            ),
+            {"parent": PARENT_TABLE},
+        )
+        return list(result.scalars().all())
+
+    async def run_once(self, today: Optional[date] = None) -> PartitionPlan:
+        today = today or date.today()
+        async with self.session_factory() as session:
+            async with session.begin():
+                locked = await session.scalar(
+                    text("SELECT pg_try_advisory_xact_lock(:key)"),
+                    {"key": RETENTION_LOCK_KEY},
+                )
+                if not locked:
+                    logger.debug("Access log retention is running elsewhere")
+                    return PartitionPlan(create=[], drop=[])
+
+                plan = plan_partitions(
+                    await self._existing_partitions(session),
+                    today,
+                    self.months_ahead,
+                    self.retention_months,
+                )
+                # Имена секций строятся только из дат, а не из внешнего ввода
+                for name, start, end in plan.create:
+                    await session.execute(
+                        text(
+                            f'CREATE TABLE IF NOT EXISTS "{name}" '
+                            f"PARTITION OF {PARENT_TABLE} "
+                            f"FOR VALUES FROM ('{start}') TO ('{end}')"
+                        )
+                    )
+                for name in plan.drop:
+                    await session.execute(
+                        text(f'ALTER TABLE {PARENT_TABLE} DETACH PARTITION "{name}"')
+                    )
+                    await session.execute(text(f'DROP TABLE "{name}"'))
+
+        self.runs += 1
+        self.created += len(plan.create)
+        self.dropped += len(plan.drop)
+        if plan.create or plan.drop:
+            logger.info(
+                f"Access log partitions: created {[name for name, _, _ in plan.create]}, "
+                f"dropped {plan.drop}"
+            )
+        return plan
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Access log retention failed: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+    def stats(self) -> Dict:
+        return {
+            "runs": self.runs,
+            "created": self.created,
+            "dropped": self.dropped,
+            "errors": self.errors,
+        }
+
+
+_settings = AccessLogSettings()
+
+access_log_retention = AccessLogRetention(
+    async_session,
+    retention_months=_settings.retention_months,
+    months_ahead=_settings.partitions_ahead,
+    interval=_settings.retention_interval,
+)
+register_metrics("access_log_retention", access_log_retention.stats)
+
+
+if __name__ == "__main__":
+    asyncio.run(access_log_retention.run_once())
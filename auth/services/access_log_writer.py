@@ -0,0 +1,162 @@
+import asyncio
+import ipaddress
+import time
+import uuid
+from datetime import datetime
+from logging import getLogger
+from typing import Any, Callable, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from auth.core.config import AccessLogSettings
+from auth.core.metrics import register_metrics
+from auth.db.crud import AccessLogRepository
+from auth.db.postgres import async_session
+
+logger = getLogger(__name__)
+
+
+class AccessLogWriter:
+    """
+    Buffers access log records in memory and writes them in batches.
+
+    A flush is a single multi-row INSERT and is triggered when the buffer
+    reaches ``batch_size`` or every ``flush_interval`` seconds, whichever
+    comes first. A failed batch is put back in front of the buffer and
+    retried on the next flush. The buffer is bounded by ``max_buffer``:
+    records beyond it are dropped and counted rather than growing memory
+    while the database is down.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_buffer: int = 50000,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+
+        self._buffer: List[Dict[str, Any]] = []
+        self._flush_requested = asyncio.Event()
+        self._stopping = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+        self.written = 0
+        self.flushes = 0
+        self.dropped = 0
+        self.errors = 0
+        self.last_flush_seconds = 0.0
+
+    @staticmethod
+    def _normalize_ip(ip_address: str) -> Optional[str]:
+        # Невалидный адрес (например, "unknown") не должен ломать всю пачку
+        try:
+            return str(ipaddress.ip_address(ip_address))
+        except ValueError:
+            return None
+
+    def write(self, user_id: UUID, ip_address: str, user_agent: str) -> None:
+        """Добавляет запись в буфер; в базу она попадет при следующем сбросе"""
+        if len(self._buffer) >= self.max_buffer:
+            self.dropped += 1
+            return
+
+        now = datetime.utcnow()
+        self._buffer.append(
+            {
+                "id": uuid.uuid4(),
+                "user_id": user_id,
+                "ip_address": self._normalize_ip(ip_address),
+                "user_agent": user_agent,
+                "accessed_at": now,
+                "created_at": now,
+                "updated_at": now,
+            }
+        )
+        if len(self._buffer) >= self.batch_size:
+            self._flush_requested.set()
+
+    async def flush(self) -> int:
+        """Записывает накопленные записи пачками, возвращает число записанных"""
+        async with self._flush_lock:
+            written = 0
+            while self._buffer:
+                batch = self._buffer[: self.batch_size]
+                del self._buffer[: self.batch_size]
+
+                started = time.perf_counter()
+                try:
+                    async with self.session_factory() as session:
+                        await AccessLogRepository(session).create_many(batch)
+                except Exception as e:
+                    self.errors += 1
+                    logger.error(f"Failed to write {len(batch)} access logs: {str(e)}")
+                    # Возвращаем пачку в начало буфера, лишнее отбрасываем
+                    self._buffer[:0] = batch
+                    overflow = len(self._buffer) - self.max_buffer
+                    if overflow > 0:
+                        del self._buffer[-overflow:]
+                        self.dropped += overflow
+                    break
+
+                self.last_flush_seconds = time.perf_counter() - started
+                self.flushes += 1
+                written += len(batch)
+
+            self.written += written
+            return written
+
+    async def start(self) -> None:
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Останавливает фоновый сброс и записывает остаток буфера"""
+        if self._task is not None:
+            # Не отменяем задачу: отмена посреди INSERT потеряла бы
+            # уже вынутую из буфера пачку. Дожидаемся текущего сброса.
+            self._stopping.set()
+            self._flush_requested.set()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+        if self._buffer:
+            logger.warning(f"Lost {len(self._buffer)} access logs on shutdown")
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(
+                    self._flush_requested.wait(), timeout=self.flush_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            await self.flush()
+
+    def stats(self) -> Dict:
+        return {
+            "buffered": len(self._buffer),
+            "written": self.written,
+            "flushes": self.flushes,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "last_flush_seconds": self.last_flush_seconds,
+        }
+
+
+_settings = AccessLogSettings()
+
+access_log_writer = AccessLogWriter(
+    async_session,
+    batch_size=_settings.batch_size,
+    flush_interval=_settings.flush_interval,
+    max_buffer=_settings.max_buffer,
+)
+register_metrics("access_log_writer", access_log_writer.stats)
@@ -4,7 +4,6 @@ from uuid import UUID
 
 import aiohttp
 from fastapi import HTTPException
-from passlib.context import CryptContext
 from sqlalchemy import Boolean
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped
@@ -16,7 +15,7 @@ from auth.core.base_service import circuit_protected
 from auth.core.breaker import AsyncCircuitBreaker
 from auth.core.config import rabbit_config
 from auth.db.crud import (
-    AccessLogRepository,
+    OutboxRepository,
     SocialAccountRepository,
     UserRepository
 )
@@ -24,12 +23,14 @@ from auth.events.user_events import UserCreatedEvent, UserEventProducer
 from auth.models.base_models import SocialProvider
 from auth.models.user import User
 from auth.models.user_account import UserSocialAccount
+from auth.services.access_log_writer import access_log_writer
+from auth.services.password_hasher import (
+    PasswordHasherOverloaded,
+    password_hasher
+)
 from auth.services.token_service import TokenService
 from auth.services.user_service import logger
 
-# Создаем объект для работы с паролями
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 
 class AuthService(UserRepository):
     def __init__(self, session: AsyncSession, redis):
@@ -43,8 +44,12 @@ class AuthService(UserRepository):
             service_name="auth_service",
             failure_threshold=5,
             recovery_timeout=60,
+            # Сброс нагрузки пулом хеширования - это 503, а не сбой сервиса
+            ignored_exceptions=(PasswordHasherOverloaded,),
+        )
+        self.event_producer = UserEventProducer(
+            rabbit_config, OutboxRepository(session)
         )
-        self.event_producer = UserEventProducer(rabbit_config)
 
     async def user_already_exists(self, username: str) -> Boolean:
         existing_user = await self.get_by_username(username)
@@ -63,18 +68,19 @@ class AuthService(UserRepository):
 
         new_user_data = {
             "username": username,
-            "password": password,
+            "password_hash": await password_hasher.hash(password),
             "is_superuser": is_superuser,
             "email": email or self._generate_email(),
         }
 
-        new_user = await self.auth.user_repository.create(new_user_data)
-
-        try:
-            event = UserCreatedEvent(user_id=new_user.id, email=new_user.email)
-            self.event_producer.publish_user_created(event)
-        except Exception as e:
-            logger.error(f"Failed to publish user created event: {e}")
+        # Пользователь и событие о его создании фиксируются одной транзакцией
+        new_user = User(**new_user_data)
+        self.session.add(new_user)
+        await self.session.flush()
+        self.event_producer.stage_user_created(
+            UserCreatedEvent(user_id=new_user.id, email=new_user.email)
+        )
+        await self.session.commit()
 
         return {"id": str(new_user.id), "username": new_user.username}
 
@@ -83,18 +89,18 @@ class AuthService(UserRepository):
     ):
         current_user = await self.get_by_id(user_id)
 
-        if not current_user.check_password(old_password):
-            raise HTTPException(status_code=401, detail="Password is incorrect")
-
         if not current_user:
             raise HTTPException(status_code=401, detail="User not found")
 
+        if not await password_hasher.verify(current_user.password_hash, old_password):
+            raise HTTPException(status_code=401, detail="Password is incorrect")
+
         new_user_data = {
-            "password": new_password,
+            "password_hash": await password_hasher.hash(new_password),
         }
 
         try:
-            await self.update(current_user["id"], new_user_data)
+            await self.update(current_user.id, new_user_data)
         except Exception as e:
             raise HTTPException(
                 HTTP_500_INTERNAL_SERVER_ERROR, detail="Unexpected error"
@@ -102,28 +108,23 @@ class AuthService(UserRepository):
 
     @circuit_protected
     async def authenticate_user(
-        self, username: str, password: str, user_creds: dict = Optional[dict]
+        self, username: str, password: str, user_creds: Optional[dict] = None
     ) -> Dict[str, Any]:
         user = await self.get_by_username(username)
 
-        if not user or not user.check_password(password):
+        if not user or not await password_hasher.verify(user.password_hash, password):
             raise HTTPException(status_code=401, detail="Invalid username or password")
 
-        # if user_creds:
-        #     await self.log_access(user.id, user_creds['ip'], user_creds['user_agent'])
+        if user_creds:
+            await self.log_access(user.id, user_creds["ip"], user_creds["user_agent"])
 
         access_token, refresh_token = await self.auth.create_tokens_for_user(user.id)
         return {"access_token": access_token, "refresh_token": refresh_token}
 
     async def logout_user(self, access_token: str, refresh_token: str) -> bool:
-        if await self.auth.is_token_blacklisted(
-            refresh_token
-        ) or await self.auth.is_token_blacklisted(access_token):
-            return True
-
         try:
-            await self.auth.blacklist_token(refresh_token)
-            await self.auth.blacklist_token(access_token)
+            # Каждый токен декодируется один раз внутри revoke_tokens
+            await self.auth.revoke_tokens(refresh_token, access_token)
             return True
         except Exception as e:
             logger.error(str(e))
@@ -143,10 +144,8 @@ class AuthService(UserRepository):
     async def log_access(
         self, user_id: Mapped[UUID], ip_address: str, user_agent: str
     ) -> None:
-        access_log_repo = AccessLogRepository(self.session)
-        await access_log_repo.create_log(
-            user_id=user_id, ip_address=ip_address, user_agent=user_agent
-        )
+        # Запись буферизуется и попадет в базу пачкой, без запроса на каждый вход
+        access_log_writer.write(user_id, ip_address, user_agent)
 
     async def get_or_create_user(
         self, email: str, provider: str, username: str
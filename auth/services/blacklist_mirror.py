@@ -0,0 +1,209 @@
+import asyncio
+import hashlib
+import math
+from logging import getLogger
+from typing import Dict, List, Optional, Union
+
+from redis.asyncio import Redis
+
+from auth.core.config import TokenConfig
+from auth.core.metrics import register_metrics
+
+logger = getLogger(__name__)
+
+BLACKLIST_KEY_PREFIX = "blacklist_token:"
+BLACKLIST_CHANNEL = "blacklist_token_events"
+
+
+class BloomFilter:
+    """Bloom filter over strings with double hashing on top of BLAKE2b"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(
+            8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        )
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class BlacklistMirror:
+    """
+    Per-worker probabilistic mirror of the Redis token blacklist.
+
+    The filter is filled from a SCAN of ``blacklist_token:*`` keys and kept
+    current through the ``blacklist_token_events`` pub/sub channel that
+    TokenService.blacklist_token publishes to. A negative answer means the
+    JTI is definitely not blacklisted; positives must be confirmed in Redis.
+    Until the mirror is synced (or after the subscription drops) every
+    lookup is reported as a possible hit, so callers fall back to Redis.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 100000,
+        error_rate: float = 0.01,
+        rebuild_interval: int = 300,
+        retry_delay: float = 1.0,
+        channel: str = BLACKLIST_CHANNEL,
+    ):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.rebuild_interval = rebuild_interval
+        self.retry_delay = retry_delay
+        self.channel = channel
+
+        self.redis: Optional[Redis] = None
+        self._filter = BloomFilter(capacity, error_rate)
+        self._pending: Optional[List[str]] = None
+        # _listen и _refresh_periodically не должны перестраивать фильтр
+        # одновременно: у них общий список событий _pending
+        self._rebuild_lock = asyncio.Lock()
+        self._ready = False
+        self._tasks: List[asyncio.Task] = []
+
+        self.negative_lookups = 0
+        self.positive_lookups = 0
+        self.false_positives = 0
+        self.rebuilds = 0
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    def might_contain(self, jti: str) -> bool:
+        """False means the JTI is definitely not in the blacklist"""
+        if not self._ready:
+            return True
+
+        if jti in self._filter:
+            self.positive_lookups += 1
+            return True
+
+        self.negative_lookups += 1
+        return False
+
+    def record_false_positive(self) -> None:
+        self.false_positives += 1
+
+    def add(self, jti: Union[str, bytes]) -> None:
+        if isinstance(jti, bytes):
+            jti = jti.decode()
+        self._filter.add(jti)
+        if self._pending is not None:
+            self._pending.append(jti)
+
+    async def start(self, redis: Redis) -> None:
+        self.redis = redis
+        self._tasks = [
+            asyncio.create_task(self._listen()),
+            asyncio.create_task(self._refresh_periodically()),
+        ]
+
+    async def stop(self) -> None:
+        self._ready = False
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _rebuild(self) -> None:
+        """Refills the filter from Redis so expired JTIs eventually drop out"""
+        async with self._rebuild_lock:
+            await self._rebuild_locked()
+
+    async def _rebuild_locked(self) -> None:
+        self._pending = []
+        try:
+            fresh = BloomFilter(self.capacity, self.error_rate)
+            async for key in self.redis.scan_iter(
+                match=f"{BLACKLIST_KEY_PREFIX}*", count=1000
+            ):
+                if isinstance(key, bytes):
+                    key = key.decode()
+                fresh.add(key[len(BLACKLIST_KEY_PREFIX) :])
+
+            # События, пришедшие во время SCAN, переносим в новый фильтр
+            for jti in self._pending:
+                fresh.add(jti)
+
+            self._filter = fresh
+            self.rebuilds += 1
+            logger.debug(f"Blacklist mirror rebuilt with {fresh.count} JTIs")
+        finally:
+            self._pending = None
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                # Подписываемся до SCAN, чтобы не потерять события между ними
+                await pubsub.subscribe(self.channel)
+                await self._rebuild()
+                self._ready = True
+                logger.info("Blacklist mirror is in sync")
+
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self.add(message["data"])
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Blacklist mirror subscription lost: {str(e)}")
+            finally:
+                self._ready = False
+                await pubsub.aclose()
+
+            await asyncio.sleep(self.retry_delay)
+
+    async def _refresh_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.rebuild_interval)
+            if not self._ready:
+                continue
+            try:
+                await self._rebuild()
+            except Exception as e:
+                logger.warning(f"Failed to rebuild blacklist mirror: {str(e)}")
+
+    def stats(self) -> Dict:
+        return {
+            "ready": self._ready,
+            "items": self._filter.count,
+            "capacity": self.capacity,
+            "negative_lookups": self.negative_lookups,
+            "positive_lookups": self.positive_lookups,
+            "false_positives": self.false_positives,
+            "rebuilds": self.rebuilds,
+        }
+
+
+_token_config = TokenConfig()
+
+blacklist_mirror = BlacklistMirror(
+    capacity=_token_config.blacklist_filter_capacity,
+    error_rate=_token_config.blacklist_filter_error_rate,
+    rebuild_interval=_token_config.blacklist_filter_rebuild_seconds,
+)
+register_metrics("token_blacklist_mirror", blacklist_mirror.stats)
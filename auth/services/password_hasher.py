@@ -0,0 +1,133 @@
+import asyncio
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from logging import getLogger
+from typing import Callable, Dict, Optional, TypeVar
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from auth.core.config import PasswordHashingSettings
+from auth.core.metrics import register_metrics
+
+logger = getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class PasswordHasherOverloaded(Exception):
+    """Очередь на хеширование заполнена, запрос нужно повторить позже"""
+
+    def __init__(self, retry_after: int = 1):
+        super().__init__("Password hashing queue is full")
+        self.retry_after = retry_after
+
+
+class PasswordHasher:
+    """
+    Runs werkzeug password hashing in a bounded thread pool off the event loop.
+
+    hashlib releases the GIL while computing pbkdf2/scrypt, so threads give
+    real parallelism without pickling costs of a process pool. At most
+    ``workers + max_queue`` hashes are admitted at once; anything beyond that
+    is shed immediately with PasswordHasherOverloaded instead of queueing
+    behind seconds of CPU work.
+    """
+
+    def __init__(self, workers: int = 4, max_queue: int = 64, retry_after: int = 1):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._in_flight = 0
+
+        self.completed = 0
+        self.rejected = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.hash_seconds_total = 0.0
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.max_queue
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="password-hash"
+            )
+        return self._executor
+
+    def _release(self, _: Future) -> None:
+        self._in_flight -= 1
+
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        if self._in_flight >= self.capacity:
+            self.rejected += 1
+            logger.debug(
+                f"Password hashing overloaded: {self._in_flight} tasks in flight"
+            )
+            raise PasswordHasherOverloaded(self.retry_after)
+
+        loop = asyncio.get_running_loop()
+        submitted = time.perf_counter()
+
+        def timed():
+            started = time.perf_counter()
+            result = func(*args)
+            return started - submitted, time.perf_counter() - started, result
+
+        self._in_flight += 1
+        future = self._get_executor().submit(timed)
+        # Слот освобождается, когда поток закончил работу, а не когда
+        # ожидающая корутина отменена, иначе пул можно переполнить
+        future.add_done_callback(
+            lambda done: loop.call_soon_threadsafe(self._release, done)
+        )
+
+        waited, spent, result = await asyncio.wrap_future(future)
+
+        self.completed += 1
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+        self.hash_seconds_total += spent
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self._run(generate_password_hash, password)
+
+    async def verify(self, password_hash: Optional[str], password: str) -> bool:
+        if not password_hash:
+            return False
+        return await self._run(check_password_hash, password_hash, password)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> Dict:
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": self._in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "wait_seconds_avg": (
+                self.wait_seconds_total / self.completed if self.completed else 0.0
+            ),
+            "wait_seconds_max": self.wait_seconds_max,
+            "hash_seconds_avg": (
+                self.hash_seconds_total / self.completed if self.completed else 0.0
+            ),
+        }
+
+
+_settings = PasswordHashingSettings()
+
+password_hasher = PasswordHasher(
+    workers=_settings.workers,
+    max_queue=_settings.max_queue,
+    retry_after=_settings.retry_after,
+)
+register_metrics("password_hasher", password_hasher.stats)
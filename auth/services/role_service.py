@@ -1,43 +1,72 @@
 import logging
 import uuid
-from typing import Any, Dict, List, Type
+from typing import Any, Dict, List, Optional, Tuple, Type
 
 from fastapi import Depends
+from redis.asyncio import Redis
 from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
+from auth.core.config import TokenConfig
 from auth.db.postgres import get_session
+from auth.db.redis_db import get_redis
 from auth.models.role import Role
 from auth.models.user import User
 from auth.models.user_role import UserRole
+from auth.schemas.role_schema import UserAssignmentStatus
+from auth.services.user_cache import UserProjectionCache
 
 logger = logging.getLogger(__name__)
 
-from auth.db.crud import RoleRepository, UserRoleRepository
+from auth.db.crud import RoleRepository, UserRepository, UserRoleRepository
 
 
 class RoleService(RoleRepository):
-    def __init__(self, session: AsyncSession = Depends(get_session)):
+    def __init__(
+        self,
+        session: AsyncSession = Depends(get_session),
+        redis: Optional[Redis] = Depends(get_redis),
+    ):
         super().__init__(session)
         self.user_role_repository = UserRoleRepository(session)
+        self.user_repository = UserRepository(session)
+        self.user_cache = UserProjectionCache(
+            redis, ttl=TokenConfig().user_projection_ttl
+        )
+
+    async def update(
+        self, obj_id: uuid.UUID, data: Dict[str, Any]
+    ) -> Optional[Role]:
+        role = await self.get_by_id(obj_id)
+        if role is None:
+            return None
+
+        # Участникам роли видно только ее имя (в токенах и проекциях);
+        # смена описания не требует ни новой версии прав, ни сброса кэша
+        renamed = "name" in data and data["name"] != role.name
+        if renamed:
+            # Версия прав меняется в той же транзакции, что и роль
+            await self.user_repository.bump_role_permissions_version(obj_id)
+        role = await super().update(obj_id, data)
+        if role is not None and renamed:
+            await self.user_cache.invalidate_all()
+        return role
+
+    async def delete(self, obj_id: uuid.UUID) -> bool:
+        # Версию прав участников меняем до удаления: связи удалятся каскадно
+        await self.user_repository.bump_role_permissions_version(obj_id)
+        deleted = await super().delete(obj_id)
+        if deleted:
+            await self.user_cache.invalidate_all()
+        return deleted
 
     async def get_all(self, skip: int = 0, limit: int = 100, **kwargs) -> List[Role]:
-        stmt = (
-            select(self.model)
-            .options(selectinload(self.model.users))
-            .offset(skip)
-            .limit(limit)
-        )
+        stmt = select(self.model).order_by(self.model.name).offset(skip).limit(limit)
         result = await self.session.execute(stmt)
         return result.scalars().all()
 
     async def get_by_id(self, obj_id: uuid.UUID, **kwargs) -> Role | None:
-        stmt = (
-            select(self.model)
-            .options(selectinload(self.model.users))
-            .where(self.model.id == obj_id)
-        )
+        stmt = select(self.model).where(self.model.id == obj_id)
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
@@ -64,8 +93,11 @@ class RoleService(RoleRepository):
                 logger.info(f"User {user_id} already has role {role_id}")
                 return True
 
-            # Используем метод из UserRoleRepository для назначения роли
+            # Используем метод из UserRoleRepository для назначения роли;
+            # версия прав фиксируется вместе с назначением
+            await self.user_repository.bump_permissions_version([user_id])
             await self.user_role_repository.assign_role(user_id, role_id)
+            await self.user_cache.invalidate([user_id])
             logger.info(f"Successfully assigned role {role_id} to user {user_id}")
             return True
 
@@ -92,7 +124,9 @@ class RoleService(RoleRepository):
 
             # Удаляем роль
             await self.session.delete(user_role)
+            await self.user_repository.bump_permissions_version([user_id])
             await self.session.commit()
+            await self.user_cache.invalidate([user_id])
 
             logger.info(f"Successfully removed role {role_id} from user {user_id}")
             return True
@@ -105,6 +139,84 @@ class RoleService(RoleRepository):
             await self.session.rollback()
             return False
 
+    async def _role_exists(self, role_id: uuid.UUID) -> bool:
+        stmt = select(self.model.id).where(self.model.id == role_id)
+        return (await self.session.execute(stmt)).scalar_one_or_none() is not None
+
+    async def assign_role_to_users(
+        self,
+        role_id: uuid.UUID,
+        user_ids: List[uuid.UUID],
+        assigned_by: Optional[uuid.UUID] = None,
+    ) -> Optional[Dict[uuid.UUID, UserAssignmentStatus]]:
+        """
+        Назначает роль списку пользователей одной транзакцией.
+        Возвращает статус по каждому пользователю или None, если роли нет.
+        """
+        if not await self._role_exists(role_id):
+            return None
+
+        user_ids = list(dict.fromkeys(user_ids))
+        try:
+            existing = await self.user_repository.get_existing_ids(user_ids)
+            assigned = await self.user_role_repository.add_role_to_users(
+                role_id,
+                [user_id for user_id in user_ids if user_id in existing],
+                assigned_by,
+            )
+            await self.user_repository.bump_permissions_version(assigned)
+            await self.session.commit()
+        except Exception as e:
+            logger.error(f"Error assigning role {role_id} to users: {str(e)}")
+            await self.session.rollback()
+            raise
+        await self.user_cache.invalidate(assigned)
+
+        logger.info(f"Assigned role {role_id} to {len(assigned)} users")
+        return {
+            user_id: (
+                UserAssignmentStatus.USER_NOT_FOUND
+                if user_id not in existing
+                else UserAssignmentStatus.ASSIGNED
+                if user_id in assigned
+                else UserAssignmentStatus.ALREADY_ASSIGNED
+            )
+            for user_id in user_ids
+        }
+
+    async def remove_role_from_users(
+        self, role_id: uuid.UUID, user_ids: List[uuid.UUID]
+    ) -> Optional[Dict[uuid.UUID, UserAssignmentStatus]]:
+        """
+        Снимает роль со списка пользователей одной транзакцией.
+        Возвращает статус по каждому пользователю или None, если роли нет.
+        """
+        if not await self._role_exists(role_id):
+            return None
+
+        user_ids = list(dict.fromkeys(user_ids))
+        try:
+            removed = await self.user_role_repository.remove_role_from_users(
+                role_id, user_ids
+            )
+            await self.user_repository.bump_permissions_version(removed)
+            await self.session.commit()
+        except Exception as e:
+            logger.error(f"Error removing role {role_id} from users: {str(e)}")
+            await self.session.rollback()
+            raise
+        await self.user_cache.invalidate(removed)
+
+        logger.info(f"Removed role {role_id} from {len(removed)} users")
+        return {
+            user_id: (
+                UserAssignmentStatus.REMOVED
+                if user_id in removed
+                else UserAssignmentStatus.NOT_ASSIGNED
+            )
+            for user_id in user_ids
+        }
+
     async def get_all_users_with_roles(self, role_id: uuid.UUID) -> List[User]:
         try:
             # Проверяем существование роли используя метод из базового репозитория
@@ -148,9 +260,25 @@ class RoleService(RoleRepository):
             logger.error(f"Error getting users by role: {str(e)}")
             return []
 
+    async def get_role_members(
+        self, role_id: uuid.UUID, limit: int = 100, after: Optional[uuid.UUID] = None
+    ) -> Tuple[List[Tuple[uuid.UUID, str]], Optional[int]]:
+        """
+        Возвращает страницу участников роли и общее число участников.
+        Число считается только для первой страницы: count(*) по роли с
+        миллионом участников дороже самой страницы
+        """
+        members = await self.user_role_repository.get_role_members(
+            role_id, limit=limit, after=after
+        )
+        total = None
+        if after is None:
+            total = await self.user_role_repository.count_role_members(role_id)
+        return members, total
+
     async def get_user_roles(self, user_id: uuid.UUID) -> List[Role]:
         """
-        Получает список ролей пользователя с предварительной загрузкой связанных пользователей
+        Получает список ролей пользователя (без участников ролей)
         """
         try:
             # Проверяем существование пользователя
@@ -162,10 +290,8 @@ class RoleService(RoleRepository):
                 logger.error(f"User {user_id} not found")
                 return []
 
-            # Получаем роли пользователя с предварительной загрузкой пользователей
             stmt = (
                 select(Role)
-                .options(selectinload(Role.users))
                 .join(UserRole, Role.id == UserRole.role_id)
                 .where(
                     and_(
@@ -178,7 +304,7 @@ class RoleService(RoleRepository):
             )
 
             result = await self.session.execute(stmt)
-            roles = result.unique().scalars().all()
+            roles = result.scalars().all()
 
             return list(roles)
 
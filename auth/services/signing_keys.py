@@ -0,0 +1,157 @@
+"""
+Асимметричные ключи подписи JWT и их публикация в JWKS.
+
+Ключи лежат в каталоге JWT_SIGNING_KEYS_DIR, по одному закрытому ключу
+в PEM на файл; kid ключа — имя файла без расширения. Алгоритм определяется
+типом ключа: RSA подписывает RS256, Ed25519 — EdDSA. Токены подписывает
+активный ключ (JWT_ACTIVE_KID, по умолчанию последний по имени), проверяются
+они любым ключом из каталога, и все ключи публикуются в JWKS.
+
+Ротация:
+    1. Создать новый ключ и раскатить его, не меняя JWT_ACTIVE_KID:
+       ключ появится в JWKS, и сервисы успеют его закэшировать.
+    2. Переключить JWT_ACTIVE_KID на новый ключ.
+    3. Удалить старый файл, когда истекут подписанные им refresh-токены.
+
+Новый ключ:
+    python -m auth.services.signing_keys /path/to/keys --algorithm EdDSA
+"""
+
+import argparse
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+from jwt.algorithms import OKPAlgorithm, RSAAlgorithm
+
+from auth.core.config import TokenConfig
+
+ASYMMETRIC_ALGORITHMS = ("RS256", "EdDSA")
+
+
+@dataclass
+class SigningKey:
+    kid: str
+    algorithm: str
+    private_key: Any
+
+    @property
+    def public_key(self) -> Any:
+        return self.private_key.public_key()
+
+    def to_jwk(self) -> Dict[str, str]:
+        if self.algorithm == "RS256":
+            jwk = RSAAlgorithm.to_jwk(self.public_key, as_dict=True)
+        else:
+            jwk = OKPAlgorithm.to_jwk(self.public_key, as_dict=True)
+        return {**jwk, "kid": self.kid, "alg": self.algorithm, "use": "sig"}
+
+    @classmethod
+    def from_pem(cls, kid: str, pem: bytes) -> "SigningKey":
+        private_key = serialization.load_pem_private_key(pem, password=None)
+        if isinstance(private_key, rsa.RSAPrivateKey):
+            return cls(kid=kid, algorithm="RS256", private_key=private_key)
+        if isinstance(private_key, ed25519.Ed25519PrivateKey):
+            return cls(kid=kid, algorithm="EdDSA", private_key=private_key)
+        raise ValueError(f"Unsupported signing key type for kid {kid}")
+
+
+class KeyRing:
+    """
+    Active signing key plus every key still accepted for verification.
+
+    The JWKS document is serialized once: the key set only changes on
+    restart, so the endpoint serves the same bytes with a stable ETag.
+    """
+
+    def __init__(self, keys: List[SigningKey], active_kid: Optional[str] = None):
+        if not keys:
+            raise ValueError("Key ring needs at least one signing key")
+        self.keys = {key.kid: key for key in keys}
+        self.active_kid = active_kid or max(self.keys)
+        if self.active_kid not in self.keys:
+            raise ValueError(f"Active signing key {self.active_kid} is not loaded")
+
+        self.jwks = {"keys": [self.keys[kid].to_jwk() for kid in sorted(self.keys)]}
+        self.jwks_json = json.dumps(self.jwks, separators=(",", ":")).encode()
+
+    @property
+    def active(self) -> SigningKey:
+        return self.keys[self.active_kid]
+
+    def sign(self, payload: Dict) -> str:
+        key = self.active
+        return jwt.encode(
+            payload, key.private_key, algorithm=key.algorithm, headers={"kid": key.kid}
+        )
+
+    def decode(self, token: str, options: Dict) -> Dict:
+        """
+        Verify a token with the key named by its ``kid`` header.
+
+        Only that key's own algorithm is accepted, so a token cannot
+        switch the verification to another algorithm.
+        """
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = self.keys.get(kid)
+        if key is None:
+            raise jwt.InvalidKeyError(f"Unknown signing key: {kid}")
+        return jwt.decode(
+            token, key.public_key, algorithms=[key.algorithm], options=options
+        )
+
+    @classmethod
+    def from_directory(cls, path: str, active_kid: Optional[str] = None) -> "KeyRing":
+        keys = [
+            SigningKey.from_pem(file.stem, file.read_bytes())
+            for file in sorted(Path(path).glob("*.pem"))
+        ]
+        return cls(keys, active_kid=active_kid)
+
+
+def load_key_ring(config: TokenConfig) -> Optional[KeyRing]:
+    """Key ring for RS256/EdDSA; None keeps HS256 signing with SECRET_KEY"""
+    if config.algorithm not in ASYMMETRIC_ALGORITHMS:
+        return None
+    if not config.signing_keys_dir:
+        raise ValueError(f"{config.algorithm} requires JWT_SIGNING_KEYS_DIR")
+    return KeyRing.from_directory(
+        config.signing_keys_dir, active_kid=config.active_kid or None
+    )
+
+
+def generate_key(directory: str, algorithm: str, kid: Optional[str] = None) -> Path:
+    if algorithm == "RS256":
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    elif algorithm == "EdDSA":
+        private_key = ed25519.Ed25519PrivateKey.generate()
+    else:
+        raise ValueError(f"Unsupported algorithm {algorithm}")
+
+    # kid по времени создания: последний созданный ключ — последний по имени
+    kid = kid or datetime.utcnow().strftime("%Y%m%d%H%M%S")
+    path = Path(directory) / f"{kid}.pem"
+    pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as file:
+        file.write(pem)
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a JWT signing key")
+    parser.add_argument("directory")
+    parser.add_argument("--algorithm", choices=ASYMMETRIC_ALGORITHMS, default="EdDSA")
+    parser.add_argument("--kid")
+    args = parser.parse_args()
+    print(generate_key(args.directory, args.algorithm, args.kid))
@@ -1,4 +1,7 @@
+import hashlib
+import time
 import uuid
+from collections import OrderedDict
 from datetime import UTC, datetime, timedelta
 from logging import getLogger
 from typing import Dict, Optional, Tuple
@@ -15,19 +18,124 @@ logger = getLogger(__name__)
 from auth.core.base_service import circuit_protected
 from auth.core.breaker import AsyncCircuitBreaker
 from auth.core.config import TokenConfig
+from auth.core.metrics import register_metrics
 from auth.db.crud import UserRepository
+from auth.services.blacklist_mirror import (
+    BLACKLIST_CHANNEL,
+    BlacklistMirror,
+    blacklist_mirror
+)
+from auth.services.signing_keys import KeyRing, load_key_ring
+from auth.services.user_cache import UserProjectionCache
 
 
 class BlacklistError(Exception):
     pass
 
 
+class VerifiedClaimsCache:
+    """
+    In-process LRU cache of verified token claims.
+
+    Entries are keyed by SHA-256 digest of the token and live until the
+    token's ``exp``. The cache only saves signature verification: the
+    blacklist is still checked for every request.
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[bytes, Dict] = OrderedDict()
+        self._digests_by_jti: Dict[str, bytes] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[Dict]:
+        digest = self._digest(token)
+        claims = self._entries.get(digest)
+
+        if claims is None:
+            self.misses += 1
+            return None
+
+        if claims["exp"] <= time.time():
+            self._remove(digest)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(digest)
+        self.hits += 1
+        return dict(claims)
+
+    def put(self, token: str, claims: Dict) -> None:
+        if self.maxsize <= 0 or claims["exp"] <= time.time():
+            return
+
+        digest = self._digest(token)
+        self._entries[digest] = dict(claims)
+        self._entries.move_to_end(digest)
+        self._digests_by_jti[claims["jti"]] = digest
+
+        while len(self._entries) > self.maxsize:
+            _, evicted = self._entries.popitem(last=False)
+            self._digests_by_jti.pop(evicted["jti"], None)
+
+    def invalidate_jti(self, jti: str) -> None:
+        digest = self._digests_by_jti.get(jti)
+        if digest is not None:
+            self._remove(digest)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._digests_by_jti.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _remove(self, digest: bytes) -> None:
+        claims = self._entries.pop(digest, None)
+        if claims is not None:
+            self._digests_by_jti.pop(claims["jti"], None)
+
+
+claims_cache = VerifiedClaimsCache(maxsize=TokenConfig().claims_cache_size)
+register_metrics("token_claims_cache", claims_cache.stats)
+
+# None при HS256: токены подписываются общим SECRET_KEY
+key_ring = load_key_ring(TokenConfig())
+
+
 class TokenService:
-    def __init__(self, redis_client: Redis, session: AsyncSession):
+    def __init__(
+        self,
+        redis_client: Redis,
+        session: AsyncSession,
+        claims_cache: VerifiedClaimsCache = claims_cache,
+        blacklist_mirror: BlacklistMirror = blacklist_mirror,
+        key_ring: Optional[KeyRing] = key_ring,
+    ):
         self.redis_client = redis_client
         self.session = session
         self.config = TokenConfig()
+        self.claims_cache = claims_cache
+        self.blacklist_mirror = blacklist_mirror
+        self.key_ring = key_ring
         self.user_repository = UserRepository(session)
+        self.user_cache = UserProjectionCache(
+            redis_client, ttl=self.config.user_projection_ttl
+        )
         self.circuit_breaker = AsyncCircuitBreaker(
             redis=redis_client,
             service_name="token_service",
@@ -36,7 +144,12 @@ class TokenService:
         )
 
     async def create_access_token(
-        self, user_id: UUID, username: str, is_superuser: bool, roles: list[str]
+        self,
+        user_id: UUID,
+        username: str,
+        is_superuser: bool,
+        roles: list[str],
+        permissions_version: int = 0,
     ) -> Optional[str]:
         """
         Create JWT access token for user authentication.
@@ -46,6 +159,8 @@ class TokenService:
             username (str): The username of the user
             is_superuser (bool): Flag indicating if user has superuser privileges
             roles (list[str]): List of role names assigned to the user
+            permissions_version (int): Version of the user's role set; services
+                compare it with the current one to revalidate cached permissions
 
         Returns:
             Optional[str]: JWT token string if successful, None if failed
@@ -65,15 +180,14 @@ class TokenService:
                 "username": username,
                 "is_superuser": is_superuser,
                 "roles": roles,
+                "permissions_version": permissions_version,
                 "exp": expire.timestamp(),
                 "iat": now.timestamp(),
                 "jti": token_id,  # Добавляем JTI
                 "token_type": "access",
             }
 
-            token = jwt.encode(
-                payload, self.config.secret_key, algorithm=self.config.algorithm
-            )
+            token = self.encode_token(payload)
 
             logger.info(
                 f"Access token created successfully for user {username} "
@@ -119,9 +233,7 @@ class TokenService:
                 "token_type": "refresh",
             }
 
-            token = jwt.encode(
-                payload, self.config.secret_key, algorithm=self.config.algorithm
-            )
+            token = self.encode_token(payload)
 
             logger.info(
                 f"Refresh token created successfully for user ID: {user_id}, "
@@ -137,6 +249,61 @@ class TokenService:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=error_msg
             )
 
+    def encode_token(self, payload: Dict) -> str:
+        """Sign claims with the active key, or with SECRET_KEY for HS256"""
+        if self.key_ring is not None:
+            return self.key_ring.sign(payload)
+        return jwt.encode(
+            payload, self.config.secret_key, algorithm=self.config.algorithm
+        )
+
+    def decode_token(self, token: str, verify_exp: bool = True) -> Dict:
+        """
+        Decode JWT token and verify its signature.
+
+        This is the only place where the signature is checked: callers
+        pass the returned claims further instead of decoding the token again.
+        Verified claims are kept in the in-process cache until ``exp``.
+
+        Args:
+            token (str): JWT token to decode
+            verify_exp (bool): Whether to verify token expiration
+
+        Returns:
+            Dict: Verified token claims
+
+        Raises:
+            jwt.PyJWTError: If token is malformed, expired or has bad signature
+        """
+        cached = self.claims_cache.get(token)
+        if cached is not None:
+            return cached
+
+        options = {
+            "verify_signature": True,
+            "verify_exp": verify_exp,
+            "verify_iat": True,
+            "require": ["exp", "iat", "jti"],
+        }
+
+        if self.key_ring is None:
+            payload = jwt.decode(
+                token,
+                self.config.secret_key,
+                algorithms=[self.config.algorithm],
+                options=options,
+            )
+        elif self.config.accept_legacy_hs256 and "kid" not in jwt.get_unverified_header(
+            token
+        ):
+            payload = jwt.decode(
+                token, self.config.secret_key, algorithms=["HS256"], options=options
+            )
+        else:
+            payload = self.key_ring.decode(token, options)
+        self.claims_cache.put(token, payload)
+        return payload
+
     @circuit_protected
     async def validate_token(
         self, token: str, verify_exp: bool = True
@@ -157,37 +324,17 @@ class TokenService:
         try:
             logger.debug("Starting token validation")
 
-            # Проверяем, не в черном ли списке токен
-            if await self.is_token_blacklisted(token):
+            # Декодируем и проверяем подпись один раз за запрос
+            payload = self.decode_token(token, verify_exp=verify_exp)
+
+            # Проверяем, не в черном ли списке токен (по уже проверенным claims)
+            if await self.is_token_blacklisted(token, claims=payload):
                 logger.warning(f"Attempt to use blacklisted token")
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Token has been blacklisted",
                 )
 
-            # Декодируем токен с опциональной проверкой срока действия
-            options = {
-                "verify_signature": True,
-                "verify_exp": verify_exp,
-                "verify_iat": True,
-                "require": ["exp", "iat", "jti"],
-            }
-
-            payload = jwt.decode(
-                token,
-                self.config.secret_key,
-                algorithms=[self.config.algorithm],
-                options=options,
-            )
-
-            # Проверяем наличие JTI
-            if "jti" not in payload:
-                logger.warning("Token without JTI detected")
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid token format: missing JTI",
-                )
-
             logger.info(f"Token validated successfully. JTI: {payload['jti']}")
             return payload
 
@@ -225,9 +372,9 @@ class TokenService:
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token type"
             )
 
-        # Получаем актуальные данные пользователя из БД
+        # Получаем актуальные данные пользователя (кэш или БД)
         user_id = UUID(payload["user_id"])
-        user = await self.user_repository.get_with_roles(user_id)
+        user = await self.get_user_projection(user_id)
 
         if not user:
             raise HTTPException(
@@ -235,27 +382,29 @@ class TokenService:
             )
 
         # Помещаем использованный refresh token в черный список
-        await self.blacklist_token(refresh_token)
+        await self.blacklist_token(refresh_token, claims=payload)
 
         # Создаем новые токены с актуальными данными пользователя
-        roles = [role.name for role in user.roles]
         new_access_token = await self.create_access_token(
-            user_id=user.id,
-            username=user.username,
-            is_superuser=user.is_superuser,
-            roles=roles,
+            user_id=user["id"],
+            username=user["username"],
+            is_superuser=user["is_superuser"],
+            roles=user["roles"],
+            permissions_version=user.get("permissions_version", 0),
         )
-        new_refresh_token = await self.create_refresh_token(user.id)
+        new_refresh_token = await self.create_refresh_token(user["id"])
 
         return new_access_token, new_refresh_token
 
-    async def blacklist_token(self, token: str) -> None:
+    async def blacklist_token(self, token: str, claims: Optional[Dict] = None) -> None:
         """
         Add token to blacklist in Redis.
         Stores the token until its natural expiration time or minimum TTL.
 
         Args:
             token (str): JWT token to blacklist
+            claims (Optional[Dict]): Already verified claims of the token;
+                when given, the token is not decoded again
 
         Raises:
             HTTPException: If token cannot be blacklisted in Redis
@@ -263,12 +412,9 @@ class TokenService:
         try:
             logger.debug("Starting token blacklisting process")
 
-            payload = jwt.decode(
-                token,
-                self.config.secret_key,
-                algorithms=[self.config.algorithm],
-                options={"verify_exp": False},
-            )
+            payload = claims
+            if payload is None:
+                payload = self.decode_token(token, verify_exp=False)
 
             # Проверяем наличие необходимых полей
             if not all(key in payload for key in ["exp", "jti"]):
@@ -293,6 +439,11 @@ class TokenService:
                     f"Adding token with JTI {jti} to blacklist with TTL {ttl}s"
                 )
                 await self.redis_client.setex(redis_key, ttl, "1")
+                self.claims_cache.invalidate_jti(jti)
+
+                # Сообщаем остальным воркерам о новом JTI в черном списке
+                self.blacklist_mirror.add(jti)
+                await self.redis_client.publish(BLACKLIST_CHANNEL, jti)
 
                 logger.info(f"Token successfully blacklisted. JTI: {jti}, TTL: {ttl}s")
 
@@ -314,12 +465,16 @@ class TokenService:
                 detail="Failed to process token for blacklisting",
             )
 
-    async def is_token_blacklisted(self, token: str) -> bool:
+    async def is_token_blacklisted(
+        self, token: Optional[str], claims: Optional[Dict] = None
+    ) -> bool:
         """
         Check if token is in the blacklist.
 
         Args:
-            token (str): JWT token to check
+            token (Optional[str]): JWT token to check
+            claims (Optional[Dict]): Already verified claims of the token;
+                when given, the token is not decoded again
 
         Returns:
             bool: True if token is blacklisted, False otherwise
@@ -330,36 +485,42 @@ class TokenService:
         try:
             logger.debug("Checking token blacklist status")
 
-            # Декодируем токен для получения JTI
-            try:
-                payload = jwt.decode(
-                    token,
-                    self.config.secret_key,
-                    algorithms=[self.config.algorithm],
-                    options={"verify_exp": False},
-                )
-
-                # Проверяем наличие JTI
-                if "jti" not in payload:
-                    logger.warning("Token missing JTI field")
+            # Декодируем токен для получения JTI, только если claims не переданы
+            payload = claims
+            if payload is None:
+                try:
+                    payload = self.decode_token(token, verify_exp=False)
+                except jwt.InvalidTokenError as e:
+                    logger.warning(
+                        f"Invalid token provided for blacklist check: {str(e)}"
+                    )
                     return False
 
-                jti = payload["jti"]
-                redis_key = f"blacklist_token:{jti}"
+            # Проверяем наличие JTI
+            if "jti" not in payload:
+                logger.warning("Token missing JTI field")
+                return False
 
-                # Проверяем наличие в черном списке
-                is_blacklisted = await self.redis_client.exists(redis_key)
+            jti = payload["jti"]
 
-                if is_blacklisted:
-                    logger.info(f"Token with JTI {jti} found in blacklist")
-                else:
-                    logger.debug(f"Token with JTI {jti} not found in blacklist")
+            # Локальный фильтр отвечает на отрицательные проверки без Redis
+            if not self.blacklist_mirror.might_contain(jti):
+                logger.debug(f"Token with JTI {jti} not found in blacklist mirror")
+                return False
 
-                return bool(is_blacklisted)
+            redis_key = f"blacklist_token:{jti}"
 
-            except jwt.InvalidTokenError as e:
-                logger.warning(f"Invalid token provided for blacklist check: {str(e)}")
-                return False
+            # Проверяем наличие в черном списке
+            is_blacklisted = await self.redis_client.exists(redis_key)
+
+            if is_blacklisted:
+                logger.info(f"Token with JTI {jti} found in blacklist")
+            else:
+                logger.debug(f"Token with JTI {jti} not found in blacklist")
+                if self.blacklist_mirror.ready:
+                    self.blacklist_mirror.record_false_positive()
+
+            return bool(is_blacklisted)
 
         except Exception as e:
             error_msg = "Error checking token blacklist status"
@@ -368,6 +529,31 @@ class TokenService:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=error_msg
             )
 
+    async def revoke_tokens(self, *tokens: Optional[str]) -> None:
+        """
+        Blacklist several tokens at once (e.g. on logout).
+
+        Every token is decoded a single time; tokens that are missing,
+        invalid or already blacklisted are skipped.
+
+        Args:
+            *tokens (Optional[str]): JWT tokens to revoke
+        """
+        for token in tokens:
+            if not token:
+                continue
+
+            try:
+                claims = self.decode_token(token, verify_exp=False)
+            except jwt.InvalidTokenError as e:
+                logger.warning(f"Skipping invalid token on revoke: {str(e)}")
+                continue
+
+            if await self.is_token_blacklisted(token, claims=claims):
+                continue
+
+            await self.blacklist_token(token, claims=claims)
+
     @circuit_protected
     async def create_tokens_for_user(self, user_id: Mapped[UUID]) -> Tuple[str, str]:
         """
@@ -406,6 +592,7 @@ class TokenService:
                     username=user.username,
                     is_superuser=user.is_superuser,
                     roles=roles,
+                    permissions_version=user.permissions_version,
                 )
 
                 # Создаем refresh token
@@ -439,21 +626,42 @@ class TokenService:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=error_msg
             )
 
-    async def get_current_user(self, token: str) -> Optional[Dict]:
-        """Get current user data from token"""
+    async def get_user_projection(self, user_id: UUID) -> Optional[Dict]:
+        """
+        Get ``{id, username, is_superuser, roles, permissions_version}`` of a user.
+
+        Read-through: the projection is served from Redis and loaded
+        from the database only on a cache miss.
+        """
+        return await self.user_cache.get_or_load(
+            user_id, lambda: self.user_repository.get_with_roles(user_id)
+        )
+
+    async def get_current_user(
+        self, token: str, from_claims: bool = False
+    ) -> Optional[Dict]:
+        """
+        Get current user data from token.
+
+        Args:
+            token (str): JWT access token
+            from_claims (bool): Answer purely from verified token claims
+                without touching the cache or the database
+
+        Returns:
+            Optional[Dict]: User projection or None if user does not exist
+        """
         payload = await self.validate_token(token)
         if not payload:
             return None
 
-        user_id = UUID(payload["user_id"])
-        user = await self.user_repository.get_with_roles(user_id)
-
-        if not user:
-            return None
+        if from_claims:
+            return {
+                "id": UUID(payload["user_id"]),
+                "username": payload["username"],
+                "is_superuser": payload["is_superuser"],
+                "roles": payload["roles"],
+                "permissions_version": payload.get("permissions_version", 0),
+            }
 
-        return {
-            "id": user.id,
-            "username": user.username,
-            "is_superuser": user.is_superuser,
-            "roles": [role.name for role in user.roles],
-        }
+        return await self.get_user_projection(UUID(payload["user_id"]))
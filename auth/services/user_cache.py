@@ -0,0 +1,127 @@
+import json
+from logging import getLogger
+from typing import Awaitable, Callable, Dict, Iterable, Optional
+from uuid import UUID
+
+from redis.asyncio import Redis
+
+from auth.models.user import User
+
+logger = getLogger(__name__)
+
+USER_PROJECTION_KEY_PREFIX = "user_projection"
+# Поколение проекций: его увеличение разом делает устаревшими все записи
+USER_PROJECTION_GENERATION_KEY = f"{USER_PROJECTION_KEY_PREFIX}:generation"
+
+# Сколько ключей удаляется одной командой UNLINK при массовой инвалидации
+INVALIDATION_BATCH_SIZE = 1000
+
+
+class UserProjectionCache:
+    """
+    Redis read-through cache of the ``{id, username, is_superuser, roles,
+    permissions_version}`` projection used by /auth/me and token refresh.
+
+    Entries of single users are invalidated explicitly on role assignment
+    changes. A change of a role itself (rename, deletion) bumps a global
+    generation instead of enumerating the role members: every entry stores
+    the generation it was loaded under and is read together with the
+    current one, so older entries are treated as misses. The TTL only
+    bounds staleness if an invalidation was lost. Redis errors never fail
+    the request: lookups degrade to the database.
+    """
+
+    def __init__(self, redis: Optional[Redis], ttl: int = 300):
+        self.redis = redis
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(user_id: UUID) -> str:
+        return f"{USER_PROJECTION_KEY_PREFIX}:{user_id}"
+
+    @staticmethod
+    def project(user: User) -> Dict:
+        return {
+            "id": user.id,
+            "username": user.username,
+            "is_superuser": user.is_superuser,
+            "roles": [role.name for role in user.roles],
+            "permissions_version": user.permissions_version,
+        }
+
+    async def get_or_load(
+        self, user_id: UUID, loader: Callable[[], Awaitable[Optional[User]]]
+    ) -> Optional[Dict]:
+        """
+        Read-through: the projection is served from Redis when it belongs to
+        the current generation, otherwise loaded by ``loader`` and cached
+        under the generation seen before the load.
+        """
+        generation = None
+        if self.redis is not None:
+            try:
+                cached, current = await self.redis.mget(
+                    self._key(user_id), USER_PROJECTION_GENERATION_KEY
+                )
+                generation = int(current or 0)
+            except Exception as e:
+                logger.warning(f"Failed to read user projection {user_id}: {str(e)}")
+                cached = None
+
+            if cached:
+                projection = json.loads(cached)
+                if projection.pop("generation", 0) == generation:
+                    projection["id"] = UUID(projection["id"])
+                    return projection
+
+        user = await loader()
+        if not user:
+            return None
+
+        projection = self.project(user)
+        if generation is not None:
+            await self._set(projection, generation)
+        return projection
+
+    async def _set(self, projection: Dict, generation: int) -> None:
+        try:
+            await self.redis.setex(
+                self._key(projection["id"]),
+                self.ttl,
+                json.dumps(
+                    {
+                        **projection,
+                        "id": str(projection["id"]),
+                        "generation": generation,
+                    }
+                ),
+            )
+        except Exception as e:
+            logger.warning(
+                f"Failed to cache user projection {projection['id']}: {str(e)}"
+            )
+
+    async def invalidate(self, user_ids: Iterable[UUID]) -> None:
+        if self.redis is None:
+            return
+
+        keys = [self._key(user_id) for user_id in user_ids]
+        if not keys:
+            return
+
+        try:
+            for start in range(0, len(keys), INVALIDATION_BATCH_SIZE):
+                await self.redis.unlink(*keys[start : start + INVALIDATION_BATCH_SIZE])
+            logger.debug(f"Invalidated {len(keys)} user projections")
+        except Exception as e:
+            logger.error(f"Failed to invalidate user projections: {str(e)}")
+
+    async def invalidate_all(self) -> None:
+        """Делает устаревшими все проекции одной командой INCR"""
+        if self.redis is None:
+            return
+        try:
+            await self.redis.incr(USER_PROJECTION_GENERATION_KEY)
+            logger.debug("Invalidated all user projections")
+        except Exception as e:
+            logger.error(f"Failed to invalidate user projections: {str(e)}")
@@ -7,6 +7,7 @@ from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from async_fastapi_jwt_auth import AuthJWT
+from fakeredis import FakeAsyncRedis
 from pydantic_settings import BaseSettings
 from redis.asyncio import Redis
 from sqlalchemy import text
@@ -20,7 +21,8 @@ from sqlalchemy.orm import sessionmaker
 from auth.core.breaker import AsyncCircuitBreaker
 from auth.db.redis_db import get_redis, redis
 from auth.services.auth_service import AuthService
-from auth.services.token_service import TokenService
+from auth.services.blacklist_mirror import BlacklistMirror
+from auth.services.token_service import TokenService, VerifiedClaimsCache
 
 # Добавляем корневую директорию проекта в PYTHONPATH
 project_root = os.path.dirname(
@@ -169,6 +171,10 @@ def mock_redis_client():
     client.setex = AsyncMock(side_effect=mock_setex)
     client.incr = AsyncMock(side_effect=mock_incr)
     client.delete = AsyncMock(return_value=True)
+    client.publish = AsyncMock(return_value=0)
+    client.unlink = AsyncMock(return_value=1)
+    # Lua-скрипты circuit breaker: состояние всегда CLOSED
+    client.evalsha = AsyncMock(return_value=b"CLOSED")
 
     # Настраиваем pipeline
     client.pipeline = AsyncMock(return_value=pipeline_mock)
@@ -178,7 +184,12 @@ def mock_redis_client():
 
 @pytest.fixture
 def token_service(mock_redis_client, mock_session):
-    service = TokenService(mock_redis_client, mock_session)
+    service = TokenService(
+        mock_redis_client,
+        mock_session,
+        claims_cache=VerifiedClaimsCache(),
+        blacklist_mirror=BlacklistMirror(),
+    )
     service.config.secret_key = "test_secret_key"
     service.config.algorithm = "HS256"
     service.config.access_token_expire_minutes = 30
@@ -187,9 +198,18 @@ def token_service(mock_redis_client, mock_session):
 
 
 @pytest.fixture
-async def circuit_breaker(mock_redis_client):
+async def fake_redis() -> AsyncGenerator[FakeAsyncRedis, None]:
+    """In-memory Redis with Lua and pub/sub support"""
+    client = FakeAsyncRedis()
+    yield client
+    await client.aclose()
+
+
+@pytest.fixture
+async def circuit_breaker(fake_redis):
+    AsyncCircuitBreaker.reset_local_state()
     return AsyncCircuitBreaker(
-        redis=mock_redis_client,
+        redis=fake_redis,
         service_name="test_service",
         failure_threshold=3,
         recovery_timeout=1,
@@ -0,0 +1,122 @@
+import asyncio
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from auth.db.crud import AccessLogRepository
+from auth.services.access_log_writer import AccessLogWriter
+
+
+@pytest.fixture
+def session_factory():
+    factory = MagicMock()
+    factory.return_value.__aenter__ = AsyncMock(return_value=MagicMock())
+    factory.return_value.__aexit__ = AsyncMock(return_value=False)
+    return factory
+
+
+@pytest.fixture
+def batches(monkeypatch):
+    written = []
+
+    async def create_many(self, logs):
+        written.append(list(logs))
+
+    monkeypatch.setattr(AccessLogRepository, "create_many", create_many)
+    return written
+
+
+class TestAccessLogWriter:
+    async def test_flush_writes_batches(self, session_factory, batches):
+        writer = AccessLogWriter(session_factory, batch_size=2)
+        user_id = uuid.uuid4()
+        for _ in range(5):
+            writer.write(user_id, "10.0.0.1", "pytest")
+
+        assert await writer.flush() == 5
+
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        assert batches[0][0]["user_id"] == user_id
+        assert writer.stats()["buffered"] == 0
+        assert writer.stats()["flushes"] == 3
+
+    async def test_invalid_ip_is_stored_as_null(self, session_factory, batches):
+        writer = AccessLogWriter(session_factory)
+        writer.write(uuid.uuid4(), "unknown", "pytest")
+
+        await writer.flush()
+
+        assert batches[0][0]["ip_address"] is None
+
+    async def test_size_trigger_flushes_in_background(self, session_factory, batches):
+        writer = AccessLogWriter(session_factory, batch_size=3, flush_interval=60)
+        await writer.start()
+
+        for _ in range(3):
+            writer.write(uuid.uuid4(), "10.0.0.1", "pytest")
+        await asyncio.sleep(0.05)
+
+        assert [len(batch) for batch in batches] == [3]
+        await writer.stop()
+
+    async def test_time_trigger_flushes_partial_batch(self, session_factory, batches):
+        writer = AccessLogWriter(session_factory, batch_size=100, flush_interval=0.01)
+        await writer.start()
+
+        writer.write(uuid.uuid4(), "10.0.0.1", "pytest")
+        await asyncio.sleep(0.05)
+
+        assert [len(batch) for batch in batches] == [1]
+        await writer.stop()
+
+    async def test_stop_flushes_remaining_records(self, session_factory, batches):
+        writer = AccessLogWriter(session_factory, batch_size=100, flush_interval=60)
+        await writer.start()
+        writer.write(uuid.uuid4(), "10.0.0.1", "pytest")
+
+        await writer.stop()
+
+        assert [len(batch) for batch in batches] == [1]
+
+    async def test_stop_waits_for_flush_in_progress(
+        self, session_factory, monkeypatch
+    ):
+        written = []
+        started = asyncio.Event()
+
+        async def slow_create_many(self, logs):
+            started.set()
+            await asyncio.sleep(0.05)
+            written.extend(logs)
+
+        monkeypatch.setattr(AccessLogRepository, "create_many", slow_create_many)
+        writer = AccessLogWriter(session_factory, batch_size=2, flush_interval=60)
+        await writer.start()
+        for _ in range(5):
+            writer.write(uuid.uuid4(), "10.0.0.1", "pytest")
+        await started.wait()
+
+        await writer.stop()
+
+        assert len(written) == 5
+        assert writer.stats()["buffered"] == 0
+
+    async def test_failed_batch_is_kept_for_retry(self, session_factory, monkeypatch):
+        monkeypatch.setattr(
+            AccessLogRepository,
+            "create_many",
+            AsyncMock(side_effect=ConnectionError("database is down")),
+        )
+        writer = AccessLogWriter(session_factory, batch_size=2, max_buffer=3)
+        for _ in range(3):
+            writer.write(uuid.uuid4(), "10.0.0.1", "pytest")
+
+        assert await writer.flush() == 0
+
+        stats = writer.stats()
+        assert stats["buffered"] == 3
+        assert stats["errors"] == 1
+
+        writer.write(uuid.uuid4(), "10.0.0.1", "pytest")
+        assert writer.stats()["dropped"] == 1
@@ -0,0 +1,188 @@
+import uuid
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+
+from auth.api.v1 import auth_api
+from auth.core.decorators import get_token_service
+from auth.db.crud import AccessLogRepository
+from auth.db.postgres import get_session
+from auth.models.access_log import AccessLog, create_partition
+from auth.schemas.access_log_schema import AccessLogCursor
+from auth.services.access_log_retention import add_months, plan_partitions
+
+
+class TestAccessLogCursor:
+    def test_round_trip(self):
+        cursor = AccessLogCursor(
+            accessed_at=datetime(2026, 10, 1, 12, 30), id=uuid.uuid4()
+        )
+
+        assert AccessLogCursor.decode(cursor.encode()) == cursor
+
+    @pytest.mark.parametrize("raw", ["", "not-base64!", "bm8tc2VwYXJhdG9y"])
+    def test_invalid_cursor(self, raw):
+        with pytest.raises(ValueError):
+            AccessLogCursor.decode(raw)
+
+
+class TestKeysetQuery:
+    async def test_filters_by_row_comparison(self):
+        class Session:
+            async def execute(self, stmt):
+                self.stmt = stmt
+
+                class Result:
+                    def scalars(self):
+                        return self
+
+                    def all(self):
+                        return []
+
+                return Result()
+
+        session = Session()
+        after = (datetime(2026, 10, 1), uuid.uuid4())
+
+        await AccessLogRepository(session).get_user_logs(uuid.uuid4(), 5, after)
+
+        sql = str(session.stmt.compile(dialect=postgresql.dialect()))
+        assert "(access_logs.accessed_at, access_logs.id) <" in sql
+        assert "ORDER BY access_logs.accessed_at DESC, access_logs.id DESC" in sql
+        assert "OFFSET" not in sql
+
+
+class TestAccessLogsEndpoint:
+    @pytest.fixture
+    def user_id(self):
+        return uuid.uuid4()
+
+    @pytest.fixture
+    def logs(self, user_id):
+        start = datetime(2026, 10, 1, 12, 0)
+        return [
+            SimpleNamespace(
+                id=uuid.uuid4(),
+                user_id=user_id,
+                ip_address="127.0.0.1",
+                user_agent="pytest",
+                accessed_at=start + timedelta(minutes=index),
+                created_at=start,
+                updated_at=start,
+            )
+            for index in range(5)
+        ]
+
+    @pytest.fixture
+    def client(self, monkeypatch, user_id, logs):
+        async def get_user_logs(repository, owner_id, limit=10, after=None):
+            assert owner_id == user_id
+            rows = sorted(
+                logs, key=lambda log: (log.accessed_at, log.id), reverse=True
+            )
+            if after is not None:
+                rows = [log for log in rows if (log.accessed_at, log.id) < after]
+            return rows[:limit]
+
+        class TokenService:
+            async def get_current_user(self, token):
+                return {"id": user_id} if token == "valid" else None
+
+        async def override_session():
+            yield None
+
+        monkeypatch.setattr(AccessLogRepository, "get_user_logs", get_user_logs)
+        app = FastAPI()
+        app.include_router(auth_api.router)
+        app.dependency_overrides[get_session] = override_session
+        app.dependency_overrides[get_token_service] = TokenService
+        return TestClient(app)
+
+    async def test_pages_through_next_cursor(self, client, logs):
+        headers = {"Authorization": "Bearer valid"}
+
+        first = client.get("/access_logs", params={"limit": 3}, headers=headers)
+        assert first.status_code == 200, first.text
+        cursor = first.json()["next_cursor"]
+        assert cursor
+
+        second = client.get(
+            "/access_logs", params={"limit": 3, "cursor": cursor}, headers=headers
+        )
+        assert second.status_code == 200, second.text
+        assert second.json()["next_cursor"] is None
+
+        seen = [item["id"] for item in first.json()["items"] + second.json()["items"]]
+        expected = sorted(logs, key=lambda log: log.accessed_at, reverse=True)
+        assert seen == [str(log.id) for log in expected]
+
+    async def test_requires_valid_token(self, client):
+        response = client.get(
+            "/access_logs", headers={"Authorization": "Bearer expired"}
+        )
+
+        assert response.status_code == 401
+
+    async def test_current_user_is_not_a_query_parameter(self, client):
+        parameters = client.app.openapi()["paths"]["/access_logs"]["get"][
+            "parameters"
+        ]
+
+        assert "current_user" not in {parameter["name"] for parameter in parameters}
+
+
+class TestPartitionPlan:
+    def test_add_months_crosses_years(self):
+        assert add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+        assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+
+    def test_creates_missing_months_ahead(self):
+        plan = plan_partitions(
+            ["access_logs_2026_10", "access_logs_default"],
+            today=date(2026, 10, 17),
+            months_ahead=2,
+            retention_months=12,
+        )
+
+        assert plan.create == [
+            ("access_logs_2026_11", date(2026, 11, 1), date(2026, 12, 1)),
+            ("access_logs_2026_12", date(2026, 12, 1), date(2027, 1, 1)),
+        ]
+        assert plan.drop == []
+
+    def test_drops_only_expired_monthly_partitions(self):
+        plan = plan_partitions(
+            [
+                "access_logs_2026_07",
+                "access_logs_2026_08",
+                "access_logs_2026_09",
+                "access_logs_2026_10",
+                "access_logs_default",
+            ],
+            today=date(2026, 10, 17),
+            months_ahead=0,
+            retention_months=2,
+        )
+
+        assert plan.create == []
+        assert plan.drop == ["access_logs_2026_07"]
+
+
+class TestModelPartitions:
+    def test_create_all_adds_default_and_current_month(self):
+        executed = []
+
+        class Connection:
+            def execute(self, statement):
+                executed.append(" ".join(str(statement).split()))
+
+        create_partition(AccessLog.__table__, Connection())
+
+        month = date.today().replace(day=1)
+        assert "PARTITION OF access_logs DEFAULT" in executed[0]
+        assert f"access_logs_{month:%Y_%m} PARTITION OF access_logs" in executed[1]
+        assert f"FROM ('{month}')" in executed[1]
@@ -2,19 +2,25 @@ from unittest.mock import AsyncMock, MagicMock
 from uuid import UUID
 
 import pytest
-from fastapi import HTTPException, status
+from fastapi import FastAPI, HTTPException, status
+from fastapi.testclient import TestClient
 
 from auth.api.v1.auth_api import (
     AuthRequest,
     TokenResponse,
     UserCreate,
     get_current_user,
+    get_permissions_versions,
     login,
     logout,
     refresh,
     register,
     router
 )
+from auth.core.decorators import get_token_service
+from auth.db.crud import UserRepository
+from auth.db.postgres import get_session
+from auth.schemas.auth_schema import PermissionsVersionsRequest
 from auth.services.auth_service import AuthService
 from auth.services.token_service import TokenService
 
@@ -194,3 +200,70 @@ class TestAuthAPI:
             await get_current_user(token, mock_token_service)
         assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
         assert "Invalid token" in str(exc_info.value.detail)
+
+
+class TestPermissionsVersionsAPI:
+    async def test_returns_versions_of_known_users(self, mock_session, monkeypatch):
+        known, unknown = UUID(int=1), UUID(int=2)
+        lookup = AsyncMock(return_value={known: 4})
+        monkeypatch.setattr(UserRepository, "get_permissions_versions", lookup)
+
+        response = await get_permissions_versions(
+            PermissionsVersionsRequest(user_ids=[known, unknown]),
+            session=mock_session,
+            current_user={"id": known},
+        )
+
+        assert response.versions == {known: 4}
+        lookup.assert_awaited_once_with([known, unknown])
+
+    async def test_database_error(self, mock_session, monkeypatch):
+        monkeypatch.setattr(
+            UserRepository,
+            "get_permissions_versions",
+            AsyncMock(side_effect=Exception("db down")),
+        )
+
+        with pytest.raises(HTTPException) as exc_info:
+            await get_permissions_versions(
+                PermissionsVersionsRequest(user_ids=[UUID(int=1)]),
+                session=mock_session,
+                current_user={"id": UUID(int=1)},
+            )
+
+        assert exc_info.value.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+
+    @pytest.mark.parametrize(
+        "roles, expected",
+        [
+            (["user"], status.HTTP_403_FORBIDDEN),
+            (["service"], status.HTTP_200_OK),
+            (["admin"], status.HTTP_200_OK),
+        ],
+    )
+    async def test_restricted_to_admin_and_service(
+        self, roles, expected, monkeypatch
+    ):
+        monkeypatch.setattr(
+            UserRepository, "get_permissions_versions", AsyncMock(return_value={})
+        )
+
+        class TokenService:
+            async def get_current_user(self, token):
+                return {"id": UUID(int=1), "roles": roles}
+
+        async def override_session():
+            yield None
+
+        app = FastAPI()
+        app.include_router(router)
+        app.dependency_overrides[get_session] = override_session
+        app.dependency_overrides[get_token_service] = TokenService
+
+        response = TestClient(app).post(
+            "/permissions_versions",
+            json={"user_ids": [str(UUID(int=2))]},
+            headers={"Authorization": "Bearer token"},
+        )
+
+        assert response.status_code == expected
@@ -0,0 +1,122 @@
+import asyncio
+import time
+import uuid
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fakeredis import FakeAsyncRedis
+from fastapi import HTTPException
+
+from auth.services.blacklist_mirror import BlacklistMirror, BloomFilter
+from auth.services.token_service import TokenService, VerifiedClaimsCache
+
+pytestmark = pytest.mark.asyncio
+
+# Максимальная задержка распространения отзыва токена между воркерами
+PROPAGATION_DEADLINE = 1.0
+
+
+async def make_worker(redis: FakeAsyncRedis) -> TokenService:
+    mirror = BlacklistMirror(capacity=1000, error_rate=0.01)
+    await mirror.start(redis)
+    service = TokenService(
+        redis, AsyncMock(), claims_cache=VerifiedClaimsCache(), blacklist_mirror=mirror
+    )
+    service.config.secret_key = "test_secret_key"
+    service.config.algorithm = "HS256"
+    return service
+
+
+async def wait_until(predicate, timeout: float = PROPAGATION_DEADLINE) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not met in time"
+        await asyncio.sleep(0.01)
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    items = [str(uuid.uuid4()) for _ in range(1000)]
+    for item in items:
+        bloom.add(item)
+
+    assert all(item in bloom for item in items)
+    false_positives = sum(str(uuid.uuid4()) in bloom for _ in range(10000))
+    assert false_positives < 300
+
+
+async def test_unsynced_mirror_falls_back_to_redis():
+    mirror = BlacklistMirror()
+
+    assert mirror.might_contain("any-jti") is True
+
+
+async def test_mirror_is_filled_from_existing_blacklist(fake_redis):
+    await fake_redis.setex("blacklist_token:old-jti", 300, "1")
+    mirror = BlacklistMirror(capacity=1000)
+
+    await mirror.start(fake_redis)
+    try:
+        await wait_until(lambda: mirror.ready)
+        assert mirror.might_contain("old-jti") is True
+        assert mirror.might_contain("other-jti") is False
+    finally:
+        await mirror.stop()
+
+
+async def test_concurrent_rebuilds_keep_events_during_scan():
+    """A resubscribe rebuild racing the periodic one must not lose events"""
+    scan_delays = [0.01, 0.05]
+
+    async def slow_scan_iter(match, count):
+        await asyncio.sleep(scan_delays.pop(0))
+        return
+        yield
+
+    mirror = BlacklistMirror(capacity=1000)
+    mirror.redis = AsyncMock()
+    mirror.redis.scan_iter = slow_scan_iter
+
+    async def revoke_during_second_scan():
+        await asyncio.sleep(0.03)
+        mirror.add("revoked-jti")
+
+    await asyncio.gather(
+        mirror._rebuild(), mirror._rebuild(), revoke_during_second_scan()
+    )
+
+    mirror._ready = True
+    assert mirror.might_contain("revoked-jti") is True
+    assert mirror.rebuilds == 2
+
+
+async def test_token_revoked_in_one_worker_is_rejected_by_another(fake_redis):
+    worker_a = await make_worker(fake_redis)
+    worker_b = await make_worker(fake_redis)
+    try:
+        await wait_until(
+            lambda: worker_a.blacklist_mirror.ready and worker_b.blacklist_mirror.ready
+        )
+        token = await worker_a.create_access_token(
+            user_id=uuid.uuid4(), username="test_user", is_superuser=False, roles=[]
+        )
+
+        # Отрицательная проверка не ходит в Redis
+        with patch.object(fake_redis, "exists", wraps=fake_redis.exists) as exists:
+            assert await worker_b.validate_token(token)
+        assert exists.call_count == 0
+
+        await worker_a.blacklist_token(token)
+        revoked_at = time.monotonic()
+
+        while True:
+            try:
+                await worker_b.validate_token(token)
+            except HTTPException as e:
+                assert e.detail == "Token has been blacklisted"
+                break
+            assert time.monotonic() - revoked_at < PROPAGATION_DEADLINE
+            await asyncio.sleep(0.01)
+    finally:
+        await worker_a.blacklist_mirror.stop()
+        await worker_b.blacklist_mirror.stop()
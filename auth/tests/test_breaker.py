@@ -1,59 +1,24 @@
 # auth/tests/test_breaker.py
-import asyncio
 import json
-from unittest.mock import AsyncMock
+import time
+from unittest.mock import patch
 
 import pytest
+from fastapi import HTTPException
 
-from auth.core.breaker import CircuitState
+from auth.core.breaker import AsyncCircuitBreaker, CircuitState
 
 
 @pytest.mark.asyncio
-async def test_circuit_breaker_initial_state(circuit_breaker, mock_redis_client):
+async def test_circuit_breaker_initial_state(circuit_breaker):
     """Test initial circuit breaker state"""
-    mock_redis_client.get.return_value = None
     state = await circuit_breaker.get_state()
     assert state == CircuitState.CLOSED
 
 
 @pytest.mark.asyncio
-async def test_circuit_breaker_opens_after_failures(
-    circuit_breaker, mock_service, mock_redis_client
-):
+async def test_circuit_breaker_opens_after_failures(circuit_breaker, mock_service):
     """Test circuit breaker opens after threshold failures"""
-    state_key = f"{circuit_breaker._prefix}:state"
-    failures_key = f"{circuit_breaker._prefix}:failures"
-
-    # Словарь для хранения состояния мока
-    mock_state = {"failure_count": 0}
-
-    async def mock_get(key):
-        if key == failures_key:
-            # Увеличиваем счетчик ошибок при каждом вызове
-            mock_state["failure_count"] += 1
-            return str(mock_state["failure_count"]).encode()
-        elif key == state_key:
-            # Возвращаем OPEN когда достигнут порог ошибок
-            return (
-                b"OPEN"
-                if mock_state["failure_count"] >= circuit_breaker.failure_threshold
-                else None
-            )
-        return None
-
-    async def mock_set(*args, **kwargs):
-        return True
-
-    # Настраиваем mock.get и mock.set
-    mock_redis_client.get = AsyncMock(side_effect=mock_get)
-    mock_redis_client.set = AsyncMock(side_effect=mock_set)
-
-    # Настраиваем pipeline
-    pipeline_mock = AsyncMock()
-    pipeline_mock.set = AsyncMock(return_value=pipeline_mock)
-    pipeline_mock.execute = AsyncMock(return_value=[True, True])
-    mock_redis_client.pipeline = AsyncMock(return_value=pipeline_mock)
-
     protected_operation = circuit_breaker(mock_service.test_operation)
     mock_service.should_fail = True
 
@@ -62,28 +27,15 @@ async def test_circuit_breaker_opens_after_failures(
         with pytest.raises(Exception):
             await protected_operation()
 
-    # Проверяем состояние после ошибок
     state = await circuit_breaker.get_state()
     assert state == CircuitState.OPEN
 
 
 @pytest.mark.asyncio
-async def test_circuit_breaker_fallback(
-    circuit_breaker, mock_service, mock_redis_client
-):
+async def test_circuit_breaker_fallback(circuit_breaker, mock_service, fake_redis):
     """Test fallback mechanism when circuit is open"""
-    responses = {
-        f"{circuit_breaker._prefix}:state": b"OPEN",
-        f"{circuit_breaker._prefix}:last_failure": str(
-            asyncio.get_event_loop().time()
-        ).encode(),
-        f"auth_token_cache:test_user": None,
-    }
-
-    def mock_get(key):
-        return responses.get(key, None)
-
-    mock_redis_client.get.side_effect = mock_get
+    await fake_redis.set(circuit_breaker.state_key, "OPEN")
+    await fake_redis.set(circuit_breaker.last_failure_key, str(time.time()))
     mock_service.should_fail = True
 
     protected_operation = circuit_breaker(mock_service.test_operation)
@@ -92,77 +44,118 @@ async def test_circuit_breaker_fallback(
     assert result["access_token"] == "guest_token"
     assert result["refresh_token"] is None
     assert result["permissions"] == ["read_basic"]
+    assert mock_service.call_count == 0
 
 
 @pytest.mark.asyncio
-async def test_circuit_breaker_recovery(
-    circuit_breaker, mock_service, mock_redis_client
-):
+async def test_circuit_breaker_recovery(circuit_breaker, mock_service, fake_redis):
     """Test circuit breaker recovery through half-open state"""
-    current_time = asyncio.get_event_loop().time()
-    old_failure_time = current_time - circuit_breaker.recovery_timeout - 1
-
-    responses = {
-        f"{circuit_breaker._prefix}:state": b"OPEN",
-        f"{circuit_breaker._prefix}:last_failure": str(old_failure_time).encode(),
-        f"{circuit_breaker._prefix}:half_open_tries": b"0",
-    }
-
-    def mock_get(key):
-        return responses.get(key, None)
-
-    # Настраиваем моки
-    mock_redis_client.get.side_effect = mock_get
-    mock_redis_client.set = AsyncMock()
-    mock_redis_client.incr = AsyncMock(return_value=1)
-    mock_redis_client.delete = AsyncMock()
-
-    mock_service.should_fail = False
+    old_failure_time = time.time() - circuit_breaker.recovery_timeout - 1
+    await fake_redis.set(circuit_breaker.state_key, "OPEN")
+    await fake_redis.set(circuit_breaker.last_failure_key, str(old_failure_time))
+    await fake_redis.set(circuit_breaker.failures_key, "3")
 
     protected_operation = circuit_breaker(mock_service.test_operation)
 
-    # First operation in HALF-OPEN
+    # First operation moves the breaker to HALF-OPEN
     result = await protected_operation()
     assert result["access_token"] == "test_token"
+    assert await circuit_breaker.get_state() == CircuitState.HALF_OPEN
 
-    # Проверяем что set был вызван для установки HALF-OPEN состояния
-    mock_redis_client.set.assert_called()
+    # Second success closes it (half_open_max_tries=2)
+    result = await protected_operation()
+    assert result["access_token"] == "test_token"
+    assert await circuit_breaker.get_state() == CircuitState.CLOSED
+    assert await fake_redis.get(circuit_breaker.failures_key) is None
 
-    # Reset mock для следующей проверки
-    mock_redis_client.set.reset_mock()
 
-    # Update state to HALF-OPEN after success
-    responses[f"{circuit_breaker._prefix}:state"] = b"HALF_OPEN"
+@pytest.mark.asyncio
+async def test_circuit_breaker_half_open_failure_reopens(
+    circuit_breaker, mock_service, fake_redis
+):
+    """A failure while probing in HALF-OPEN opens the circuit again"""
+    await fake_redis.set(circuit_breaker.state_key, "HALF_OPEN")
+    mock_service.should_fail = True
 
-    # Second operation should succeed
-    result = await protected_operation()
-    assert result["access_token"] == "test_token"
+    with pytest.raises(Exception):
+        await circuit_breaker(mock_service.test_operation)()
 
-    # Verify state transitions
-    mock_redis_client.set.assert_called()
+    assert await circuit_breaker.get_state() == CircuitState.OPEN
 
 
 @pytest.mark.asyncio
-async def test_circuit_breaker_token_caching(
-    circuit_breaker, mock_service, mock_redis_client
+async def test_circuit_breaker_closed_state_is_cached_locally(
+    circuit_breaker, mock_service, fake_redis
 ):
-    """Test token caching mechanism"""
-    test_token = {"access_token": "test_token", "refresh_token": "refresh"}
+    """Happy path in CLOSED state costs no Redis calls once state is known"""
+    protected_operation = circuit_breaker(mock_service.test_operation)
+    await protected_operation()
+
+    with patch.object(
+        fake_redis, "evalsha", wraps=fake_redis.evalsha
+    ) as evalsha_mock, patch.object(
+        fake_redis, "get", wraps=fake_redis.get
+    ) as get_mock:
+        for _ in range(10):
+            await protected_operation()
+
+    assert evalsha_mock.call_count == 0
+    assert get_mock.call_count == 0
+    assert mock_service.call_count == 11
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_transition_is_single_round_trip(
+    circuit_breaker, mock_service, fake_redis
+):
+    """Each transition is one script call, shared by breaker instances"""
+    AsyncCircuitBreaker.reset_local_state()
+    mock_service.should_fail = True
+    protected_operation = circuit_breaker(mock_service.test_operation)
+
+    with patch.object(fake_redis, "evalsha", wraps=fake_redis.evalsha) as evalsha_mock:
+        with pytest.raises(Exception):
+            await protected_operation()
+
+    # acquire + failure
+    assert evalsha_mock.call_count == 2
+
+    other_worker = AsyncCircuitBreaker(
+        redis=fake_redis,
+        service_name=circuit_breaker.service_name,
+        failure_threshold=circuit_breaker.failure_threshold,
+    )
+    with pytest.raises(Exception):
+        await other_worker(mock_service.test_operation)()
+    assert int(await fake_redis.get(circuit_breaker.failures_key)) == 2
 
-    cache_key = f"auth_token_cache:test_user"
-    cached_value = json.dumps(test_token).encode()
 
-    # First call - cache miss
-    mock_redis_client.get.return_value = None
+@pytest.mark.asyncio
+async def test_circuit_breaker_token_caching(circuit_breaker, mock_service, fake_redis):
+    """Test token caching mechanism"""
     protected_operation = circuit_breaker(mock_service.test_operation)
 
     result = await protected_operation(user_id="test_user")
     assert result["access_token"] == "test_token"
 
-    # Second call - cache hit
-    mock_redis_client.get.return_value = cached_value
-    result = await protected_operation(user_id="test_user")
-    assert result["access_token"] == "test_token"
+    cached = await fake_redis.get("auth_token_cache:test_user")
+    assert json.loads(cached)["access_token"] == "test_token"
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_ignores_client_errors(circuit_breaker):
+    """4xx and ignored exceptions are re-raised without opening the circuit"""
+    circuit_breaker.ignored_exceptions = (TimeoutError,)
+
+    async def rejected():
+        raise HTTPException(status_code=401, detail="Invalid username or password")
+
+    async def shed():
+        raise TimeoutError("queue is full")
+
+    for operation in (rejected, shed) * circuit_breaker.failure_threshold:
+        with pytest.raises((HTTPException, TimeoutError)):
+            await circuit_breaker(operation)()
 
-    # Verify cache operations
-    mock_redis_client.setex.assert_called()
+    assert await circuit_breaker.get_state() == CircuitState.CLOSED
+    assert await circuit_breaker.redis.get(circuit_breaker.failures_key) is None
@@ -1,3 +1,4 @@
+from unittest.mock import patch
 from uuid import UUID
 
 import pytest
@@ -6,7 +7,7 @@ from fastapi.responses import JSONResponse
 from opentelemetry.trace import SpanKind
 
 from auth.core.middleware.http import request_limit_middleware
-from auth.core.middleware.request_limit import RequestLimit
+from auth.core.middleware.request_limit import LocalPreLimiter, RequestLimit
 from auth.core.middleware.tracker import RequestTracker
 
 pytestmark = pytest.mark.asyncio
@@ -173,3 +174,51 @@ async def test_middleware_headers(mock_redis_client):
     assert "X-Request-Id" in response.headers
     assert "X-RateLimit-Remaining" in response.headers
     assert response.headers["X-RateLimit-Remaining"] == "4"  # 5 - 1
+
+
+@pytest.mark.parametrize("algorithm", ["sliding_log", "gcra"])
+async def test_rate_limiter_lua_algorithms(fake_redis, algorithm):
+    """Lua algorithms allow exactly max_requests and report remaining"""
+    limiter = RequestLimit(fake_redis, algorithm=algorithm)
+
+    results = [await limiter.is_rate_limit("test_key", 5, 60) for _ in range(6)]
+
+    assert [is_limited for is_limited, _ in results] == [False] * 5 + [True]
+    assert [remaining for _, remaining in results[:5]] == [4, 3, 2, 1, 0]
+
+
+@pytest.mark.parametrize("algorithm", ["sliding_log", "gcra"])
+async def test_rate_limiter_no_double_burst_on_window_boundary(
+    fake_redis, algorithm
+):
+    """Unlike fixed window, a burst at the boundary is not allowed twice"""
+    limiter = RequestLimit(fake_redis, algorithm=algorithm)
+    boundary = 1_700_000_040.0  # кратно окну в 60 секунд
+
+    with patch("auth.core.middleware.request_limit.time.time") as time_mock:
+        time_mock.return_value = boundary - 1
+        before = [await limiter.is_rate_limit("test_key", 5, 60) for _ in range(5)]
+        time_mock.return_value = boundary + 1
+        after = [await limiter.is_rate_limit("test_key", 5, 60) for _ in range(5)]
+
+    assert not any(is_limited for is_limited, _ in before)
+    assert all(is_limited for is_limited, _ in after)
+
+
+async def test_rate_limiter_pre_limiter_skips_redis(context_redis_client):
+    """Obviously abusive keys are rejected in-process"""
+    limiter = RequestLimit(
+        context_redis_client, pre_limiter=LocalPreLimiter(factor=2.0)
+    )
+    pipeline = context_redis_client.pipeline.return_value
+    pipeline.execute.return_value = [100, True]
+
+    results = [await limiter.is_rate_limit("test_key", 5, 60) for _ in range(11)]
+
+    assert results[-1] == (True, 0)
+    assert pipeline.execute.await_count == 10
+
+
+async def test_rate_limiter_unknown_algorithm(context_redis_client):
+    with pytest.raises(ValueError):
+        RequestLimit(context_redis_client, algorithm="leaky")
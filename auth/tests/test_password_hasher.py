@@ -0,0 +1,106 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from auth.api.v1 import auth_api
+from auth.core.breaker import AsyncCircuitBreaker, CircuitState
+from auth.services import auth_service as auth_service_module
+from auth.services.auth_service import AuthService
+from auth.services.password_hasher import PasswordHasher, PasswordHasherOverloaded
+
+
+@pytest.fixture
+def hasher():
+    hasher = PasswordHasher(workers=1, max_queue=1, retry_after=3)
+    yield hasher
+    hasher.shutdown()
+
+
+class TestPasswordHasher:
+    async def test_hash_and_verify(self, hasher):
+        password_hash = await hasher.hash("secret")
+
+        assert password_hash != "secret"
+        assert await hasher.verify(password_hash, "secret") is True
+        assert await hasher.verify(password_hash, "wrong") is False
+        assert hasher.stats()["completed"] == 3
+
+    async def test_verify_without_hash(self, hasher):
+        assert await hasher.verify(None, "secret") is False
+        assert hasher.stats()["completed"] == 0
+
+    async def test_sheds_load_when_queue_is_full(self, hasher):
+        release = threading.Event()
+        running = [
+            asyncio.create_task(hasher._run(release.wait)) for _ in range(2)
+        ]
+        await asyncio.sleep(0)
+
+        with pytest.raises(PasswordHasherOverloaded) as exc_info:
+            await hasher.hash("secret")
+        assert exc_info.value.retry_after == 3
+        assert hasher.stats()["rejected"] == 1
+
+        release.set()
+        await asyncio.gather(*running)
+        await asyncio.sleep(0)
+
+        assert hasher.stats()["in_flight"] == 0
+        assert await hasher.verify(await hasher.hash("secret"), "secret")
+
+    async def test_cancelled_caller_keeps_slot_until_thread_finishes(self, hasher):
+        release = threading.Event()
+        task = asyncio.create_task(hasher._run(release.wait))
+        await asyncio.sleep(0)
+
+        task.cancel()
+        await asyncio.sleep(0)
+        assert hasher.stats()["in_flight"] == 1
+
+        release.set()
+        for _ in range(100):
+            if hasher.stats()["in_flight"] == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert hasher.stats()["in_flight"] == 0
+
+
+class TestLoginUnderOverload:
+    @pytest.fixture
+    def auth_service(self, fake_redis, monkeypatch):
+        AsyncCircuitBreaker.reset_local_state()
+        service = AuthService(MagicMock(), fake_redis)
+        monkeypatch.setattr(
+            service,
+            "get_by_username",
+            AsyncMock(return_value=SimpleNamespace(password_hash="hash")),
+        )
+
+        async def overloaded(*args):
+            raise PasswordHasherOverloaded(retry_after=2)
+
+        monkeypatch.setattr(auth_service_module.password_hasher, "verify", overloaded)
+        return service
+
+    async def test_overload_is_503_and_keeps_circuit_closed(self, auth_service):
+        app = FastAPI()
+        app.include_router(auth_api.router)
+        app.dependency_overrides[auth_api.get_auth_service] = lambda: auth_service
+        transport = httpx.ASGITransport(app=app)
+
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            for _ in range(auth_service.circuit_breaker.failure_threshold + 2):
+                response = await client.post(
+                    "/login", json={"username": "user", "password": "password"}
+                )
+                assert response.status_code == 503
+                assert response.headers["retry-after"] == "2"
+
+        assert await auth_service.circuit_breaker.get_state() == CircuitState.CLOSED
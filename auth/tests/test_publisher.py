@@ -0,0 +1,202 @@
+import asyncio
+import json
+import uuid
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pamqp.commands import Basic
+
+from auth.db.crud import OutboxRepository
+from auth.events import publisher as publisher_module
+from auth.events.outbox_relay import OutboxRelay
+from auth.events.publisher import RabbitPublisher
+from auth.events.user_events import UserCreatedEvent, UserEventProducer
+from auth.models.outbox import OutboxEvent
+
+
+class FakeExchange:
+    def __init__(self):
+        self.messages = []
+        self.fail = False
+        self.nack_bodies = set()
+
+    async def publish(self, message, routing_key, timeout=None):
+        if self.fail:
+            raise ConnectionError("broker is down")
+        if message.body in self.nack_bodies:
+            return Basic.Nack()
+        self.messages.append((routing_key, message.body))
+        return Basic.Ack()
+
+
+@pytest.fixture
+def exchange():
+    return FakeExchange()
+
+
+@pytest.fixture
+def connect(monkeypatch, exchange):
+    channel = MagicMock(is_closed=False)
+    channel.default_exchange = exchange
+    channel.declare_queue = AsyncMock()
+
+    connection = MagicMock(is_closed=False)
+    connection.channel = AsyncMock(return_value=channel)
+    connection.close = AsyncMock()
+
+    connect_robust = AsyncMock(return_value=connection)
+    monkeypatch.setattr(publisher_module.aio_pika, "connect_robust", connect_robust)
+    return connect_robust
+
+
+async def wait_for(predicate, timeout: float = 1.0):
+    for _ in range(int(timeout / 0.01)):
+        if predicate():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition was not met")
+
+
+class TestRabbitPublisher:
+    async def test_publishes_over_one_connection(self, connect, exchange):
+        publisher = RabbitPublisher("amqp://test", channels=2, batch_size=10)
+        await publisher.start()
+
+        for i in range(25):
+            publisher.publish("queue", str(i).encode())
+        await wait_for(lambda: publisher.published == 25)
+        await publisher.stop()
+
+        assert connect.await_count == 1
+        assert sorted(int(body) for _, body in exchange.messages) == list(range(25))
+        assert publisher.stats()["pending"] == 0
+
+    async def test_keeps_messages_while_broker_is_down(self, connect, exchange):
+        publisher = RabbitPublisher("amqp://test", channels=1, retry_delay=0.01)
+        exchange.fail = True
+        await publisher.start()
+
+        publisher.publish("queue", b"event")
+        await wait_for(lambda: publisher.failed_batches > 0)
+        assert publisher.pending == 1
+
+        exchange.fail = False
+        await wait_for(lambda: publisher.published == 1)
+        await publisher.stop()
+
+        assert exchange.messages == [("queue", b"event")]
+
+    async def test_retries_only_nacked_messages(self, connect, exchange):
+        publisher = RabbitPublisher("amqp://test", channels=1, retry_delay=0.01)
+        exchange.nack_bodies = {b"second"}
+        publisher.publish("queue", b"first")
+        publisher.publish("queue", b"second")
+        await publisher.start()
+
+        await wait_for(lambda: publisher.failed_batches > 0)
+        exchange.nack_bodies = set()
+        await wait_for(lambda: publisher.published == 2)
+        await publisher.stop()
+
+        assert exchange.messages == [("queue", b"first"), ("queue", b"second")]
+
+    async def test_senders_start_with_first_message(self, connect, exchange):
+        publisher = RabbitPublisher("amqp://test", channels=3)
+        await publisher.start()
+
+        assert publisher._workers == []
+
+        publisher.publish("queue", b"event")
+        assert len(publisher._workers) == 3
+        await wait_for(lambda: publisher.published == 1)
+        await publisher.stop()
+
+    async def test_drops_oldest_when_outbox_is_full(self):
+        publisher = RabbitPublisher("amqp://test", outbox_size=2)
+
+        for body in (b"1", b"2", b"3"):
+            publisher.publish("queue", body)
+
+        assert publisher.pending == 2
+        assert publisher.stats()["dropped"] == 1
+        assert [message.body for message in publisher._outbox] == [b"2", b"3"]
+
+
+class TestUserEventProducer:
+    async def test_stage_user_created_adds_outbox_row(self):
+        session = MagicMock()
+        rabbit_config = MagicMock(user_created_queue="user_created")
+        producer = UserEventProducer(rabbit_config, OutboxRepository(session))
+        event = UserCreatedEvent(user_id=uuid.uuid4(), email="user@example.com")
+
+        producer.stage_user_created(event)
+
+        outbox_event = session.add.call_args.args[0]
+        assert isinstance(outbox_event, OutboxEvent)
+        assert outbox_event.event_type == "user_created"
+        assert outbox_event.routing_key == "user_created"
+        assert outbox_event.payload == event.to_payload()
+        session.commit.assert_not_called()
+
+
+def build_outbox_event(event_id: int, seconds_ago: int = 0) -> OutboxEvent:
+    event = OutboxEvent("user_created", "user_created", {"user_id": str(event_id)})
+    event.id = event_id
+    event.created_at = datetime.utcnow() - timedelta(seconds=seconds_ago)
+    return event
+
+
+@pytest.fixture
+def outbox_session():
+    session = MagicMock()
+    session.begin.return_value.__aenter__ = AsyncMock()
+    session.begin.return_value.__aexit__ = AsyncMock(return_value=False)
+    session.execute = AsyncMock()
+
+    factory = MagicMock()
+    factory.return_value.__aenter__ = AsyncMock(return_value=session)
+    factory.return_value.__aexit__ = AsyncMock(return_value=False)
+    return factory, session
+
+
+class TestOutboxRelay:
+    async def test_deletes_only_confirmed_events(self, outbox_session):
+        factory, session = outbox_session
+        events = [build_outbox_event(1, seconds_ago=30), build_outbox_event(2)]
+        claimed = MagicMock()
+        claimed.scalars.return_value.all.return_value = events
+        session.execute.side_effect = [claimed, MagicMock()]
+
+        publisher = MagicMock()
+        publisher.publish_confirmed = AsyncMock(
+            side_effect=lambda messages: [messages[1]]
+        )
+        relay = OutboxRelay(factory, publisher, batch_size=10)
+
+        assert await relay.relay_once() == 1
+
+        messages = publisher.publish_confirmed.await_args.args[0]
+        assert [message.message_id for message in messages] == ["1", "2"]
+        assert json.loads(messages[0].body) == {"user_id": "1"}
+
+        delete_stmt = session.execute.await_args_list[1].args[0]
+        assert delete_stmt.compile().params["id_1"] == [1]
+
+        stats = relay.stats()
+        assert stats["relayed"] == 1
+        assert stats["failed"] == 1
+        assert stats["lag_seconds"] >= 30
+
+    async def test_empty_outbox_resets_lag(self, outbox_session):
+        factory, session = outbox_session
+        claimed = MagicMock()
+        claimed.scalars.return_value.all.return_value = []
+        session.execute.return_value = claimed
+        publisher = MagicMock(publish_confirmed=AsyncMock())
+        relay = OutboxRelay(factory, publisher)
+        relay.lag_seconds = 10.0
+
+        assert await relay.relay_once() == 0
+        assert relay.lag_seconds == 0.0
+        publisher.publish_confirmed.assert_not_awaited()
@@ -0,0 +1,62 @@
+import pytest
+from fakeredis import FakeServer
+from fakeredis.aioredis import FakeConnection
+from redis.asyncio import Redis
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from auth.core.metrics import collect_metrics
+from auth.db import redis_db
+from auth.db.redis_db import InstrumentedConnectionPool
+
+
+@pytest.fixture
+def pool():
+    return InstrumentedConnectionPool(
+        connection_class=FakeConnection,
+        server=FakeServer(),
+        max_connections=1,
+        timeout=0.05,
+    )
+
+
+class TestInstrumentedConnectionPool:
+    async def test_counts_checkouts(self, pool):
+        client = Redis(connection_pool=pool)
+
+        await client.set("key", "value")
+        assert await client.get("key") == b"value"
+
+        stats = pool.stats()
+        assert stats["checkouts"] == 2
+        assert stats["created"] == 1
+        assert stats["in_use"] == 0
+        assert stats["timeouts"] == 0
+
+        await pool.disconnect()
+
+    async def test_counts_timeouts_when_exhausted(self, pool):
+        held = await pool.get_connection("GET")
+
+        with pytest.raises(RedisConnectionError):
+            await pool.get_connection("GET")
+
+        stats = pool.stats()
+        assert stats["timeouts"] == 1
+        assert stats["in_use"] == 1
+        assert stats["wait_seconds_max"] >= 0.05
+
+        await pool.release(held)
+        await pool.disconnect()
+
+
+class TestSharedClient:
+    async def test_get_redis_returns_singleton(self, monkeypatch):
+        monkeypatch.setattr(redis_db, "redis", None)
+
+        client = redis_db.get_redis()
+        assert redis_db.get_redis() is client
+        assert isinstance(client.connection_pool, InstrumentedConnectionPool)
+        assert "redis_pool" in collect_metrics()
+
+        await redis_db.close_redis()
+        assert redis_db.redis is None
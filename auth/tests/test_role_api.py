@@ -12,11 +12,14 @@ from auth.api.v1.role_api import (
     get_current_user_roles,
     get_role,
     get_roles,
+    get_users_by_role,
+    remove_users_from_role,
     update_role
 )
 from auth.schemas.role_schema import (
     RoleResponse,
     UpdateRoleRequest,
+    UserAssignmentStatus,
     UserRoleAssignment
 )
 from auth.services.role_service import RoleService
@@ -25,7 +28,7 @@ from auth.services.role_service import RoleService
 # Tests for get_roles endpoint
 async def test_get_roles_success(mock_session):
     # Arrange
-    role_service = RoleService(mock_session)
+    role_service = RoleService(mock_session, None)
     test_uuid = uuid.uuid4()
     test_datetime = datetime(2024, 11, 8, 7, 36, 26, 540880)
 
@@ -38,7 +41,6 @@ async def test_get_roles_success(mock_session):
             is_deleted=False,
             created_at=test_datetime,
             updated_at=test_datetime,
-            users=[],
         )
     ]
     role_service.get_all = AsyncMock(return_value=mock_roles)
@@ -62,7 +64,7 @@ async def test_get_roles_success(mock_session):
 
 async def test_get_roles_empty_list(mock_session):
     # Arrange
-    role_service = RoleService(mock_session)
+    role_service = RoleService(mock_session, None)
     role_service.get_all = AsyncMock(return_value=[])
     role_service.count = AsyncMock(return_value=0)
 
@@ -76,7 +78,7 @@ async def test_get_roles_empty_list(mock_session):
 
 async def test_get_roles_database_error(mock_session, mock_db_error):
     # Arrange
-    role_service = RoleService(mock_session)
+    role_service = RoleService(mock_session, None)
     role_service.get_all = AsyncMock(side_effect=mock_db_error)
 
     # Act & Assert
@@ -100,10 +102,9 @@ async def test_get_role_success(mock_session, mock_role):
         is_deleted=False,
         created_at=test_datetime,
         updated_at=test_datetime,
-        users=[],
     )
 
-    role_service = RoleService(mock_session)
+    role_service = RoleService(mock_session, None)
     role_service.get_by_id = AsyncMock(return_value=mock_role)
 
     # Act
@@ -117,7 +118,7 @@ async def test_get_role_success(mock_session, mock_role):
 
 async def test_get_role_not_found(mock_session):
     # Arrange
-    role_service = RoleService(mock_session)
+    role_service = RoleService(mock_session, None)
     role_service.get_by_id = AsyncMock(return_value=None)
     role_id = uuid.uuid4()
 
@@ -141,9 +142,8 @@ async def test_update_role_success(mock_session, mock_role):
         is_deleted=False,
         created_at=test_datetime,
         updated_at=test_datetime,
-        users=[],
     )
-    role_service = RoleService(mock_session)
+    role_service = RoleService(mock_session, None)
     role_service.get_by_id = AsyncMock(return_value=mock_role)
     role_service.get_by_name = AsyncMock(return_value=None)
     role_service.update = AsyncMock(return_value=mock_role)
@@ -162,7 +162,7 @@ async def test_update_role_success(mock_session, mock_role):
 
 async def test_update_role_name_conflict(mock_session, mock_role):
     # Arrange
-    role_service = RoleService(mock_session)
+    role_service = RoleService(mock_session, None)
     role_service.get_by_id = AsyncMock(return_value=mock_role)
     role_service.get_by_name = AsyncMock(return_value={"id": uuid.uuid4()})
 
@@ -179,7 +179,7 @@ async def test_update_role_name_conflict(mock_session, mock_role):
 # Tests for delete_role endpoint
 async def test_delete_role_success(mock_session, mock_role):
     # Arrange
-    role_service = RoleService(mock_session)
+    role_service = RoleService(mock_session, None)
     role_service.get_by_id = AsyncMock(return_value=mock_role)
     role_service.delete = AsyncMock(return_value=True)
 
@@ -192,7 +192,7 @@ async def test_delete_role_success(mock_session, mock_role):
 
 async def test_delete_role_not_found(mock_session):
     # Arrange
-    role_service = RoleService(mock_session)
+    role_service = RoleService(mock_session, None)
     role_service.get_by_id = AsyncMock(return_value=None)
     role_id = uuid.uuid4()
 
@@ -205,43 +205,164 @@ async def test_delete_role_not_found(mock_session):
 # Tests for assign_users_to_role endpoint
 async def test_assign_users_to_role_success(mock_session, mock_role):
     # Arrange
-    role_service = RoleService(mock_session)
-    role_service.get_by_id = AsyncMock(return_value=mock_role)
-    role_service.give_role_to_user = AsyncMock(return_value=True)
+    role_service = RoleService(mock_session, None)
+    admin_id, new_user, assigned_user, missing_user = (uuid.uuid4() for _ in range(4))
+    role_service.assign_role_to_users = AsyncMock(
+        return_value={
+            new_user: UserAssignmentStatus.ASSIGNED,
+            assigned_user: UserAssignmentStatus.ALREADY_ASSIGNED,
+            missing_user: UserAssignmentStatus.USER_NOT_FOUND,
+        }
+    )
 
-    user_ids = [uuid.uuid4(), uuid.uuid4()]
+    user_ids = [new_user, assigned_user, missing_user]
     assignment = UserRoleAssignment(user_ids=user_ids)
 
     # Act
-    await assign_users_to_role(
-        role_id=mock_role.id, assignment=assignment, role_service=role_service
+    result = await assign_users_to_role(
+        current_user={"id": admin_id},
+        role_id=mock_role.id,
+        assignment=assignment,
+        role_service=role_service,
     )
 
     # Assert
-    assert role_service.give_role_to_user.call_count == len(user_ids)
+    role_service.assign_role_to_users.assert_awaited_once_with(
+        mock_role.id, user_ids, assigned_by=admin_id
+    )
+    assert result.role_id == mock_role.id
+    assert result.changed == 1
+    assert [(r.user_id, r.status) for r in result.results] == [
+        (new_user, UserAssignmentStatus.ASSIGNED),
+        (assigned_user, UserAssignmentStatus.ALREADY_ASSIGNED),
+        (missing_user, UserAssignmentStatus.USER_NOT_FOUND),
+    ]
 
 
-async def test_assign_users_to_role_failure(mock_session, mock_role):
+async def test_assign_users_to_role_not_found(mock_session, mock_role):
     # Arrange
-    role_service = RoleService(mock_session)
-    role_service.get_by_id = AsyncMock(return_value=mock_role)
-    role_service.give_role_to_user = AsyncMock(return_value=False)
+    role_service = RoleService(mock_session, None)
+    role_service.assign_role_to_users = AsyncMock(return_value=None)
 
-    user_ids = [uuid.uuid4()]
-    assignment = UserRoleAssignment(user_ids=user_ids)
+    assignment = UserRoleAssignment(user_ids=[uuid.uuid4()])
+
+    # Act & Assert
+    with pytest.raises(HTTPException) as exc_info:
+        await assign_users_to_role(
+            current_user={"id": uuid.uuid4()},
+            role_id=mock_role.id,
+            assignment=assignment,
+            role_service=role_service,
+        )
+    assert exc_info.value.status_code == 404
+
+
+async def test_assign_users_to_role_failure(mock_session, mock_role, mock_db_error):
+    # Arrange
+    role_service = RoleService(mock_session, None)
+    role_service.assign_role_to_users = AsyncMock(side_effect=mock_db_error)
+
+    assignment = UserRoleAssignment(user_ids=[uuid.uuid4()])
 
     # Act & Assert
     with pytest.raises(HTTPException) as exc_info:
         await assign_users_to_role(
-            role_id=mock_role.id, assignment=assignment, role_service=role_service
+            current_user={"id": uuid.uuid4()},
+            role_id=mock_role.id,
+            assignment=assignment,
+            role_service=role_service,
+        )
+    assert exc_info.value.status_code == 500
+
+
+# Tests for remove_users_from_role endpoint
+async def test_remove_users_from_role_success(mock_session, mock_role):
+    # Arrange
+    role_service = RoleService(mock_session, None)
+    removed_user, other_user = uuid.uuid4(), uuid.uuid4()
+    role_service.remove_role_from_users = AsyncMock(
+        return_value={
+            removed_user: UserAssignmentStatus.REMOVED,
+            other_user: UserAssignmentStatus.NOT_ASSIGNED,
+        }
+    )
+
+    assignment = UserRoleAssignment(user_ids=[removed_user, other_user])
+
+    # Act
+    result = await remove_users_from_role(
+        current_user={"id": uuid.uuid4()},
+        role_id=mock_role.id,
+        assignment=assignment,
+        role_service=role_service,
+    )
+
+    # Assert
+    assert result.changed == 1
+    assert {r.user_id: r.status for r in result.results} == {
+        removed_user: UserAssignmentStatus.REMOVED,
+        other_user: UserAssignmentStatus.NOT_ASSIGNED,
+    }
+
+
+# Tests for get_users_by_role endpoint
+async def test_get_users_by_role_returns_page_and_cursor(mock_session, mock_role):
+    # Arrange
+    role_service = RoleService(mock_session, None)
+    members = [(uuid.uuid4(), "alice"), (uuid.uuid4(), "bob")]
+    cursor = uuid.uuid4()
+    role_service.get_by_id = AsyncMock(return_value=mock_role)
+    role_service.get_role_members = AsyncMock(return_value=(members, 1_000_000))
+
+    # Act
+    result = await get_users_by_role(
+        role_id=mock_role.id, cursor=cursor, limit=2, role_service=role_service
+    )
+
+    # Assert
+    role_service.get_role_members.assert_awaited_once_with(
+        mock_role.id, limit=2, after=cursor
+    )
+    assert result.member_count == 1_000_000
+    assert [(user.id, user.username) for user in result.items] == members
+    assert result.next_cursor == members[-1][0]
+
+
+async def test_get_users_by_role_last_page(mock_session, mock_role):
+    # Arrange
+    role_service = RoleService(mock_session, None)
+    role_service.get_by_id = AsyncMock(return_value=mock_role)
+    role_service.get_role_members = AsyncMock(
+        return_value=([(uuid.uuid4(), "alice")], 1)
+    )
+
+    # Act
+    result = await get_users_by_role(
+        role_id=mock_role.id, cursor=None, limit=100, role_service=role_service
+    )
+
+    # Assert
+    assert result.member_count == 1
+    assert result.next_cursor is None
+
+
+async def test_get_users_by_role_not_found(mock_session):
+    # Arrange
+    role_service = RoleService(mock_session, None)
+    role_service.get_by_id = AsyncMock(return_value=None)
+
+    # Act & Assert
+    with pytest.raises(HTTPException) as exc_info:
+        await get_users_by_role(
+            role_id=uuid.uuid4(), cursor=None, limit=100, role_service=role_service
         )
-    assert exc_info.value.status_code == 400
+    assert exc_info.value.status_code == 404
 
 
 # Tests for create_role endpoint
 async def test_create_role_success(mock_session):
     # Arrange
-    role_service = RoleService(mock_session)
+    role_service = RoleService(mock_session, None)
     role_service.get_by_name = AsyncMock(return_value=None)
     role_service.create = AsyncMock(
         return_value={"id": uuid.uuid4(), "name": "new_role"}
@@ -259,7 +380,7 @@ async def test_create_role_success(mock_session):
 
 async def test_create_role_name_exists(mock_session):
     # Arrange
-    role_service = RoleService(mock_session)
+    role_service = RoleService(mock_session, None)
     role_service.get_by_name = AsyncMock(return_value={"id": uuid.uuid4()})
 
     role_data = UpdateRoleRequest(name="existing_role", description="Description")
@@ -277,7 +398,7 @@ async def test_create_role_name_exists(mock_session):
 # Tests for get_current_user_roles endpoint
 async def test_get_current_user_roles_success(mock_session):
     # Arrange
-    role_service = RoleService(mock_session)
+    role_service = RoleService(mock_session, None)
     mock_roles = [{"id": uuid.uuid4(), "name": "user_role"}]
     role_service.get_user_roles = AsyncMock(return_value=mock_roles)
 
@@ -293,7 +414,7 @@ async def test_get_current_user_roles_success(mock_session):
 
 async def test_get_current_user_roles_error(mock_session, mock_db_error):
     # Arrange
-    role_service = RoleService(mock_session)
+    role_service = RoleService(mock_session, None)
     role_service.get_user_roles = AsyncMock(side_effect=mock_db_error)
 
     # Act & Assert
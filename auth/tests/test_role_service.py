@@ -4,7 +4,9 @@ from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
+from auth.db.crud import UserRepository
 from auth.models.user_role import UserRole
+from auth.schemas.role_schema import UserAssignmentStatus
 from auth.services.role_service import RoleService
 
 pytestmark = pytest.mark.asyncio
@@ -13,7 +15,7 @@ pytestmark = pytest.mark.asyncio
 class TestRoleService:
     async def test_give_role_to_user_success(self, mock_session, mock_role, mock_user):
         # Arrange
-        role_service = RoleService(mock_session)
+        role_service = RoleService(mock_session, None)
         user_id = mock_user.id
         role_id = mock_role.id
 
@@ -41,7 +43,7 @@ class TestRoleService:
 
     async def test_give_role_to_user_role_not_found(self, mock_session):
         # Arrange
-        role_service = RoleService(mock_session)
+        role_service = RoleService(mock_session, None)
         user_id = uuid.uuid4()
         role_id = uuid.uuid4()
         role_service.get_by_id = AsyncMock(return_value=None)
@@ -57,7 +59,7 @@ class TestRoleService:
         self, mock_session, mock_role, mock_user
     ):
         # Arrange
-        role_service = RoleService(mock_session)
+        role_service = RoleService(mock_session, None)
         role_id = mock_role.id
         expected_users = [mock_user]
 
@@ -81,7 +83,7 @@ class TestRoleService:
 
     async def test_delete_role_from_user_success(self, mock_session, mock_user_role):
         # Arrange
-        role_service = RoleService(mock_session)
+        role_service = RoleService(mock_session, None)
         user_id = mock_user_role.user_id
         role_id = mock_user_role.role_id
 
@@ -99,7 +101,7 @@ class TestRoleService:
 
     async def test_delete_role_from_user_not_found(self, mock_session):
         # Arrange
-        role_service = RoleService(mock_session)
+        role_service = RoleService(mock_session, None)
         user_id = uuid.uuid4()
         role_id = uuid.uuid4()
 
@@ -117,7 +119,7 @@ class TestRoleService:
         self, mock_session, mock_role, mock_user, mock_user_role
     ):
         # Arrange
-        role_service = RoleService(mock_session)
+        role_service = RoleService(mock_session, None)
         user_id = mock_user.id
         role_id = mock_role.id
 
@@ -146,7 +148,7 @@ class TestRoleService:
         self, mock_session, mock_role, mock_user
     ):
         # Arrange
-        role_service = RoleService(mock_session)
+        role_service = RoleService(mock_session, None)
         role_id = mock_role.id
         expected_users = [mock_user]
 
@@ -172,7 +174,7 @@ class TestRoleService:
         self, mock_session, mock_role, mock_user
     ):
         # Arrange
-        role_service = RoleService(mock_session)
+        role_service = RoleService(mock_session, None)
         user_id = mock_user.id
         role_id = mock_role.id
 
@@ -188,7 +190,7 @@ class TestRoleService:
 
     async def test_delete_role_from_user_with_exception(self, mock_session):
         # Arrange
-        role_service = RoleService(mock_session)
+        role_service = RoleService(mock_session, None)
         user_id = uuid.uuid4()
         role_id = uuid.uuid4()
 
@@ -201,3 +203,319 @@ class TestRoleService:
         # Assert
         assert result is False
         mock_session.rollback.assert_awaited_once()
+
+
+class TestRoleServiceUserCache:
+    async def test_give_role_invalidates_user_projection(
+        self, mock_session, mock_redis_client
+    ):
+        # Arrange
+        role_service = RoleService(mock_session, mock_redis_client)
+        user_id = uuid.uuid4()
+        role_id = uuid.uuid4()
+        role_service.get_by_id = AsyncMock(return_value=MagicMock())
+        mock_result = MagicMock()
+        mock_result.scalar_one_or_none.return_value = MagicMock()
+        mock_session.execute = AsyncMock(return_value=mock_result)
+        role_service.user_role_repository.get_user_roles = AsyncMock(return_value=[])
+        role_service.user_role_repository.assign_role = AsyncMock()
+
+        # Act
+        result = await role_service.give_role_to_user(user_id, role_id)
+
+        # Assert
+        assert result is True
+        mock_redis_client.unlink.assert_awaited_once_with(
+            f"user_projection:{user_id}"
+        )
+
+    async def test_delete_role_from_user_invalidates_user_projection(
+        self, mock_session, mock_redis_client
+    ):
+        # Arrange
+        role_service = RoleService(mock_session, mock_redis_client)
+        user_id = uuid.uuid4()
+        mock_result = MagicMock()
+        mock_result.scalar_one_or_none.return_value = MagicMock()
+        mock_session.execute = AsyncMock(return_value=mock_result)
+        mock_session.delete = AsyncMock()
+
+        # Act
+        result = await role_service.delete_role_from_user(user_id, uuid.uuid4())
+
+        # Assert
+        assert result is True
+        mock_redis_client.unlink.assert_awaited_once_with(
+            f"user_projection:{user_id}"
+        )
+
+    async def test_rename_role_bumps_projection_generation(
+        self, mock_session, mock_redis_client
+    ):
+        # Arrange
+        role_service = RoleService(mock_session, mock_redis_client)
+        role_service.get_by_id = AsyncMock(return_value=MagicMock())
+        role_service.get_by_id.return_value.name = "editor"
+        update_result = MagicMock()
+        update_result.scalar_one_or_none.return_value = MagicMock()
+        mock_session.execute = AsyncMock(side_effect=[MagicMock(), update_result])
+
+        # Act
+        await role_service.update(uuid.uuid4(), {"name": "renamed"})
+
+        # Assert: участники роли не перечисляются
+        mock_redis_client.incr.assert_awaited_once_with("user_projection:generation")
+        mock_redis_client.unlink.assert_not_awaited()
+        assert mock_session.execute.await_count == 2
+
+    async def test_description_change_skips_invalidation(
+        self, mock_session, mock_redis_client
+    ):
+        # Arrange
+        role_service = RoleService(mock_session, mock_redis_client)
+        role_service.get_by_id = AsyncMock(return_value=MagicMock())
+        role_service.get_by_id.return_value.name = "editor"
+        role_service.user_repository.bump_role_permissions_version = AsyncMock()
+        mock_session.execute = AsyncMock(return_value=MagicMock())
+
+        # Act
+        await role_service.update(
+            uuid.uuid4(), {"name": "editor", "description": "Edits articles"}
+        )
+
+        # Assert
+        role_service.user_repository.bump_role_permissions_version.assert_not_awaited()
+        mock_redis_client.incr.assert_not_awaited()
+
+    async def test_delete_role_bumps_projection_generation(
+        self, mock_session, mock_redis_client
+    ):
+        # Arrange
+        role_service = RoleService(mock_session, mock_redis_client)
+        mock_session.execute = AsyncMock(return_value=MagicMock(rowcount=1))
+
+        # Act
+        await role_service.delete(uuid.uuid4())
+
+        # Assert
+        mock_redis_client.incr.assert_awaited_once_with("user_projection:generation")
+        mock_redis_client.unlink.assert_not_awaited()
+
+    async def test_assign_role_to_users_reports_each_user(
+        self, mock_session, mock_redis_client, monkeypatch
+    ):
+        # Arrange
+        role_service = RoleService(mock_session, mock_redis_client)
+        new_user, assigned_user, missing_user = (uuid.uuid4() for _ in range(3))
+        role_service._role_exists = AsyncMock(return_value=True)
+        monkeypatch.setattr(
+            UserRepository,
+            "get_existing_ids",
+            AsyncMock(return_value={new_user, assigned_user}),
+        )
+        role_service.user_repository.bump_permissions_version = AsyncMock()
+        role_service.user_role_repository.add_role_to_users = AsyncMock(
+            return_value={new_user}
+        )
+
+        # Act
+        result = await role_service.assign_role_to_users(
+            uuid.uuid4(), [new_user, assigned_user, missing_user, new_user]
+        )
+
+        # Assert
+        assert result == {
+            new_user: UserAssignmentStatus.ASSIGNED,
+            assigned_user: UserAssignmentStatus.ALREADY_ASSIGNED,
+            missing_user: UserAssignmentStatus.USER_NOT_FOUND,
+        }
+        _, user_ids, _ = role_service.user_role_repository.add_role_to_users.call_args.args
+        assert user_ids == [new_user, assigned_user]
+        role_service.user_repository.bump_permissions_version.assert_awaited_once_with(
+            {new_user}
+        )
+        mock_session.commit.assert_awaited_once()
+        mock_redis_client.unlink.assert_awaited_once_with(
+            f"user_projection:{new_user}"
+        )
+
+    async def test_assign_role_to_users_role_not_found(self, mock_session):
+        # Arrange
+        role_service = RoleService(mock_session, None)
+        role_service._role_exists = AsyncMock(return_value=False)
+        role_service.user_role_repository.add_role_to_users = AsyncMock()
+
+        # Act
+        result = await role_service.assign_role_to_users(uuid.uuid4(), [uuid.uuid4()])
+
+        # Assert
+        assert result is None
+        role_service.user_role_repository.add_role_to_users.assert_not_awaited()
+        mock_session.commit.assert_not_awaited()
+
+    async def test_assign_role_to_users_rolls_back_on_error(
+        self, mock_session, mock_db_error, monkeypatch
+    ):
+        # Arrange
+        role_service = RoleService(mock_session, None)
+        user_id = uuid.uuid4()
+        role_service._role_exists = AsyncMock(return_value=True)
+        monkeypatch.setattr(
+            UserRepository, "get_existing_ids", AsyncMock(return_value={user_id})
+        )
+        role_service.user_role_repository.add_role_to_users = AsyncMock(
+            side_effect=mock_db_error
+        )
+
+        # Act & Assert
+        with pytest.raises(type(mock_db_error)):
+            await role_service.assign_role_to_users(uuid.uuid4(), [user_id])
+        mock_session.rollback.assert_awaited_once()
+        mock_session.commit.assert_not_awaited()
+
+    async def test_remove_role_from_users_reports_each_user(
+        self, mock_session, mock_redis_client
+    ):
+        # Arrange
+        role_service = RoleService(mock_session, mock_redis_client)
+        removed_user, other_user = uuid.uuid4(), uuid.uuid4()
+        role_service._role_exists = AsyncMock(return_value=True)
+        role_service.user_role_repository.remove_role_from_users = AsyncMock(
+            return_value={removed_user}
+        )
+
+        # Act
+        result = await role_service.remove_role_from_users(
+            uuid.uuid4(), [removed_user, other_user]
+        )
+
+        # Assert
+        assert result == {
+            removed_user: UserAssignmentStatus.REMOVED,
+            other_user: UserAssignmentStatus.NOT_ASSIGNED,
+        }
+        mock_session.commit.assert_awaited_once()
+        mock_redis_client.unlink.assert_awaited_once_with(
+            f"user_projection:{removed_user}"
+        )
+
+
+class TestRoleServiceReads:
+    @pytest.mark.parametrize(
+        "method, args",
+        [
+            ("get_all", ()),
+            ("get_by_id", (uuid.uuid4(),)),
+            ("get_by_name", ("user",)),
+            ("get_active_roles", ()),
+        ],
+    )
+    async def test_role_reads_do_not_load_members(self, mock_session, method, args):
+        # Arrange
+        role_service = RoleService(mock_session, None)
+        mock_session.execute = AsyncMock(return_value=MagicMock())
+
+        # Act
+        await getattr(role_service, method)(*args)
+
+        # Assert
+        stmt = mock_session.execute.call_args.args[0]
+        assert stmt._with_options == ()
+
+    async def test_get_role_members_returns_page_and_count(self, mock_session):
+        # Arrange
+        role_service = RoleService(mock_session, None)
+        role_id = uuid.uuid4()
+        members = [(uuid.uuid4(), "alice")]
+        role_service.user_role_repository.get_role_members = AsyncMock(
+            return_value=members
+        )
+        role_service.user_role_repository.count_role_members = AsyncMock(
+            return_value=42
+        )
+
+        # Act
+        result = await role_service.get_role_members(role_id, limit=1)
+
+        # Assert
+        assert result == (members, 42)
+        role_service.user_role_repository.get_role_members.assert_awaited_once_with(
+            role_id, limit=1, after=None
+        )
+
+    async def test_get_role_members_counts_only_first_page(self, mock_session):
+        # Arrange
+        role_service = RoleService(mock_session, None)
+        role_service.user_role_repository.get_role_members = AsyncMock(return_value=[])
+        role_service.user_role_repository.count_role_members = AsyncMock()
+
+        # Act
+        result = await role_service.get_role_members(uuid.uuid4(), after=uuid.uuid4())
+
+        # Assert
+        assert result == ([], None)
+        role_service.user_role_repository.count_role_members.assert_not_awaited()
+
+
+class TestRoleServicePermissionsVersion:
+    async def test_update_role_bumps_members_before_commit(self, mock_session):
+        # Arrange
+        role_service = RoleService(mock_session, None)
+        role_id = uuid.uuid4()
+        calls = []
+        role_service.get_by_id = AsyncMock(return_value=MagicMock())
+        role_service.user_repository.bump_role_permissions_version = AsyncMock(
+            side_effect=lambda *_: calls.append("bump")
+        )
+        mock_session.commit = AsyncMock(side_effect=lambda: calls.append("commit"))
+        mock_session.execute = AsyncMock(return_value=MagicMock())
+
+        # Act
+        await role_service.update(role_id, {"name": "renamed"})
+
+        # Assert
+        role_service.user_repository.bump_role_permissions_version.assert_awaited_once_with(
+            role_id
+        )
+        assert calls == ["bump", "commit"]
+
+    async def test_delete_role_bumps_members(self, mock_session):
+        # Arrange
+        role_service = RoleService(mock_session, None)
+        role_id = uuid.uuid4()
+        calls = []
+        role_service.user_repository.bump_role_permissions_version = AsyncMock(
+            side_effect=lambda *_: calls.append("bump")
+        )
+        mock_session.execute = AsyncMock(
+            side_effect=lambda *_: calls.append("delete") or MagicMock(rowcount=1)
+        )
+
+        # Act
+        await role_service.delete(role_id)
+
+        # Assert: версия меняется одним UPDATE по роли до каскадного удаления
+        role_service.user_repository.bump_role_permissions_version.assert_awaited_once_with(
+            role_id
+        )
+        assert calls == ["bump", "delete"]
+
+    async def test_remove_role_from_users_bumps_only_removed(self, mock_session):
+        # Arrange
+        role_service = RoleService(mock_session, None)
+        removed_user = uuid.uuid4()
+        role_service._role_exists = AsyncMock(return_value=True)
+        role_service.user_role_repository.remove_role_from_users = AsyncMock(
+            return_value={removed_user}
+        )
+        role_service.user_repository.bump_permissions_version = AsyncMock()
+
+        # Act
+        await role_service.remove_role_from_users(
+            uuid.uuid4(), [removed_user, uuid.uuid4()]
+        )
+
+        # Assert
+        role_service.user_repository.bump_permissions_version.assert_awaited_once_with(
+            {removed_user}
+        )
@@ -0,0 +1,217 @@
+import json
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from auth.api.v1 import jwks_api
+from auth.core.config import TokenConfig
+from auth.services.blacklist_mirror import BlacklistMirror
+from auth.services.signing_keys import (
+    KeyRing,
+    SigningKey,
+    generate_key,
+    load_key_ring
+)
+from auth.services.token_service import TokenService, VerifiedClaimsCache
+
+pytestmark = pytest.mark.asyncio
+
+
+def make_claims(**extra):
+    now = datetime.now(UTC)
+    return {
+        "user_id": str(uuid.uuid4()),
+        "token_type": "access",
+        "jti": str(uuid.uuid4()),
+        "iat": now,
+        "exp": now + timedelta(minutes=5),
+        **extra,
+    }
+
+
+@pytest.fixture
+def rsa_key():
+    return SigningKey(
+        kid="2026-01",
+        algorithm="RS256",
+        private_key=rsa.generate_private_key(public_exponent=65537, key_size=2048),
+    )
+
+
+@pytest.fixture
+def ed_key():
+    return SigningKey(
+        kid="2026-02",
+        algorithm="EdDSA",
+        private_key=ed25519.Ed25519PrivateKey.generate(),
+    )
+
+
+@pytest.fixture
+def key_ring(rsa_key, ed_key):
+    return KeyRing([rsa_key, ed_key])
+
+
+@pytest.fixture
+def asymmetric_token_service(mock_redis_client, mock_session, key_ring):
+    service = TokenService(
+        mock_redis_client,
+        mock_session,
+        claims_cache=VerifiedClaimsCache(),
+        blacklist_mirror=BlacklistMirror(),
+        key_ring=key_ring,
+    )
+    service.config.secret_key = "test_secret_key"
+    service.config.accept_legacy_hs256 = False
+    return service
+
+
+class TestKeyRing:
+    async def test_active_key_defaults_to_latest_kid(self, key_ring):
+        assert key_ring.active_kid == "2026-02"
+        assert key_ring.active.algorithm == "EdDSA"
+
+    async def test_unknown_active_kid_rejected(self, rsa_key):
+        with pytest.raises(ValueError):
+            KeyRing([rsa_key], active_kid="missing")
+
+    @pytest.mark.parametrize("active_kid", ["2026-01", "2026-02"])
+    async def test_sign_and_decode_round_trip(self, rsa_key, ed_key, active_kid):
+        ring = KeyRing([rsa_key, ed_key], active_kid=active_kid)
+        token = ring.sign(make_claims())
+
+        header = jwt.get_unverified_header(token)
+        assert header["kid"] == active_kid
+        assert header["alg"] == ring.active.algorithm
+        assert ring.decode(token, {"require": ["exp"]})["token_type"] == "access"
+
+    async def test_old_key_still_verifies_after_rotation(self, rsa_key, ed_key):
+        old_token = KeyRing([rsa_key]).sign(make_claims())
+        rotated = KeyRing([rsa_key, ed_key], active_kid="2026-02")
+
+        assert rotated.decode(old_token, {})["token_type"] == "access"
+
+    async def test_unknown_kid_rejected(self, key_ring):
+        foreign = SigningKey(
+            kid="foreign",
+            algorithm="EdDSA",
+            private_key=ed25519.Ed25519PrivateKey.generate(),
+        )
+        token = KeyRing([foreign]).sign(make_claims())
+
+        with pytest.raises(jwt.InvalidKeyError):
+            key_ring.decode(token, {})
+
+    async def test_algorithm_switch_rejected(self, key_ring, rsa_key):
+        # Токен с kid RSA-ключа, но подписанный HS256, отклоняется до проверки подписи
+        forged = jwt.encode(
+            make_claims(), "secret", algorithm="HS256", headers={"kid": rsa_key.kid}
+        )
+
+        with pytest.raises(jwt.PyJWTError):
+            key_ring.decode(forged, {})
+
+    async def test_jwks_publishes_public_keys_only(self, key_ring):
+        jwks = json.loads(key_ring.jwks_json)
+
+        assert [key["kid"] for key in jwks["keys"]] == ["2026-01", "2026-02"]
+        assert [key["alg"] for key in jwks["keys"]] == ["RS256", "EdDSA"]
+        for key in jwks["keys"]:
+            assert key["use"] == "sig"
+            assert "d" not in key
+            assert jwt.PyJWK(key).key is not None
+
+    async def test_from_directory(self, tmp_path):
+        generate_key(str(tmp_path), "RS256", kid="20260101000000")
+        path = generate_key(str(tmp_path), "EdDSA", kid="20260201000000")
+
+        ring = KeyRing.from_directory(str(tmp_path))
+
+        assert oct(path.stat().st_mode & 0o777) == "0o600"
+        assert set(ring.keys) == {"20260101000000", "20260201000000"}
+        assert ring.active_kid == "20260201000000"
+        assert ring.keys["20260101000000"].algorithm == "RS256"
+
+    async def test_load_key_ring(self, tmp_path):
+        assert load_key_ring(TokenConfig(ALGORITHM="HS256")) is None
+        with pytest.raises(ValueError):
+            load_key_ring(TokenConfig(ALGORITHM="EdDSA", JWT_SIGNING_KEYS_DIR=""))
+
+        generate_key(str(tmp_path), "EdDSA", kid="a")
+        generate_key(str(tmp_path), "EdDSA", kid="b")
+        ring = load_key_ring(
+            TokenConfig(
+                ALGORITHM="EdDSA",
+                JWT_SIGNING_KEYS_DIR=str(tmp_path),
+                JWT_ACTIVE_KID="a",
+            )
+        )
+        assert ring.active_kid == "a"
+
+
+class TestAsymmetricTokenService:
+    async def test_tokens_verify_with_published_jwks(
+        self, asymmetric_token_service, key_ring
+    ):
+        token = await asymmetric_token_service.create_access_token(
+            user_id=uuid.uuid4(), username="user", is_superuser=False, roles=["user"]
+        )
+
+        kid = jwt.get_unverified_header(token)["kid"]
+        published = {key["kid"]: key for key in key_ring.jwks["keys"]}
+        jwk = jwt.PyJWK(published[kid])
+        claims = jwt.decode(token, jwk.key, algorithms=[jwk.algorithm_name])
+        assert claims["username"] == "user"
+
+    async def test_decode_token_round_trip(self, asymmetric_token_service):
+        user_id = uuid.uuid4()
+        token = await asymmetric_token_service.create_refresh_token(user_id)
+
+        claims = asymmetric_token_service.decode_token(token)
+        assert claims["user_id"] == str(user_id)
+        assert claims["token_type"] == "refresh"
+
+    async def test_legacy_hs256_rejected_by_default(self, asymmetric_token_service):
+        legacy = jwt.encode(make_claims(), "test_secret_key", algorithm="HS256")
+
+        with pytest.raises(jwt.PyJWTError):
+            asymmetric_token_service.decode_token(legacy)
+
+    async def test_legacy_hs256_accepted_during_migration(
+        self, asymmetric_token_service
+    ):
+        asymmetric_token_service.config.accept_legacy_hs256 = True
+        legacy = jwt.encode(make_claims(), "test_secret_key", algorithm="HS256")
+
+        assert asymmetric_token_service.decode_token(legacy)["token_type"] == "access"
+
+
+class TestJWKSEndpoint:
+    @pytest.fixture
+    def client(self, monkeypatch, key_ring):
+        monkeypatch.setattr(jwks_api, "JWKS_BODY", key_ring.jwks_json)
+        monkeypatch.setitem(jwks_api.JWKS_HEADERS, "ETag", '"test-etag"')
+        app = FastAPI()
+        app.include_router(jwks_api.router)
+        return TestClient(app)
+
+    async def test_serves_jwks_with_cache_headers(self, client, key_ring):
+        response = client.get("/.well-known/jwks.json")
+
+        assert response.status_code == 200
+        assert response.json() == key_ring.jwks
+        assert response.headers["cache-control"].startswith("public, max-age=")
+        assert response.headers["etag"] == '"test-etag"'
+
+    async def test_not_modified_for_matching_etag(self, client):
+        response = client.get(
+            "/.well-known/jwks.json", headers={"If-None-Match": '"test-etag"'}
+        )
+
+        assert response.status_code == 304
+        assert response.content == b""
@@ -1,3 +1,4 @@
+import json
 import uuid
 from datetime import UTC, datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -7,7 +8,7 @@ import pytest
 from fastapi import HTTPException
 
 from auth.core.config import TokenConfig
-from auth.services.token_service import TokenService
+from auth.services.token_service import TokenService, VerifiedClaimsCache
 
 pytestmark = pytest.mark.asyncio
 
@@ -128,7 +129,10 @@ class TestTokenService:
         # Assert
         assert new_access_token is not None
         assert new_refresh_token is not None
-        token_service.blacklist_token.assert_awaited_once_with(refresh_token)
+        token_service.blacklist_token.assert_awaited_once()
+        call_args = token_service.blacklist_token.call_args
+        assert call_args.args[0] == refresh_token
+        assert call_args.kwargs["claims"]["token_type"] == "refresh"
 
     async def test_refresh_tokens_invalid_type(self, token_service, mock_user):
         # Arrange
@@ -270,3 +274,274 @@ class TestTokenService:
 
         # Assert
         assert user_data is None
+
+    async def test_validate_token_decodes_once(self, token_service):
+        # Arrange
+        token = await token_service.create_access_token(
+            user_id=uuid.uuid4(), username="test_user", is_superuser=False, roles=[]
+        )
+        token_service.redis_client.exists = AsyncMock(return_value=0)
+
+        # Act
+        with patch(
+            "auth.services.token_service.jwt.decode", wraps=jwt.decode
+        ) as decode_mock:
+            payload = await token_service.validate_token(token)
+
+        # Assert
+        assert payload["username"] == "test_user"
+        assert decode_mock.call_count == 1
+        token_service.redis_client.exists.assert_awaited_once_with(
+            f"blacklist_token:{payload['jti']}"
+        )
+
+    async def test_validate_token_invalid_signature(self, token_service):
+        # Arrange
+        token = jwt.encode(
+            {"user_id": str(uuid.uuid4()), "exp": 9999999999, "iat": 0, "jti": "x"},
+            "another_secret",
+            algorithm="HS256",
+        )
+        token_service.redis_client.exists = AsyncMock(return_value=0)
+
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            await token_service.validate_token(token)
+        assert exc_info.value.status_code == 401
+        token_service.redis_client.exists.assert_not_awaited()
+
+    async def test_revoke_tokens_skips_missing_and_blacklisted(self, token_service):
+        # Arrange
+        access_token = await token_service.create_access_token(
+            user_id=uuid.uuid4(), username="test_user", is_superuser=False, roles=[]
+        )
+        refresh_token = await token_service.create_refresh_token(uuid.uuid4())
+        token_service.redis_client.exists = AsyncMock(side_effect=[1, 0])
+        token_service.redis_client.setex = AsyncMock()
+
+        # Act
+        with patch(
+            "auth.services.token_service.jwt.decode", wraps=jwt.decode
+        ) as decode_mock:
+            await token_service.revoke_tokens(None, refresh_token, access_token)
+
+        # Assert
+        assert decode_mock.call_count == 2
+        token_service.redis_client.setex.assert_awaited_once()
+        access_jti = jwt.decode(
+            access_token,
+            token_service.config.secret_key,
+            algorithms=[token_service.config.algorithm],
+        )["jti"]
+        assert (
+            token_service.redis_client.setex.call_args[0][0]
+            == f"blacklist_token:{access_jti}"
+        )
+
+    async def test_validate_token_uses_claims_cache(self, token_service):
+        # Arrange
+        token = await token_service.create_access_token(
+            user_id=uuid.uuid4(), username="test_user", is_superuser=False, roles=[]
+        )
+        token_service.redis_client.exists = AsyncMock(return_value=0)
+
+        # Act
+        with patch(
+            "auth.services.token_service.jwt.decode", wraps=jwt.decode
+        ) as decode_mock:
+            for _ in range(3):
+                await token_service.validate_token(token)
+
+        # Assert
+        assert decode_mock.call_count == 1
+        assert token_service.redis_client.exists.await_count == 3
+        stats = token_service.claims_cache.stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+
+    async def test_blacklist_token_drops_cached_claims(self, token_service):
+        # Arrange
+        token = await token_service.create_access_token(
+            user_id=uuid.uuid4(), username="test_user", is_superuser=False, roles=[]
+        )
+        token_service.redis_client.exists = AsyncMock(return_value=0)
+        payload = await token_service.validate_token(token)
+        token_service.redis_client.setex = AsyncMock()
+
+        # Act
+        await token_service.blacklist_token(token, claims=payload)
+
+        # Assert
+        assert token_service.claims_cache.get(token) is None
+
+    async def test_get_current_user_from_claims(self, token_service):
+        # Arrange
+        user_id = uuid.uuid4()
+        token = await token_service.create_access_token(
+            user_id=user_id,
+            username="test_user",
+            is_superuser=False,
+            roles=["user"],
+            permissions_version=7,
+        )
+        token_service.redis_client.exists = AsyncMock(return_value=0)
+        token_service.user_repository.get_with_roles = AsyncMock()
+
+        # Act
+        user_data = await token_service.get_current_user(token, from_claims=True)
+
+        # Assert
+        assert user_data == {
+            "id": user_id,
+            "username": "test_user",
+            "is_superuser": False,
+            "roles": ["user"],
+            "permissions_version": 7,
+        }
+        token_service.user_repository.get_with_roles.assert_not_awaited()
+
+    async def test_get_user_projection_served_from_cache(self, token_service):
+        # Arrange
+        user_id = uuid.uuid4()
+        cached = {
+            "id": str(user_id),
+            "username": "test_user",
+            "is_superuser": False,
+            "roles": ["user"],
+        }
+        token_service.redis_client.mget = AsyncMock(
+            return_value=[json.dumps({**cached, "generation": 2}), b"2"]
+        )
+        token_service.user_repository.get_with_roles = AsyncMock()
+
+        # Act
+        projection = await token_service.get_user_projection(user_id)
+
+        # Assert
+        assert projection["id"] == user_id
+        assert projection["roles"] == ["user"]
+        token_service.user_repository.get_with_roles.assert_not_awaited()
+
+    async def test_get_user_projection_populates_cache_on_miss(self, token_service):
+        # Arrange
+        user = MagicMock(
+            id=uuid.uuid4(), username="test_user", is_superuser=True, permissions_version=3
+        )
+        user.roles = [MagicMock()]
+        user.roles[0].name = "admin"
+        token_service.user_repository.get_with_roles = AsyncMock(return_value=user)
+        token_service.redis_client.mget = AsyncMock(return_value=[None, b"5"])
+        token_service.redis_client.setex = AsyncMock()
+
+        # Act
+        projection = await token_service.get_user_projection(user.id)
+
+        # Assert
+        assert projection["roles"] == ["admin"]
+        assert projection["permissions_version"] == 3
+        key, ttl, value = token_service.redis_client.setex.call_args[0]
+        assert key == f"user_projection:{user.id}"
+        assert json.loads(value)["username"] == "test_user"
+        assert json.loads(value)["generation"] == 5
+
+    async def test_get_user_projection_reloads_older_generation(self, token_service):
+        # Arrange: проекция закэширована до переименования роли
+        user = MagicMock(
+            id=uuid.uuid4(), username="test_user", is_superuser=False, permissions_version=4
+        )
+        user.roles = [MagicMock()]
+        user.roles[0].name = "renamed"
+        stale = {
+            "id": str(user.id),
+            "username": "test_user",
+            "is_superuser": False,
+            "roles": ["editor"],
+            "permissions_version": 3,
+            "generation": 1,
+        }
+        token_service.redis_client.mget = AsyncMock(
+            return_value=[json.dumps(stale), b"2"]
+        )
+        token_service.user_repository.get_with_roles = AsyncMock(return_value=user)
+
+        # Act
+        projection = await token_service.get_user_projection(user.id)
+
+        # Assert
+        assert projection["roles"] == ["renamed"]
+        token_service.user_repository.get_with_roles.assert_awaited_once_with(user.id)
+
+    async def test_create_tokens_for_user_embeds_permissions_version(
+        self, token_service
+    ):
+        # Arrange
+        user = MagicMock(
+            id=uuid.uuid4(), username="test_user", is_superuser=False, roles=[]
+        )
+        user.permissions_version = 12
+        token_service.user_repository.get_with_roles = AsyncMock(return_value=user)
+        token_service.redis_client.evalsha = AsyncMock(return_value=b"CLOSED")
+
+        # Act
+        access_token, _ = await token_service.create_tokens_for_user(user.id)
+
+        # Assert
+        claims = jwt.decode(access_token, "test_secret_key", algorithms=["HS256"])
+        assert claims["permissions_version"] == 12
+
+    async def test_refresh_tokens_use_current_permissions_version(
+        self, token_service
+    ):
+        # Arrange
+        user_id = uuid.uuid4()
+        refresh_token = await token_service.create_refresh_token(user_id)
+        token_service.redis_client.exists = AsyncMock(return_value=0)
+        token_service.get_user_projection = AsyncMock(
+            return_value={
+                "id": user_id,
+                "username": "test_user",
+                "is_superuser": False,
+                "roles": ["user"],
+                "permissions_version": 5,
+            }
+        )
+        token_service.blacklist_token = AsyncMock()
+
+        # Act
+        access_token, _ = await token_service.refresh_tokens(refresh_token)
+
+        # Assert
+        claims = jwt.decode(access_token, "test_secret_key", algorithms=["HS256"])
+        assert claims["permissions_version"] == 5
+
+
+class TestVerifiedClaimsCache:
+    def test_evicts_least_recently_used(self):
+        cache = VerifiedClaimsCache(maxsize=2)
+        exp = datetime.now(UTC).timestamp() + 60
+        cache.put("a", {"jti": "a", "exp": exp})
+        cache.put("b", {"jti": "b", "exp": exp})
+        cache.get("a")
+
+        cache.put("c", {"jti": "c", "exp": exp})
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+
+    def test_expired_entry_is_not_returned(self):
+        cache = VerifiedClaimsCache()
+        cache.put("a", {"jti": "a", "exp": datetime.now(UTC).timestamp() + 60})
+
+        with patch("auth.services.token_service.time.time", return_value=1e12):
+            assert cache.get("a") is None
+        assert cache.stats()["size"] == 0
+
+    def test_invalidate_jti(self):
+        cache = VerifiedClaimsCache()
+        cache.put("a", {"jti": "a", "exp": datetime.now(UTC).timestamp() + 60})
+
+        cache.invalidate_jti("a")
+
+        assert cache.get("a") is None
+        assert cache.stats()["hit_rate"] == 0.0
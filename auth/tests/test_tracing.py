@@ -0,0 +1,118 @@
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter
+)
+from opentelemetry.sdk.trace.sampling import Decision
+from opentelemetry.trace import SpanKind
+
+from auth.core.config import TracingSettings
+from auth.core.middleware.tracker import RequestTracker
+from auth.core.tracer import RouteRatioSampler, build_sampler
+
+pytestmark = pytest.mark.asyncio
+
+
+def decision(sampler, path):
+    return sampler.should_sample(
+        None, 0x1234, "GET", SpanKind.SERVER, {"http.target": path}
+    ).decision
+
+
+class TestRouteRatioSampler:
+    async def test_default_ratio_without_matching_route(self):
+        sampler = RouteRatioSampler(1.0, {"/api/v1/metrics": 0})
+
+        assert decision(sampler, "/api/v1/auth/login") == Decision.RECORD_AND_SAMPLE
+        assert decision(sampler, None) == Decision.RECORD_AND_SAMPLE
+
+    async def test_route_ratio_applies_by_prefix(self):
+        sampler = RouteRatioSampler(1.0, {"/api/v1/metrics": 0})
+
+        assert decision(sampler, "/api/v1/metrics/stats") == Decision.DROP
+
+    async def test_longest_prefix_wins(self):
+        sampler = RouteRatioSampler(
+            0.0, {"/api/v1/auth": 0.0, "/api/v1/auth/login": 1.0}
+        )
+
+        assert decision(sampler, "/api/v1/auth/login") == Decision.RECORD_AND_SAMPLE
+        assert decision(sampler, "/api/v1/auth/me") == Decision.DROP
+
+    async def test_settings_parse_route_ratios(self, monkeypatch):
+        monkeypatch.setenv("TRACE_ROUTE_SAMPLE_RATIOS", '{"/api/v1/metrics": 0.1}')
+        monkeypatch.setenv("TRACE_SAMPLE_RATIO", "0.5")
+
+        settings = TracingSettings()
+
+        assert settings.route_sample_ratios == {"/api/v1/metrics": 0.1}
+        assert "/api/v1/metrics=0.1" in build_sampler(settings).get_description()
+
+
+class TestRequestTracing:
+    @pytest.fixture
+    def exporter(self):
+        return InMemorySpanExporter()
+
+    @pytest.fixture
+    def client(self, exporter):
+        provider = TracerProvider(
+            sampler=build_sampler(
+                TracingSettings(
+                    TRACE_SAMPLE_RATIO=1.0,
+                    TRACE_ROUTE_SAMPLE_RATIOS={"/health": 0},
+                )
+            )
+        )
+        provider.add_span_processor(SimpleSpanProcessor(exporter))
+
+        app = FastAPI()
+        tracker = RequestTracker()
+
+        @app.middleware("http")
+        async def middleware(request: Request, call_next):
+            request_id = tracker.get_or_generate_request_id(request)
+            tracker.setup_tracing(request, request_id)
+            return await call_next(request)
+
+        @app.get("/api/v1/auth/me")
+        async def me():
+            return {"status": "ok"}
+
+        @app.get("/health")
+        async def health():
+            return {"status": "ok"}
+
+        FastAPIInstrumentor.instrument_app(
+            app, tracer_provider=provider, exclude_spans=["receive", "send"]
+        )
+        yield TestClient(app)
+        FastAPIInstrumentor.uninstrument_app(app)
+
+    async def test_one_server_span_with_request_id(self, client, exporter):
+        response = client.get("/api/v1/auth/me", headers={"X-Request-Id": "req-1"})
+
+        assert response.status_code == 200
+        spans = exporter.get_finished_spans()
+        assert len(spans) == 1
+        assert spans[0].kind == SpanKind.SERVER
+        assert spans[0].attributes["request_id"] == "req-1"
+
+    async def test_unsampled_route_records_nothing(self, client, exporter):
+        response = client.get("/health")
+
+        assert response.status_code == 200
+        assert exporter.get_finished_spans() == ()
+
+    async def test_incoming_sampled_parent_is_followed(self, client, exporter):
+        traceparent = "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+
+        client.get("/health", headers={"traceparent": traceparent})
+
+        spans = exporter.get_finished_spans()
+        assert len(spans) == 1
+        assert spans[0].context.trace_id == 0x0AF7651916CD43DD8448EB211C80319C
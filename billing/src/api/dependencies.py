@@ -1,55 +1,56 @@
 import logging
 
-import httpx
 from fastapi import Depends, HTTPException
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from starlette import status
 
 from billing.src.core.config import settings
+from subscriptions.core.auth_client import (
+    AuthClient,
+    AuthUnavailable,
+    CircuitBreaker,
+    InvalidCredentials
+)
+from subscriptions.core.jwks import JWKSVerifier
 
 logger = logging.getLogger(__name__)
 
 oauth2_scheme = HTTPBearer(scheme_name="Bearer", description="JWT token authentication")
 
+auth_client = AuthClient(
+    settings.auth_url,
+    jwks_verifier=(
+        JWKSVerifier(settings.auth_jwks_url, cache_ttl=settings.auth_jwks_cache_ttl)
+        if settings.auth_jwks_url
+        else None
+    ),
+    cache_ttl=settings.auth_cache_ttl,
+    stale_ttl=settings.auth_cache_stale_ttl,
+    timeout=settings.auth_timeout,
+    max_connections=settings.auth_max_connections,
+    breaker=CircuitBreaker(
+        fail_max=settings.auth_breaker_fail_max,
+        reset_timeout=settings.auth_breaker_reset_timeout,
+    ),
+)
+
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(oauth2_scheme),
 ):
     """Get current user from auth service"""
-    authorization = f"{credentials.scheme} {credentials.credentials}"
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(
-                settings.auth_url,
-                headers={"Authorization": authorization},
-            )
-
-            logger.info(f"Auth service response status: {response.status_code}")
-            logger.info(f"Auth service response body: {response.text}")
-
-            if response.status_code == status.HTTP_401_UNAUTHORIZED:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid authentication credentials",
-                )
-
-            try:
-                user_data = response.json()
-                logger.info(f"Parsed user data: {user_data}")
-                return user_data
-            except ValueError as e:
-                logger.error(f"Failed to parse JSON response: {e}")
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="Invalid response from auth service",
-                )
-
-        except httpx.RequestError as e:
-            logger.error(f"Request to auth service failed: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail="Auth service is unavailable",
-            )
+    try:
+        return await auth_client.get_user(credentials.credentials)
+    except InvalidCredentials:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials",
+        )
+    except AuthUnavailable:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Auth service is unavailable",
+        )
 
 
 async def get_admin_user(current_user=Depends(get_current_user)):
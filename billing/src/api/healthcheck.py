@@ -1,5 +1,8 @@
 from fastapi import APIRouter, Response, status
 
+from billing.src.db import postgres
+from payments.engine import pool_stats
+
 router = APIRouter()
 
 
@@ -14,3 +17,13 @@ router = APIRouter()
 def healthcheck() -> Response:
     """Check if service healthy."""
     return Response(status_code=status.HTTP_200_OK, content="Its a live")
+
+
+@router.get(
+    "/health/db_pool",
+    tags=["healthcheck"],
+    summary="Состояние пула соединений с базой",
+)
+def db_pool_stats() -> dict:
+    """Pool size, checked out connections and checkout wait time."""
+    return pool_stats(postgres.engine)
@@ -1,4 +1,5 @@
 import os
+from typing import Optional
 
 from dotenv import load_dotenv
 from pydantic import Field
@@ -16,6 +17,17 @@ class Setting(BaseSettings):
     db_host: str = os.getenv("DB_HOST", "postgres")
     db_port: int = os.getenv("DB_PORT", 5432)
 
+    # Пул на процесс: воркеры * (db_pool_size + db_max_overflow) <= max_connections
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", 5))
+    db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", 5))
+    db_pool_timeout: float = float(os.getenv("DB_POOL_TIMEOUT", 10))
+    db_pool_recycle: int = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    db_pool_pre_ping: bool = os.getenv("DB_POOL_PRE_PING", "True").lower() == "true"
+    db_echo: bool = os.getenv("DB_ECHO", "False").lower() == "true"
+    db_query_cache_size: int = int(os.getenv("DB_QUERY_CACHE_SIZE", 500))
+    # 0 — за pgbouncer в режиме transaction
+    db_statement_cache_size: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", 100))
+
     celery_broker_url: str = os.getenv("DB_CELERY_BROKER_URL", "redis://redis_billing:6380/0")
 
     yookassa_shopid: str = Field(os.getenv("YOOKASSA_SHOP_ID"))
@@ -33,6 +45,18 @@ class Setting(BaseSettings):
     auth_url: str = Field(
         os.getenv("DB_AUTH_URL", "http://auth_api:8000/api/v1/auth/me")
     )
+    # При заданном JWKS токены проверяются локально, без запроса к auth_url
+    auth_jwks_url: Optional[str] = Field(os.getenv("DB_AUTH_JWKS_URL"))
+    auth_jwks_cache_ttl: int = int(os.getenv("DB_AUTH_JWKS_CACHE_TTL", 300))
+    # Кэш ответов auth_url и размыкатель: см. subscriptions.core.auth_client
+    auth_cache_ttl: int = int(os.getenv("DB_AUTH_CACHE_TTL", 30))
+    auth_cache_stale_ttl: int = int(os.getenv("DB_AUTH_CACHE_STALE_TTL", 300))
+    auth_timeout: float = float(os.getenv("DB_AUTH_TIMEOUT", 5.0))
+    auth_max_connections: int = int(os.getenv("DB_AUTH_MAX_CONNECTIONS", 100))
+    auth_breaker_fail_max: int = int(os.getenv("DB_AUTH_BREAKER_FAIL_MAX", 5))
+    auth_breaker_reset_timeout: int = int(
+        os.getenv("DB_AUTH_BREAKER_RESET_TIMEOUT", 30)
+    )
 
     @property
     def dsn(self) -> str:
@@ -1,17 +1,26 @@
-from sqlalchemy import create_engine
-from sqlalchemy.ext.asyncio import (
-    AsyncSession,
-    async_sessionmaker,
-    create_async_engine
-)
+from functools import cache
+
+from sqlalchemy import create_engine as create_sync_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.ext.asyncio.session import Session
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 from billing.src.core.config import settings
+from payments.engine import create_engine
 
 Base = declarative_base()
 
-engine = create_async_engine(settings.dsn, echo=True, future=True)
+engine = create_engine(
+    settings.dsn,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
+    pool_pre_ping=settings.db_pool_pre_ping,
+    echo=settings.db_echo,
+    query_cache_size=settings.db_query_cache_size,
+    statement_cache_size=settings.db_statement_cache_size,
+)
 
 async_session = async_sessionmaker(
     engine,
@@ -31,12 +40,20 @@ async def get_session() -> AsyncSession:
             await session.close()
 
 
-def get_sync_session() -> Session:
-    sync_engine = create_engine(settings.dsn_sync, future=True)
-    sync_session = sessionmaker(
-        bind=sync_engine,
-        class_=Session,
-        expire_on_commit=False,
+@cache
+def sync_session_factory() -> sessionmaker:
+    # Один синхронный пул на процесс celery, а не новый движок на каждую сессию
+    sync_engine = create_sync_engine(
+        settings.dsn_sync,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        echo=settings.db_echo,
     )
-    with sync_session() as session:
-        return session
+    return sessionmaker(bind=sync_engine, class_=Session, expire_on_commit=False)
+
+
+def get_sync_session() -> Session:
+    return sync_session_factory()()
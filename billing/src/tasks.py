@@ -30,6 +30,10 @@ provider = YooKassaProvider(
 
 
 class SubscriptionManager:
+    # Размер транзакции при массовом истечении подписок и таймаут запроса
+    expire_chunk_size = 1000
+    expire_timeout = 300
+
     def __init__(self, base_url: str):
         self.base_url = base_url
         self._client: Optional[httpx.AsyncClient] = None
@@ -152,58 +156,52 @@ class SubscriptionManager:
         return data
 
     async def check_subscriptions_expiration(self) -> None:
-        """Check and update expired subscriptions."""
+        """Expire overdue subscriptions in bulk on the subscriptions side."""
         try:
-            response = await self._client.get(f"{self.base_url}admin/all")
-            subscriptions = response.json()
-
-            for subscription in subscriptions:
-                if subscription["status"] == "active":
-                    await self._handle_active_subscription(subscription)
+            response = await self._client.post(
+                f"{self.base_url}admin/expire",
+                params={"chunk_size": self.expire_chunk_size},
+                timeout=self.expire_timeout,
+            )
+            response.raise_for_status()
+            report = response.json()
+            logger.info(
+                f"Expired {report['expired']} subscriptions "
+                f"in {report['chunks']} chunks, {report['elapsed_seconds']}s"
+            )
 
         except Exception as e:
             logger.error(f"Error checking subscriptions: {str(e)}")
 
-    async def _handle_active_subscription(self, subscription: Dict[str, Any]) -> None:
-        """Handle active subscription expiration check."""
-        end_date = datetime.fromisoformat(
-            subscription["end_date"].replace("Z", "+00:00")
-        )
-        current_time = datetime.now(timezone.utc)
-
-        if current_time > end_date:
-            status_data = {"status": "expired"}
-            response = await self._client.put(
-                f"{self.base_url}{subscription['id']}",
-                json=status_data,
-            )
-
-            if response.status_code == httpx.codes.OK:
-                logger.info(f"Subscription {subscription['id']} marked as expired")
-            else:
-                logger.error(
-                    f"Failed to update subscription {subscription['id']} status. "
-                    f"Status: {response.status_code}. Response: {response.text}"
-                )
-
 
 class AutoPaymentManager:
+    # Размер страницы /admin/due
+    due_page_size = 500
+
     def __init__(self, payment_provider: YooKassaProvider, session_factory):
         self.provider = payment_provider
         self.session_factory = session_factory
 
     async def fetch_due_subscriptions(self) -> List[Dict[str, Any]]:
-        """Fetch subscriptions due for autopayment."""
+        """Fetch subscriptions due for autopayment, page by page."""
+        subscriptions = []
+        params = {"limit": self.due_page_size}
         async with aiohttp.ClientSession() as session:
             try:
-                async with session.get(
-                        f"{settings.base_url}admin/due",
-                        timeout=30
-                ) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    logger.error(f"Failed to fetch subscriptions, status: {response.status}")
-                    return []
+                while True:
+                    async with session.get(
+                            f"{settings.base_url}admin/due",
+                            params=params,
+                            timeout=30
+                    ) as response:
+                        if response.status != 200:
+                            logger.error(f"Failed to fetch subscriptions, status: {response.status}")
+                            return []
+                        page = await response.json()
+                    subscriptions.extend(page["items"])
+                    if not page["next_cursor"]:
+                        return subscriptions
+                    params["cursor"] = page["next_cursor"]
             except Exception as e:
                 logger.error(f"Error fetching subscriptions: {e}")
                 return []
@@ -52,18 +52,30 @@ provider = YooKassaProvider(
 SUBSCRIPTIONS_API_URL = "http://subscriptions/api/v1/subscription/admin/due"
 
 
+# Размер страницы /admin/due; ответ приходит страницами с next_cursor
+DUE_PAGE_SIZE = 500
+
+
 async def fetch_due_subscriptions():
-    """Асинхронный запрос в API подписок"""
+    """Асинхронный запрос в API подписок, постранично по next_cursor"""
+    subscriptions = []
+    params = {"limit": DUE_PAGE_SIZE}
     async with aiohttp.ClientSession() as session:
         try:
-            async with session.get(SUBSCRIPTIONS_API_URL, timeout=30) as response:
-                if response.status == 200:
-                    return await response.json()
-                else:
-                    logger.error(
-                        f"Failed to fetch subscriptions, status: {response.status}"
-                    )
-                    return []
+            while True:
+                async with session.get(
+                    SUBSCRIPTIONS_API_URL, params=params, timeout=30
+                ) as response:
+                    if response.status != 200:
+                        logger.error(
+                            f"Failed to fetch subscriptions, status: {response.status}"
+                        )
+                        return []
+                    page = await response.json()
+                subscriptions.extend(page["items"])
+                if not page["next_cursor"]:
+                    return subscriptions
+                params["cursor"] = page["next_cursor"]
         except Exception as e:
             logger.error(f"Error fetching subscriptions: {e}")
             return []
@@ -1,53 +1,56 @@
 import logging
 
-import httpx
 from fastapi import Depends, HTTPException
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from starlette import status
 
+from subscriptions.core.auth_client import (
+    AuthClient,
+    AuthUnavailable,
+    CircuitBreaker,
+    InvalidCredentials
+)
+from subscriptions.core.config import settings
+from subscriptions.core.jwks import JWKSVerifier
+
 logger = logging.getLogger(__name__)
 
 oauth2_scheme = HTTPBearer(scheme_name="Bearer", description="JWT token authentication")
 
+auth_client = AuthClient(
+    settings.AUTH_ME_URL,
+    jwks_verifier=(
+        JWKSVerifier(settings.AUTH_JWKS_URL, cache_ttl=settings.AUTH_JWKS_CACHE_TTL)
+        if settings.AUTH_JWKS_URL
+        else None
+    ),
+    cache_ttl=settings.AUTH_CACHE_TTL,
+    stale_ttl=settings.AUTH_CACHE_STALE_TTL,
+    timeout=settings.AUTH_TIMEOUT,
+    max_connections=settings.AUTH_MAX_CONNECTIONS,
+    breaker=CircuitBreaker(
+        fail_max=settings.AUTH_BREAKER_FAIL_MAX,
+        reset_timeout=settings.AUTH_BREAKER_RESET_TIMEOUT,
+    ),
+)
+
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(oauth2_scheme),
 ):
     """Get current user from auth service"""
-    authorization = f"{credentials.scheme} {credentials.credentials}"
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(
-                "http://auth_api:8000/api/v1/auth/me",
-                headers={"Authorization": authorization},
-            )
-
-            logger.info(f"Auth service response status: {response.status_code}")
-            logger.info(f"Auth service response body: {response.text}")
-
-            if response.status_code == 401:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid authentication credentials",
-                )
-
-            try:
-                user_data = response.json()
-                logger.info(f"Parsed user data: {user_data}")
-                return user_data
-            except ValueError as e:
-                logger.error(f"Failed to parse JSON response: {e}")
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="Invalid response from auth service",
-                )
-
-        except httpx.RequestError as e:
-            logger.error(f"Request to auth service failed: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail="Auth service is unavailable",
-            )
+    try:
+        return await auth_client.get_user(credentials.credentials)
+    except InvalidCredentials:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials",
+        )
+    except AuthUnavailable:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Auth service is unavailable",
+        )
 
 
 async def get_admin_user(current_user=Depends(get_current_user)):
@@ -3,22 +3,30 @@ import logging
 from uuid import UUID
 
 import aiohttp
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from subscriptions.core.config import settings
-from subscriptions.db.postgres import get_session
+from subscriptions.db.postgres import async_session, get_session
 from subscriptions.schemas.subscription_schema import (
     DetailResponse,
+    DueSubscriptionPage,
+    ExpirationReport,
     SubscriptionCancel,
     SubscriptionCreate,
     SubscriptionHistoryResponse,
+    SubscriptionPage,
     SubscriptionResponse,
     SubscriptionResume,
+    SubscriptionStatus,
     SubscriptionSuspend,
     SubscriptionUpdate
 )
-from subscriptions.services.subscription_service import SubscriptionService
+from subscriptions.services.subscription_service import (
+    SubscriptionService,
+    decode_due_cursor
+)
 
 logger = logging.getLogger(__name__)
 
@@ -79,8 +87,6 @@ async def update_subscription(
 ):
     """Update subscription details"""
     subscription_service = SubscriptionService(session)
-    subscription = await subscription_service.get_subscription(subscription_id)
-
     return await subscription_service.update_subscription(subscription_id, data)
 
 
@@ -92,8 +98,6 @@ async def suspend_subscription(
 ):
     """Suspend an active subscription"""
     subscription_service = SubscriptionService(session)
-    subscription = await subscription_service.get_subscription(subscription_id)
-
     await subscription_service.suspend_subscription(subscription_id, data.reason)
     return DetailResponse(
         detail="Subscription suspended successfully",
@@ -109,8 +113,6 @@ async def resume_subscription(
 ):
     """Resume a suspended subscription"""
     subscription_service = SubscriptionService(session)
-    subscription = await subscription_service.get_subscription(subscription_id)
-
     await subscription_service.resume_subscription(subscription_id, data.comment)
     return DetailResponse(
         detail="Subscription resumed successfully",
@@ -126,8 +128,6 @@ async def cancel_subscription(
 ):
     """Cancel a subscription"""
     subscription_service = SubscriptionService(session)
-    subscription = await subscription_service.get_subscription(subscription_id)
-
     await subscription_service.cancel_subscription(subscription_id, data.reason, data.immediate)
     return DetailResponse(
         detail="Subscription cancelled successfully",
@@ -148,13 +148,46 @@ async def get_subscription_history(
 
 
 # Admin endpoints
-@router.get("/admin/all", response_model=list[SubscriptionResponse])
+@router.get("/admin/all", response_model=SubscriptionPage)
 async def list_all_subscriptions(
+        cursor: UUID | None = None,
+        limit: int = Query(100, ge=1, le=1000),
+        subscription_status: SubscriptionStatus | None = Query(None, alias="status"),
+        session: AsyncSession = Depends(get_session)
+):
+    """List subscriptions page by page, following next_cursor (admin only)"""
+    subscription_service = SubscriptionService(session)
+    return await subscription_service.get_subscription_page(
+        cursor, limit, subscription_status
+    )
+
+
+@router.get("/admin/all/stream")
+async def stream_all_subscriptions(
+        subscription_status: SubscriptionStatus | None = Query(None, alias="status")
+):
+    """Stream all subscriptions as NDJSON, one object per line (admin only)"""
+
+    async def lines():
+        # Сессия зависимости закрывается до отправки тела, поэтому своя
+        async with async_session() as session:
+            subscription_service = SubscriptionService(session)
+            async for subscription in subscription_service.stream_subscriptions(
+                subscription_status
+            ):
+                yield subscription.model_dump_json() + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.post("/admin/expire", response_model=ExpirationReport)
+async def expire_subscriptions(
+        chunk_size: int = Query(1000, ge=1, le=10000),
         session: AsyncSession = Depends(get_session)
 ):
-    """List all subscriptions (admin only)"""
+    """Expire all active subscriptions past their end date (admin only)"""
     subscription_service = SubscriptionService(session)
-    return await subscription_service.get_all_subscription()
+    return await subscription_service.expire_subscriptions(chunk_size)
 
 
 @router.get("/admin/user/{user_id}", response_model=list[SubscriptionResponse])
@@ -167,13 +200,25 @@ async def get_user_subscriptions(
     return await subscription_service.get_all_subscription({"user_id": user_id})
 
 
-@router.get("/admin/due", response_model=list[SubscriptionResponse])
-async def get_user_subscriptions(
+@router.get("/admin/due", response_model=DueSubscriptionPage)
+async def list_due_subscriptions(
+        lookahead_hours: int = Query(24, ge=0, le=24 * 31),
+        cursor: str | None = None,
+        limit: int = Query(100, ge=1, le=1000),
         session: AsyncSession = Depends(get_session)
 ):
-    """Get all subscriptions with today's payment date (admin only)"""
+    """Get auto-renewable subscriptions due within the lookahead window (admin only)"""
+    try:
+        after = decode_due_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
     subscription_service = SubscriptionService(session)
-    return await subscription_service.get_all_subscription({"end_date": datetime.date.today()})
+    return await subscription_service.get_due_page(
+        datetime.timedelta(hours=lookahead_hours), after, limit
+    )
 
 @router.get("/{subscription_id}/pay", response_model=SubscriptionResponse)
 async def pay_for_subscription(
@@ -0,0 +1,121 @@
+"""
+Бенчмарк пропускной способности AuthMiddleware.
+
+Прогоняет запросы к /health и к защищенному эндпоинту напрямую через ASGI
+приложения FastAPI (без сети и HTTP-клиента) для нескольких вариантов:
+без middleware, с прежней схемой (BaseHTTPMiddleware и jwt.decode на
+каждый запрос) и с AuthMiddleware без кэша проверенных claims и с ним.
+
+Запуск из корня репозитория:
+    python -m subscriptions.benchmarks.auth_middleware
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+import jwt
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from subscriptions.middlewares.auth_middleware import AuthConfig, AuthMiddleware
+
+REQUESTS = 20_000
+SECRET = "benchmark-secret"
+TOKEN = jwt.encode(
+    {"user_id": "42", "roles": ["user"], "exp": int(time.time()) + 3600}, SECRET
+)
+
+
+class LegacyAuthMiddleware(BaseHTTPMiddleware):
+    """Прежняя схема: список путей на каждый запрос и jwt.decode без кэша"""
+
+    async def dispatch(self, request: Request, call_next):
+        root_path = request.scope.get("root_path", "").rstrip("/")
+        full_path = f"{root_path}{request.url.path}"
+        if full_path in ["/health"] or request.url.path in ["/health"]:
+            return await call_next(request)
+        default_doc_paths = ["/openapi", "/openapi.json", "/docs", "/redoc"]
+        if any(full_path.endswith(doc_path) for doc_path in default_doc_paths):
+            return await call_next(request)
+
+        auth_header = request.headers.get("Authorization") or ""
+        try:
+            request.state.user = jwt.decode(
+                auth_header.replace("Bearer ", ""), SECRET, algorithms=["HS256"]
+            )
+        except jwt.PyJWTError:
+            return JSONResponse(status_code=401, content={"detail": "Invalid token"})
+        return await call_next(request)
+
+
+def build_app(middleware: Optional[str]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    @app.get("/api/v1/subscription/me")
+    async def me():
+        return {"status": "ok"}
+
+    if middleware == "legacy":
+        app.add_middleware(LegacyAuthMiddleware)
+    elif middleware is not None:
+        app.add_middleware(
+            AuthMiddleware,
+            config=AuthConfig(
+                secret_key=SECRET,
+                claims_cache_size=10000 if middleware == "asgi +cache" else 0,
+            ),
+        )
+    return app
+
+
+async def measure(label: str, app: FastAPI, path: str) -> None:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"authorization", f"Bearer {TOKEN}".encode())],
+        "client": ("127.0.0.1", 1234),
+        "server": ("test", 80),
+    }
+    statuses = set()
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses.add(message["status"])
+
+    # Прогрев: сборка стека middleware и первый разбор токена
+    await app(dict(scope), receive, send)
+
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        await app(dict(scope), receive, send)
+    elapsed = time.perf_counter() - start
+
+    assert statuses == {200}, statuses
+    print(f"{label:<14} {path:<26} {REQUESTS / elapsed:>10,.0f} req/sec")
+
+
+async def main() -> None:
+    for path in ("/health", "/api/v1/subscription/me"):
+        for middleware in (None, "legacy", "asgi", "asgi +cache"):
+            await measure(middleware or "none", build_app(middleware), path)
+        print()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,140 @@
+"""
+Бенчмарк записей статуса подписки вместе с историей.
+
+Выполняет чередующиеся suspend/resume через SubscriptionService на реальной
+базе из настроек сервиса (SUB_POSTGRES_*) в двух режимах: прежняя схема,
+где история коммитится отдельно после изменения статуса и печатается в
+stdout, и единица работы, где статус и история пишутся одной транзакцией.
+Считаются операции (изменение статуса плюс запись истории) в секунду при
+нескольких уровнях параллелизма. Таблицы пересоздаются при каждом запуске.
+
+Запуск из корня репозитория:
+    python -m subscriptions.benchmarks.history_writes
+"""
+
+import asyncio
+import contextlib
+import io
+import time
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from subscriptions.core.config import settings
+from subscriptions.db.engine import create_engine
+from subscriptions.models.base_models import Base
+from subscriptions.models.subscription import (
+    Subscription,
+    SubscriptionPlanType,
+    SubscriptionStatus
+)
+from subscriptions.services.history_manager import SubscriptionHistoryManager
+from subscriptions.services.subscription_service import SubscriptionService
+
+OPERATIONS_PER_WORKER = 200
+CONCURRENCY = (1, 8, 32)
+
+
+class LegacyHistoryManager(SubscriptionHistoryManager):
+    """Прежний add_record: отдельный коммит и print на каждую запись"""
+
+    async def add_record(self, subscription_id, action, details=None):
+        print(details)
+        await super().add_record(subscription_id, action, details)
+        await self.session.commit()
+
+
+class NoUnitOfWork:
+    """Коммит после изменения статуса, как делал прежний репозиторий"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            await self.session.rollback()
+
+
+def build_service(session: AsyncSession, mode: str) -> SubscriptionService:
+    service = SubscriptionService(session)
+    if mode == "legacy":
+        service.history_manager = LegacyHistoryManager(session)
+        service.unit_of_work = NoUnitOfWork(session)
+        transition = service.status_manager.repository.transition
+
+        async def committing_transition(*args):
+            subscription = await transition(*args)
+            await session.commit()
+            return subscription
+
+        service.status_manager.repository.transition = committing_transition
+    return service
+
+
+async def worker(factory, mode: str, subscription_id) -> None:
+    async with factory() as session:
+        service = build_service(session, mode)
+        for index in range(OPERATIONS_PER_WORKER):
+            if index % 2 == 0:
+                await service.suspend_subscription(subscription_id, "benchmark")
+            else:
+                await service.resume_subscription(subscription_id, None)
+
+
+async def measure(factory, mode: str, concurrency: int) -> None:
+    now = datetime.now(UTC)
+    subscriptions = [
+        Subscription(
+            user_id=uuid4(),
+            plan_type=SubscriptionPlanType.BASIC,
+            status=SubscriptionStatus.ACTIVE,
+            start_date=now,
+            end_date=now + timedelta(days=30),
+            price=9.99,
+            plan_id=uuid4(),
+        )
+        for _ in range(concurrency)
+    ]
+    async with factory() as session:
+        session.add_all(subscriptions)
+        await session.commit()
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        await asyncio.gather(
+            *(worker(factory, mode, item.id) for item in subscriptions)
+        )
+    elapsed = time.perf_counter() - start
+
+    operations = OPERATIONS_PER_WORKER * concurrency
+    print(
+        f"{mode:<14} workers {concurrency:>3}  "
+        f"{operations / elapsed:>8,.0f} writes/sec"
+    )
+
+
+async def main() -> None:
+    engine = create_engine(
+        settings.database_url, pool_size=max(CONCURRENCY), max_overflow=0
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    for concurrency in CONCURRENCY:
+        for mode in ("legacy", "unit of work"):
+            await measure(factory, mode, concurrency)
+        print()
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
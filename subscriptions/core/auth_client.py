@@ -0,0 +1,251 @@
+"""
+Клиент auth: по токену возвращает пользователя в формате /api/v1/auth/me.
+
+Один пул соединений на процесс вместо нового httpx.AsyncClient на каждый
+запрос; HTTP/2 включается, если установлен h2 и auth доступен по https
+(по http соединения остаются HTTP/1.1 keep-alive).
+
+Ответы auth кэшируются по SHA-256 токена на cache_ttl секунд, одинаковые
+одновременные запросы схлопываются в один. Поэтому отозванный при logout
+токен принимается еще до cache_ttl секунд. Если auth недоступен или
+размыкатель открыт, отдается последний известный ответ для этого токена
+(не старше stale_ttl и не позже exp токена), иначе AuthUnavailable.
+
+При заданном JWKS токены проверяются локально, а auth вызывается, только
+пока его ключи еще не получены.
+"""
+
+import asyncio
+import hashlib
+import importlib.util
+import time
+from collections import OrderedDict
+from logging import getLogger
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+import jwt
+
+from subscriptions.core.jwks import JWKSUnavailable, JWKSVerifier, claims_to_user
+
+logger = getLogger(__name__)
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class InvalidCredentials(Exception):
+    """auth отклонил токен"""
+
+
+class AuthUnavailable(Exception):
+    """auth не ответил, а запасного ответа для токена нет"""
+
+
+class CircuitBreaker:
+    """
+    In-process breaker around calls to auth.
+
+    ``fail_max`` consecutive failures open the circuit for
+    ``reset_timeout`` seconds, then a single probe call is let through:
+    success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, fail_max: int = 5, reset_timeout: float = 30):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.reset_timeout:
+            return "open"
+        return "half_open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "open" or self._probing:
+            return False
+        self._probing = True
+        return True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self._probing = False
+        self.failures += 1
+        if self.failures >= self.fail_max or self.opened_at is not None:
+            self.opened_at = time.monotonic()
+
+
+class PrincipalCache:
+    """LRU of /me answers keyed by token digest, with a fresh and a stale deadline"""
+
+    def __init__(self, ttl: float, stale_ttl: float, maxsize: int = 10000):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.maxsize = maxsize
+        self._entries: OrderedDict[bytes, Tuple[float, float, Dict]] = OrderedDict()
+
+    def get(self, digest: bytes, allow_stale: bool = False) -> Optional[Dict]:
+        entry = self._entries.get(digest)
+        if entry is None:
+            return None
+
+        fresh_until, stale_until, user = entry
+        now = time.time()
+        if now >= stale_until:
+            del self._entries[digest]
+            return None
+        if now >= fresh_until and not allow_stale:
+            return None
+
+        self._entries.move_to_end(digest)
+        return dict(user)
+
+    def put(self, digest: bytes, user: Dict, expires_at: Optional[float]) -> None:
+        if self.maxsize <= 0:
+            return
+        now = time.time()
+        # Ответ по истекшему токену не отдается даже как запасной
+        expires_at = expires_at or float("inf")
+        self._entries[digest] = (
+            min(now + self.ttl, expires_at),
+            min(now + max(self.ttl, self.stale_ttl), expires_at),
+            dict(user),
+        )
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, digest: bytes) -> None:
+        self._entries.pop(digest, None)
+
+
+class AuthClient:
+    def __init__(
+        self,
+        me_url: str,
+        jwks_verifier: Optional[JWKSVerifier] = None,
+        cache_ttl: float = 30,
+        stale_ttl: float = 300,
+        cache_size: int = 10000,
+        timeout: float = 5.0,
+        max_connections: int = 100,
+        breaker: Optional[CircuitBreaker] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.me_url = me_url
+        self.jwks_verifier = jwks_verifier
+        self.cache = PrincipalCache(cache_ttl, stale_ttl, maxsize=cache_size)
+        self.breaker = breaker or CircuitBreaker()
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.transport = transport
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._inflight: Dict[bytes, asyncio.Future] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                transport=self.transport,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def get_user(self, token: str) -> Dict[str, Any]:
+        """
+        Return the token owner as auth's /me does.
+
+        Raises:
+            InvalidCredentials: auth rejected the token
+            AuthUnavailable: auth did not answer and nothing is cached
+        """
+        if self.jwks_verifier is not None:
+            try:
+                return claims_to_user(await self.jwks_verifier.verify(token))
+            except JWKSUnavailable:
+                logger.warning("Auth JWKS is unavailable, asking auth for the user")
+            except jwt.PyJWTError as e:
+                raise InvalidCredentials(str(e)) from e
+
+        digest = hashlib.sha256(token.encode()).digest()
+        user = self.cache.get(digest)
+        if user is not None:
+            return user
+
+        inflight = self._inflight.get(digest)
+        if inflight is None:
+            inflight = asyncio.ensure_future(self._fetch(token, digest))
+            self._inflight[digest] = inflight
+            inflight.add_done_callback(lambda _: self._inflight.pop(digest, None))
+        # Отмена одного ожидающего не отменяет запрос для остальных
+        return dict(await asyncio.shield(inflight))
+
+    async def _fetch(self, token: str, digest: bytes) -> Dict[str, Any]:
+        if not self.breaker.allow():
+            return self._fallback(digest, "circuit is open")
+
+        # Сбоем auth считаются только транспортные ошибки и 5xx: ответ 4xx
+        # значит, что auth доступен, и не должен размыкать цепь
+        try:
+            response = await self.client.get(
+                self.me_url, headers={"Authorization": f"Bearer {token}"}
+            )
+            if response.status_code >= 500:
+                response.raise_for_status()
+            user = response.json() if response.is_success else None
+        except (httpx.HTTPError, ValueError) as e:
+            self.breaker.record_failure()
+            return self._fallback(digest, e)
+
+        self.breaker.record_success()
+        logger.debug(f"Auth service response status: {response.status_code}")
+
+        if response.status_code == 429:
+            # auth ограничивает частоту запросов: токен при этом не отклонен
+            return self._fallback(digest, "auth rate limit")
+
+        if user is None:
+            self.cache.pop(digest)
+            raise InvalidCredentials(f"Auth rejected token: {response.status_code}")
+
+        self.cache.put(digest, user, self._token_exp(token))
+        return user
+
+    def _fallback(self, digest: bytes, reason: Any) -> Dict[str, Any]:
+        user = self.cache.get(digest, allow_stale=True)
+        if user is None:
+            logger.error(f"Request to auth service failed: {reason}")
+            raise AuthUnavailable(str(reason))
+        logger.warning(f"Auth service unavailable ({reason}), using cached user")
+        return user
+
+    @staticmethod
+    def _token_exp(token: str) -> Optional[float]:
+        # Подпись проверил auth; отсюда нужен только срок жизни
+        try:
+            exp = jwt.decode(token, options={"verify_signature": False}).get("exp")
+        except jwt.PyJWTError:
+            return None
+        return float(exp) if exp is not None else None
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -11,9 +13,31 @@ class Settings(BaseSettings):
     POSTGRES_DB: str = Field("subscriptions_db", alias="SUB_POSTGRES_DB")
     POSTGRES_USER: str = Field("postgres", alias="SUB_POSTGRES_USER")
     POSTGRES_PASSWORD: str = Field("secret", alias="SUB_POSTGRES_PASSWORD")
+    # Пул на воркер: воркеры * (DB_POOL_SIZE + DB_MAX_OVERFLOW) <= max_connections
+    DB_POOL_SIZE: int = Field(5, alias="SUB_DB_POOL_SIZE")
+    DB_MAX_OVERFLOW: int = Field(5, alias="SUB_DB_MAX_OVERFLOW")
+    DB_POOL_TIMEOUT: float = Field(10, alias="SUB_DB_POOL_TIMEOUT")
+    DB_POOL_RECYCLE: int = Field(1800, alias="SUB_DB_POOL_RECYCLE")
+    DB_POOL_PRE_PING: bool = Field(True, alias="SUB_DB_POOL_PRE_PING")
+    DB_ECHO: bool = Field(False, alias="SUB_DB_ECHO")
+    DB_QUERY_CACHE_SIZE: int = Field(500, alias="SUB_DB_QUERY_CACHE_SIZE")
+    # 0 — за pgbouncer в режиме transaction
+    DB_STATEMENT_CACHE_SIZE: int = Field(100, alias="SUB_DB_STATEMENT_CACHE_SIZE")
 
     ALLOWED_HOSTS: list = ["*"]
 
+    # Auth: при заданном JWKS токены проверяются локально, без запроса к /auth/me
+    AUTH_ME_URL: str = Field("http://auth_api:8000/api/v1/auth/me", alias="AUTH_ME_URL")
+    AUTH_JWKS_URL: Optional[str] = Field(None, alias="AUTH_JWKS_URL")
+    AUTH_JWKS_CACHE_TTL: int = Field(300, alias="AUTH_JWKS_CACHE_TTL")
+    # Кэш ответов /auth/me и размыкатель: см. subscriptions.core.auth_client
+    AUTH_CACHE_TTL: int = Field(30, alias="AUTH_CACHE_TTL")
+    AUTH_CACHE_STALE_TTL: int = Field(300, alias="AUTH_CACHE_STALE_TTL")
+    AUTH_TIMEOUT: float = Field(5.0, alias="AUTH_TIMEOUT")
+    AUTH_MAX_CONNECTIONS: int = Field(100, alias="AUTH_MAX_CONNECTIONS")
+    AUTH_BREAKER_FAIL_MAX: int = Field(5, alias="AUTH_BREAKER_FAIL_MAX")
+    AUTH_BREAKER_RESET_TIMEOUT: int = Field(30, alias="AUTH_BREAKER_RESET_TIMEOUT")
+
     @property
     def database_url(self) -> str:
         return (
@@ -0,0 +1,122 @@
+"""
+Локальная проверка access-токенов auth по его JWKS.
+
+Подпись проверяется публичным ключом из /.well-known/jwks.json, без
+запроса к auth на каждый запрос. Отозванный при logout access-токен при
+этом остается действительным до истечения exp (по умолчанию 30 минут);
+изменения ролей видны по claim permissions_version.
+"""
+
+import asyncio
+import time
+from logging import getLogger
+from typing import Any, Dict, Optional
+
+import httpx
+import jwt
+
+logger = getLogger(__name__)
+
+
+class JWKSUnavailable(Exception):
+    """Ключи auth еще ни разу не удалось получить"""
+
+
+class JWKSVerifier:
+    """
+    Verifies auth access tokens with the public keys from auth's JWKS.
+
+    Keys are cached for ``cache_ttl`` seconds. A token with an unknown
+    ``kid`` (auth rotated its key) triggers an early refresh. Fetches are
+    single-flight and at most one per ``min_refresh_interval``, so a burst
+    of tokens with forged kids cannot turn into a request flood against
+    auth. If auth is unreachable the last known keys stay in use.
+    """
+
+    def __init__(
+        self,
+        jwks_url: str,
+        cache_ttl: float = 300,
+        min_refresh_interval: float = 30,
+        timeout: float = 5.0,
+    ):
+        self.jwks_url = jwks_url
+        self.cache_ttl = cache_ttl
+        self.min_refresh_interval = min_refresh_interval
+        self.timeout = timeout
+
+        self._keys: Dict[str, jwt.PyJWK] = {}
+        self._fetched_at = float("-inf")
+        self._attempted_at = float("-inf")
+        self._lock = asyncio.Lock()
+
+    async def verify(self, token: str) -> Dict[str, Any]:
+        """
+        Return verified claims of an access token.
+
+        Raises:
+            jwt.PyJWTError: malformed, expired, badly signed or not an
+                access token
+            JWKSUnavailable: no keys could be loaded from auth yet
+        """
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = await self._get_key(kid)
+        claims = jwt.decode(
+            token,
+            key.key,
+            algorithms=[key.algorithm_name],
+            options={"require": ["exp", "iat", "jti"]},
+        )
+        if claims.get("token_type") != "access":
+            raise jwt.InvalidTokenError("Not an access token")
+        return claims
+
+    async def _get_key(self, kid: Optional[str]) -> jwt.PyJWK:
+        if time.monotonic() - self._fetched_at >= self.cache_ttl:
+            await self._refresh()
+
+        key = self._keys.get(kid)
+        if key is None and kid is not None:
+            await self._refresh()
+            key = self._keys.get(kid)
+
+        if key is None:
+            if not self._keys:
+                raise JWKSUnavailable("Auth signing keys are not available")
+            raise jwt.InvalidKeyError(f"Unknown signing key: {kid}")
+        return key
+
+    async def _refresh(self) -> None:
+        async with self._lock:
+            # Другая корутина только что обновила ключи или попыталась это сделать
+            if time.monotonic() - self._attempted_at < self.min_refresh_interval:
+                return
+            self._attempted_at = time.monotonic()
+
+            try:
+                jwks = await self._fetch_jwks()
+                keys = {jwk["kid"]: jwt.PyJWK(jwk) for jwk in jwks["keys"]}
+            except (httpx.HTTPError, ValueError, KeyError, jwt.PyJWKError) as e:
+                logger.warning(f"Failed to refresh JWKS from {self.jwks_url}: {e}")
+                return
+
+            self._keys = keys
+            self._fetched_at = self._attempted_at
+            logger.debug(f"Loaded {len(keys)} signing keys from {self.jwks_url}")
+
+    async def _fetch_jwks(self) -> Dict[str, Any]:
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            response = await client.get(self.jwks_url)
+            response.raise_for_status()
+            return response.json()
+
+
+def claims_to_user(claims: Dict[str, Any]) -> Dict[str, Any]:
+    """Та же структура пользователя, что отдает /api/v1/auth/me"""
+    return {
+        "id": claims["user_id"],
+        "username": claims.get("username"),
+        "is_superuser": claims.get("is_superuser", False),
+        "roles": claims.get("roles", []),
+        "permissions_version": claims.get("permissions_version", 0),
+    }
@@ -1,12 +1,19 @@
-from sqlalchemy.ext.asyncio import (
-    AsyncSession,
-    async_sessionmaker,
-    create_async_engine
-)
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from subscriptions.core.config import settings
+from subscriptions.db.engine import create_engine
 
-engine = create_async_engine(str(settings.database_url), echo=True, future=True)
+engine = create_engine(
+    settings.database_url,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    echo=settings.DB_ECHO,
+    query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+    statement_cache_size=settings.DB_STATEMENT_CACHE_SIZE,
+)
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
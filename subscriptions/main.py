@@ -1,20 +1,34 @@
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, ORJSONResponse
 
+from subscriptions.api.dependencies import auth_client
 from subscriptions.api.v1 import subscription_router
 from subscriptions.core.config import settings
+from subscriptions.db.engine import pool_stats
+from subscriptions.db.postgres import engine
 from subscriptions.middlewares.auth_middleware import (
     AuthConfig,
     AuthMiddleware
 )
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await auth_client.aclose()
+    await engine.dispose()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     docs_url="/api/openapi",
     openapi_url="/api/openapi.json",
     default_response_class=ORJSONResponse,
+    lifespan=lifespan,
     root_path="/api/subscriptions",
     swagger_ui_parameters={"defaultModelsExpandDepth": -1},
 )
@@ -53,6 +67,12 @@ async def health_check():
     return {"status": "ok"}
 
 
+@app.get("/health/db_pool")
+async def db_pool_stats():
+    """Состояние пула соединений и время ожидания соединения"""
+    return pool_stats(engine)
+
+
 app.include_router(
     subscription_router.router, prefix="/api/v1/subscription", tags=["subscription"]
 )
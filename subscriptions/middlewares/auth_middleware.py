@@ -1,15 +1,21 @@
+import hashlib
+import logging
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from datetime import datetime
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 
 import jwt
-from fastapi import HTTPException, Request
-from fastapi.responses import JSONResponse
-from starlette.middleware.base import (
-    BaseHTTPMiddleware,
-    RequestResponseEndpoint
-)
-from starlette.responses import Response
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from subscriptions.core.jwks import JWKSUnavailable, JWKSVerifier
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PUBLIC_PATHS = ["/openapi", "/openapi.json", "/docs", "/redoc", "/health"]
+# Документация открыта под любым префиксом (root_path, версия API)
+DOC_PATH_SUFFIXES = ("/openapi", "/openapi.json", "/docs", "/redoc")
 
 
 @dataclass
@@ -20,79 +26,144 @@ class AuthConfig:
     public_paths: List[str] = None
     token_prefix: str = "Bearer"
     algorithm: str = "HS256"
-
-
-class AuthMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app, config: AuthConfig):
-        super().__init__(app)
+    # При заданном URL токены проверяются публичными ключами auth, а не secret_key
+    jwks_url: Optional[str] = None
+    claims_cache_size: int = 10000
+
+
+class PublicPathMatcher:
+    """Public paths compiled once: a set for exact paths, a tuple for doc suffixes"""
+
+    def __init__(
+        self, paths: Iterable[str], suffixes: Iterable[str] = DOC_PATH_SUFFIXES
+    ):
+        self.paths = frozenset(paths)
+        self.suffixes = tuple(suffixes)
+
+    def matches(self, path: str, full_path: str) -> bool:
+        return (
+            full_path in self.paths
+            or path in self.paths
+            or full_path.endswith(self.suffixes)
+        )
+
+
+class VerifiedClaimsCache:
+    """
+    LRU of verified token claims keyed by SHA-256 of the token.
+
+    Entries live until the token's ``exp``; tokens without ``exp`` are
+    not cached.
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[bytes, Dict] = OrderedDict()
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, digest: bytes) -> Optional[Dict]:
+        claims = self._entries.get(digest)
+        if claims is None:
+            return None
+        if claims["exp"] <= time.time():
+            del self._entries[digest]
+            return None
+        self._entries.move_to_end(digest)
+        return dict(claims)
+
+    def put(self, digest: bytes, claims: Dict) -> None:
+        if self.maxsize <= 0 or not isinstance(claims.get("exp"), (int, float)):
+            return
+        self._entries[digest] = dict(claims)
+        self._entries.move_to_end(digest)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+class AuthError(Exception):
+    def __init__(self, status_code: int, detail: str):
+        self.status_code = status_code
+        self.detail = detail
+
+
+class AuthMiddleware:
+    """
+    Pure ASGI middleware checking the bearer token of non-public requests.
+
+    Verified claims are put into ``request.state.user``.
+    """
+
+    def __init__(self, app: ASGIApp, config: AuthConfig):
+        self.app = app
         self.config = config
-        self.public_paths = config.public_paths or [
-            "/openapi",
-            "/openapi.json",
-            "/docs",
-            "/redoc",
-            "/health",
-        ]
-
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
-        # Get the full path including scope's root_path
-        root_path = request.scope.get("root_path", "").rstrip("/")
-        path = request.url.path
-        full_path = f"{root_path}{path}"
-
-        # Debug logging
-        print(f"Checking path: {full_path}")
-        print(f"Public paths: {self.public_paths}")
-
-        # Check if path is public using exact matching
-        if full_path in self.public_paths or path in self.public_paths:
-            return await call_next(request)
-
-        # Also check if path ends with any of the default doc paths
-        default_doc_paths = ["/openapi", "/openapi.json", "/docs", "/redoc"]
-        if any(full_path.endswith(doc_path) for doc_path in default_doc_paths):
-            return await call_next(request)
-
-        try:
-            # Get and validate auth header
-            auth_header = request.headers.get("Authorization")
-            if not auth_header:
-                raise HTTPException(
-                    status_code=401, detail="Missing authentication header"
+        self.jwks_verifier = JWKSVerifier(config.jwks_url) if config.jwks_url else None
+        self.public_paths = PublicPathMatcher(
+            config.public_paths or DEFAULT_PUBLIC_PATHS
+        )
+        self.claims_cache = VerifiedClaimsCache(config.claims_cache_size)
+        self.header_prefix = f"{config.token_prefix} "
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        full_path = f"{scope.get('root_path', '').rstrip('/')}{path}"
+        public = self.public_paths.matches(path, full_path)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Auth check path=%s public=%s", full_path, public)
+
+        if not public:
+            try:
+                claims = await self.authenticate(scope)
+            except AuthError as e:
+                response = JSONResponse(
+                    status_code=e.status_code, content={"detail": e.detail}
                 )
+                await response(scope, receive, send)
+                return
+            scope.setdefault("state", {})["user"] = claims
+
+        await self.app(scope, receive, send)
+
+    async def authenticate(self, scope: Scope) -> Dict:
+        auth_header = None
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                auth_header = value.decode("latin-1")
+                break
+
+        if not auth_header:
+            raise AuthError(401, "Missing authentication header")
+        if not auth_header.startswith(self.config.token_prefix):
+            raise AuthError(
+                401,
+                f"Invalid token format. Must start with '{self.config.token_prefix}'",
+            )
 
-            # Validate token format
-            if not auth_header.startswith(self.config.token_prefix):
-                raise HTTPException(
-                    status_code=401,
-                    detail=f"Invalid token format. Must start with '{self.config.token_prefix}'",
-                )
+        token = auth_header.removeprefix(self.header_prefix)
+        digest = self.claims_cache.digest(token)
+        claims = self.claims_cache.get(digest)
+        if claims is not None:
+            return claims
 
-            # Extract and verify token
-            token = auth_header.replace(f"{self.config.token_prefix} ", "")
-            try:
-                payload = jwt.decode(
+        try:
+            if self.jwks_verifier is not None:
+                claims = await self.jwks_verifier.verify(token)
+            else:
+                claims = jwt.decode(
                     token, self.config.secret_key, algorithms=[self.config.algorithm]
                 )
-
-                # Check token expiration
-                exp = payload.get("exp")
-                if exp and datetime.utcnow().timestamp() > exp:
-                    raise HTTPException(status_code=401, detail="Token has expired")
-
-                # Add decoded payload to request state
-                request.state.user = payload
-
-            except jwt.InvalidTokenError:
-                raise HTTPException(status_code=401, detail="Invalid token")
-
-            return await call_next(request)
-
-        except HTTPException as e:
-            return JSONResponse(status_code=e.status_code, content={"detail": e.detail})
-        except Exception as e:
-            return JSONResponse(
-                status_code=500, content={"detail": "Internal server error"}
-            )
+        except JWKSUnavailable:
+            raise AuthError(503, "Auth service is unavailable")
+        except jwt.ExpiredSignatureError:
+            raise AuthError(401, "Token has expired")
+        except jwt.PyJWTError:
+            raise AuthError(401, "Invalid token")
+
+        self.claims_cache.put(digest, claims)
+        return claims
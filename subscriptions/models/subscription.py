@@ -2,7 +2,7 @@ from enum import Enum
 
 from sqlalchemy import TIMESTAMP, Boolean, Column, DateTime
 from sqlalchemy import Enum as SQLEnum
-from sqlalchemy import ForeignKey, Integer, Numeric, String
+from sqlalchemy import ForeignKey, Index, Integer, Numeric, String, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import relationship
 
@@ -58,6 +58,23 @@ class Subscription(Base):
     # данные для платежей
     payment_id = Column(UUID(as_uuid=True), nullable=True)
     payment_method_id = Column(UUID(as_uuid=True), nullable=True)
+    # Частичные индексы покрывают только активные подписки: запросы должны
+    # сравнивать status с литералом, а не с параметром, иначе Postgres не
+    # применит их в generic plan
+    __table_args__ = (
+        Index("idx_subscriptions_user_id", "user_id"),
+        Index(
+            "idx_subscriptions_active_end_date",
+            "end_date",
+            postgresql_where=text("status = 'ACTIVE'"),
+        ),
+        Index(
+            "idx_subscriptions_due_renewal",
+            "end_date",
+            "id",
+            postgresql_where=text("status = 'ACTIVE' AND is_auto_renewable"),
+        ),
+    )
 
 
 class SubscriptionHistory(Base):
@@ -70,3 +87,10 @@ class SubscriptionHistory(Base):
     action = Column(String(50), nullable=False)
     details = Column(JSONB, default={})
     subscription = relationship("Subscription", back_populates="history")
+    __table_args__ = (
+        Index(
+            "idx_subscription_history_subscription_id",
+            "subscription_id",
+            "created_at",
+        ),
+    )
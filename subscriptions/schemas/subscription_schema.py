@@ -158,6 +158,34 @@ class SubscriptionResponse(SubscriptionBase):
     )
 
 
+class SubscriptionPage(BaseModel):
+    """Schema for a keyset-paginated list of subscriptions"""
+
+    items: list[SubscriptionResponse] = Field(description="Subscriptions on this page")
+    next_cursor: UUID | None = Field(
+        default=None,
+        description="Cursor of the next page, null on the last page",
+        examples=["123e4567-e89b-12d3-a456-426614174000"],
+    )
+
+
+class DueSubscriptionPage(BaseModel):
+    """Schema for a page of subscriptions due for renewal"""
+
+    items: list[SubscriptionResponse] = Field(description="Subscriptions on this page")
+    next_cursor: str | None = Field(
+        default=None, description="Cursor of the next page, null on the last page"
+    )
+
+
+class ExpirationReport(BaseModel):
+    """Schema for the result of a bulk expiration run"""
+
+    expired: int = Field(description="Subscriptions marked expired", examples=[1250])
+    chunks: int = Field(description="Transactions committed", examples=[2])
+    elapsed_seconds: float = Field(description="Wall time of the run", examples=[0.42])
+
+
 class SubscriptionHistoryResponse(BaseModel):
     """Schema for subscription history entries"""
 
@@ -1,6 +1,10 @@
+import logging
+from typing import Sequence
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import cast, func, insert, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from subscriptions.models.subscription import SubscriptionHistory
@@ -9,6 +13,8 @@ from subscriptions.schemas.subscription_schema import (
 )
 from subscriptions.services.interfaces import ISubscriptionHistoryManager
 
+logger = logging.getLogger(__name__)
+
 
 class SubscriptionHistoryManager(ISubscriptionHistoryManager):
     def __init__(self, session: AsyncSession):
@@ -17,15 +23,58 @@ class SubscriptionHistoryManager(ISubscriptionHistoryManager):
     async def add_record(
         self, subscription_id: UUID, action: str, details: dict | None = None
     ) -> None:
-        print(details)
-        history_entry = SubscriptionHistory(
-            subscription_id=subscription_id,
-            action=action,
-            details={key: str(value) for key, value in details.items()} or {},
+        """Запись добавляется в текущую транзакцию; коммит за вызывающим"""
+        details = {key: str(value) for key, value in (details or {}).items()}
+        self.session.add(
+            SubscriptionHistory(
+                subscription_id=subscription_id, action=action, details=details
+            )
+        )
+        logger.debug(
+            "Subscription history record added",
+            extra={
+                "subscription_id": str(subscription_id),
+                "action": action,
+                "details": details,
+            },
+        )
+
+    async def add_records(
+        self,
+        subscription_ids: Sequence[UUID],
+        action: str,
+        details: dict | None = None,
+    ) -> None:
+        """
+        Одна вставка на все строки: INSERT ... SELECT unnest(:ids).
+
+        Массив передается одним параметром, поэтому текст запроса не зависит
+        от числа строк и кэшируется. Коммит остается за вызывающим.
+        """
+        if not subscription_ids:
+            return
+        details = {key: str(value) for key, value in (details or {}).items()}
+        rows = select(
+            func.gen_random_uuid(),
+            func.unnest(cast(list(subscription_ids), ARRAY(PG_UUID(as_uuid=True)))),
+            literal(action),
+            literal(details, JSONB),
+            func.now(),
+            func.now(),
+        )
+        await self.session.execute(
+            insert(SubscriptionHistory).from_select(
+                [
+                    "id",
+                    "subscription_id",
+                    "action",
+                    "details",
+                    "created_at",
+                    "updated_at",
+                ],
+                rows,
+            )
         )
-        print(history_entry)
-        self.session.add(history_entry)
-        await self.session.commit()
 
     async def get_history(
         self, subscription_id: UUID
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import AsyncIterator, Iterable, List, Optional, Sequence
 from uuid import UUID
 
 from subscriptions.models import Subscription, SubscriptionStatus
@@ -39,6 +40,45 @@ class ISubscriptionRepository(ABC):
     ) -> List[Subscription]:
         pass
 
+    @abstractmethod
+    async def transition(
+        self,
+        subscription_id: UUID,
+        new_status: SubscriptionStatus,
+        allowed_from: Iterable[SubscriptionStatus],
+    ) -> Optional[Subscription]:
+        pass
+
+    @abstractmethod
+    async def expire_due(self, limit: int) -> List[UUID]:
+        pass
+
+    @abstractmethod
+    async def list_due(
+        self,
+        due_before: datetime,
+        after: Optional[tuple[datetime, UUID]] = None,
+        limit: int = 100,
+    ) -> List[Subscription]:
+        pass
+
+    @abstractmethod
+    async def list_page(
+        self,
+        after: Optional[UUID] = None,
+        limit: int = 100,
+        status: Optional[SubscriptionStatus] = None,
+    ) -> List[Subscription]:
+        pass
+
+    @abstractmethod
+    def stream_subscriptions(
+        self,
+        status: Optional[SubscriptionStatus] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator:
+        pass
+
 
 class ISubscriptionStatusManager(ABC):
     @abstractmethod
@@ -61,6 +101,15 @@ class ISubscriptionHistoryManager(ABC):
     ) -> None:
         pass
 
+    @abstractmethod
+    async def add_records(
+        self,
+        subscription_ids: Sequence[UUID],
+        action: str,
+        details: dict | None = None,
+    ) -> None:
+        pass
+
     @abstractmethod
     async def get_history(
         self, subscription_id: UUID
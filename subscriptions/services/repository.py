@@ -1,14 +1,20 @@
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import AsyncIterator, Iterable, List, Optional
 from uuid import UUID
 
-from sqlalchemy import and_, select
+from sqlalchemy import Row, and_, func, literal, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from subscriptions.core.exceptions import SubscriptionNotFoundException
 from subscriptions.models.subscription import Subscription, SubscriptionStatus
 from subscriptions.services.interfaces import ISubscriptionRepository
 
+# Статус подставляется в текст запроса, чтобы Postgres мог доказать условие
+# частичных индексов и в generic plan подготовленного запроса
+ACTIVE = literal(
+    SubscriptionStatus.ACTIVE, Subscription.status.type, literal_execute=True
+)
+
 
 class SubscriptionRepository(ISubscriptionRepository):
     def __init__(self, session: AsyncSession):
@@ -17,8 +23,7 @@ class SubscriptionRepository(ISubscriptionRepository):
     async def create(self, subscription_data: dict) -> Subscription:
         subscription = Subscription(**subscription_data)
         self.session.add(subscription)
-        await self.session.commit()
-        await self.session.refresh(subscription)
+        await self.session.flush()
         return subscription
 
     async def get_with_user_id(self, user_id: UUID) -> Subscription:
@@ -40,27 +45,113 @@ class SubscriptionRepository(ISubscriptionRepository):
         return subscription
 
     async def update(self, subscription_id: UUID, data: dict) -> Subscription:
-        subscription = await self.get(subscription_id)
-        for key, value in data.items():
-            setattr(subscription, key, value)
-        await self.session.commit()
-        await self.session.refresh(subscription)
+        result = await self.session.execute(
+            update(Subscription)
+            .where(Subscription.id == subscription_id)
+            .values(**data, updated_at=func.now())
+            .returning(Subscription)
+            .execution_options(populate_existing=True)
+        )
+        subscription = result.scalar_one_or_none()
+        if not subscription:
+            raise SubscriptionNotFoundException()
         return subscription
 
-    async def list_subscriptions(
+    async def transition(
         self,
-        offset: int = 0,
-        limit: int = 50,
+        subscription_id: UUID,
+        new_status: SubscriptionStatus,
+        allowed_from: Iterable[SubscriptionStatus],
+    ) -> Optional[Subscription]:
+        """
+        Set ``new_status`` only if the current status is in ``allowed_from``.
+
+        One UPDATE ... WHERE id = :id AND status IN (:allowed) RETURNING *;
+        None means the subscription is missing or in a status that does not
+        allow the transition, and the caller tells the two apart.
+        """
+        result = await self.session.execute(
+            update(Subscription)
+            .where(
+                Subscription.id == subscription_id,
+                Subscription.status.in_(list(allowed_from)),
+            )
+            .values(status=new_status, updated_at=func.now())
+            .returning(Subscription)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalar_one_or_none()
+
+    async def expire_due(self, limit: int) -> List[UUID]:
+        """
+        Mark up to ``limit`` active subscriptions past their end_date expired.
+
+        One UPDATE ... FROM due RETURNING id. The chunk is picked in a CTE
+        with FOR UPDATE SKIP LOCKED, so concurrent runs take disjoint rows;
+        joining on the CTE lets Postgres update them by primary key instead
+        of hashing the whole table as it does for ``id IN (subquery)``.
+        Oldest end_date first, read in order from the partial index on
+        active subscriptions. The caller owns the transaction.
+        """
+        due = (
+            select(Subscription.id)
+            .filter(
+                Subscription.status == ACTIVE,
+                Subscription.end_date < func.now(),
+            )
+            .order_by(Subscription.end_date)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .cte("due")
+        )
+        result = await self.session.execute(
+            update(Subscription)
+            .where(Subscription.id == due.c.id)
+            .values(status=SubscriptionStatus.EXPIRED, updated_at=func.now())
+            .returning(Subscription.id)
+            .execution_options(synchronize_session=False)
+        )
+        return list(result.scalars().all())
+
+    async def list_due(
+        self,
+        due_before: datetime,
+        after: Optional[tuple[datetime, UUID]] = None,
+        limit: int = 100,
+    ) -> List[Subscription]:
+        """
+        Active auto-renewable subscriptions ending before ``due_before``.
+
+        Ordered by (end_date, id) and paged by keyset on the same pair, which
+        is exactly the idx_subscriptions_due_renewal partial index: each page
+        is a range scan of ``limit`` index entries.
+        """
+        query = (
+            select(Subscription)
+            .filter(
+                Subscription.status == ACTIVE,
+                Subscription.is_auto_renewable,
+                Subscription.end_date < due_before,
+            )
+            .order_by(Subscription.end_date, Subscription.id)
+            .limit(limit)
+        )
+        if after:
+            key = (Subscription.end_date, Subscription.id)
+            query = query.filter(
+                tuple_(*key) > tuple_(*after, types=[column.type for column in key])
+            )
+
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
+
+    @staticmethod
+    def _conditions(
         user_id: Optional[UUID] = None,
         status: Optional[SubscriptionStatus] = None,
         plan_type: Optional[str] = None,
         end_date: Optional[datetime.date] = None,
-        # добавляем фильтр по дате платежа/отмены подписки
-    ) -> List[Subscription]:
-
-        query = select(Subscription)
-
-        # Build filter conditions
+    ) -> list:
         conditions = []
         if user_id:
             conditions.append(Subscription.user_id == user_id)
@@ -71,7 +162,23 @@ class SubscriptionRepository(ISubscriptionRepository):
         if end_date:
             conditions.append(Subscription.end_date >= end_date)
             conditions.append(Subscription.end_date < (end_date + timedelta(days=1)))
+        return conditions
 
+    async def list_subscriptions(
+        self,
+        offset: int = 0,
+        limit: int = 50,
+        user_id: Optional[UUID] = None,
+        status: Optional[SubscriptionStatus] = None,
+        plan_type: Optional[str] = None,
+        end_date: Optional[datetime.date] = None,
+        # добавляем фильтр по дате платежа/отмены подписки
+    ) -> List[Subscription]:
+
+        query = select(Subscription)
+
+        # Build filter conditions
+        conditions = self._conditions(user_id, status, plan_type, end_date)
         if conditions:
             query = query.filter(and_(*conditions))
 
@@ -81,3 +188,49 @@ class SubscriptionRepository(ISubscriptionRepository):
         # Execute query
         result = await self.session.execute(query)
         return list(result.scalars().all())
+
+    async def list_page(
+        self,
+        after: Optional[UUID] = None,
+        limit: int = 100,
+        status: Optional[SubscriptionStatus] = None,
+    ) -> List[Subscription]:
+        """
+        Keyset page ordered by id: rows with id greater than ``after``.
+
+        Unlike offset pagination the cost of a page does not grow with its
+        position, and rows changing status between pages are neither
+        skipped nor repeated.
+        """
+        conditions = self._conditions(status=status)
+        if after:
+            conditions.append(Subscription.id > after)
+
+        query = select(Subscription).order_by(Subscription.id).limit(limit)
+        if conditions:
+            query = query.filter(and_(*conditions))
+
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
+
+    async def stream_subscriptions(
+        self,
+        status: Optional[SubscriptionStatus] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Row]:
+        """
+        Rows of the subscriptions table read through a server-side cursor.
+
+        Plain rows instead of ORM objects keep the identity map empty, so
+        memory is bounded by ``batch_size`` regardless of table size.
+        """
+        query = select(Subscription.__table__).order_by(Subscription.id)
+        conditions = self._conditions(status=status)
+        if conditions:
+            query = query.filter(and_(*conditions))
+
+        result = await self.session.stream(
+            query.execution_options(yield_per=batch_size)
+        )
+        async for row in result:
+            yield row
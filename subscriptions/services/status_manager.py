@@ -2,7 +2,8 @@ from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from subscriptions.models.subscription import SubscriptionStatus
+from subscriptions.core.exceptions import InvalidStatusTransitionException
+from subscriptions.models.subscription import Subscription, SubscriptionStatus
 from subscriptions.services.interfaces import ISubscriptionStatusManager
 from subscriptions.services.repository import SubscriptionRepository
 from subscriptions.services.validator import SubscriptionValidator
@@ -14,29 +15,28 @@ class SubscriptionStatusManager(ISubscriptionStatusManager):
         self.repository = SubscriptionRepository(session)
         self.validator = SubscriptionValidator()  # Добавляем валидатор
 
-    async def suspend(self, subscription_id: UUID, reason: str) -> None:
-        subscription = await self.repository.get(subscription_id)
-        await self.validator.validate_status_transition(
-            subscription.status, SubscriptionStatus.SUSPENDED
-        )
-        await self.repository.update(
-            subscription_id, {"status": SubscriptionStatus.SUSPENDED}
+    async def transition(
+        self, subscription_id: UUID, new_status: SubscriptionStatus
+    ) -> Subscription:
+        """
+        Переход статуса одним UPDATE с проверкой допустимых исходных статусов.
+
+        Текущий статус читается только при отказе, чтобы отличить
+        отсутствующую подписку (404) от недопустимого перехода (400).
+        """
+        subscription = await self.repository.transition(
+            subscription_id, new_status, self.validator.allowed_sources(new_status)
         )
+        if subscription is None:
+            current = await self.repository.get(subscription_id)
+            raise InvalidStatusTransitionException(current.status, new_status)
+        return subscription
+
+    async def suspend(self, subscription_id: UUID, reason: str) -> None:
+        await self.transition(subscription_id, SubscriptionStatus.SUSPENDED)
 
     async def resume(self, subscription_id: UUID, comment: str | None) -> None:
-        subscription = await self.repository.get(subscription_id)
-        await self.validator.validate_status_transition(
-            subscription.status, SubscriptionStatus.ACTIVE
-        )
-        await self.repository.update(
-            subscription_id, {"status": SubscriptionStatus.ACTIVE}
-        )
+        await self.transition(subscription_id, SubscriptionStatus.ACTIVE)
 
     async def cancel(self, subscription_id: UUID, reason: str, immediate: bool) -> None:
-        subscription = await self.repository.get(subscription_id)
-        await self.validator.validate_status_transition(
-            subscription.status, SubscriptionStatus.CANCELED
-        )
-        await self.repository.update(
-            subscription_id, {"status": SubscriptionStatus.CANCELED}
-        )
+        await self.transition(subscription_id, SubscriptionStatus.CANCELED)
@@ -1,17 +1,42 @@
-from typing import List, Optional
+import base64
+import logging
+import time
+from datetime import UTC, datetime, timedelta
+from typing import AsyncIterator, List, Optional
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from subscriptions.schemas.subscription_schema import (
+    DueSubscriptionPage,
+    ExpirationReport,
     SubscriptionCreate,
     SubscriptionHistoryResponse,
+    SubscriptionPage,
     SubscriptionResponse,
     SubscriptionUpdate
 )
 from subscriptions.services.history_manager import SubscriptionHistoryManager
 from subscriptions.services.repository import SubscriptionRepository
 from subscriptions.services.status_manager import SubscriptionStatusManager
+from subscriptions.services.unit_of_work import UnitOfWork
+
+logger = logging.getLogger(__name__)
+
+
+def encode_due_cursor(end_date: datetime, subscription_id: UUID) -> str:
+    raw = f"{end_date.isoformat()}|{subscription_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_due_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Ключ (end_date, id) из курсора; ValueError, если курсор поврежден"""
+    raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+    end_date, subscription_id = raw.split("|")
+    end_date = datetime.fromisoformat(end_date)
+    if end_date.tzinfo is None:
+        raise ValueError("Cursor end_date must be timezone-aware")
+    return end_date, UUID(subscription_id)
 
 
 class SubscriptionService:
@@ -20,14 +45,18 @@ class SubscriptionService:
         self.repository = SubscriptionRepository(session)
         self.status_manager = SubscriptionStatusManager(session)
         self.history_manager = SubscriptionHistoryManager(session)
+        self.unit_of_work = UnitOfWork(session)
 
     async def create_subscription(
         self, subscription_data: SubscriptionCreate
     ) -> SubscriptionResponse:
-        subscription = await self.repository.create(subscription_data.model_dump())
-        await self.history_manager.add_record(
-            subscription.id, "created", {"plan_type": subscription.plan_type}
-        )
+        async with self.unit_of_work:
+            subscription = await self.repository.create(
+                subscription_data.model_dump()
+            )
+            await self.history_manager.add_record(
+                subscription.id, "created", {"plan_type": subscription.plan_type}
+            )
         return SubscriptionResponse.model_validate(subscription)
 
     async def get_subscription(self, subscription_id: UUID) -> SubscriptionResponse:
@@ -43,35 +72,38 @@ class SubscriptionService:
     async def update_subscription(
         self, subscription_id: UUID, update_data: SubscriptionUpdate
     ) -> SubscriptionResponse:
-        subscription = await self.repository.update(
-            subscription_id, update_data.model_dump(exclude_none=True)
-        )
-        await self.history_manager.add_record(
-            subscription_id, "updated", update_data.model_dump(exclude_none=True)
-        )
+        changes = update_data.model_dump(exclude_none=True)
+        async with self.unit_of_work:
+            subscription = await self.repository.update(subscription_id, changes)
+            await self.history_manager.add_record(subscription_id, "updated", changes)
         return SubscriptionResponse.model_validate(subscription)
 
     async def suspend_subscription(self, subscription_id: UUID, reason: str) -> None:
-        await self.status_manager.suspend(subscription_id, reason)
-        await self.history_manager.add_record(
-            subscription_id, "suspended", {"reason": reason}
-        )
+        async with self.unit_of_work:
+            await self.status_manager.suspend(subscription_id, reason)
+            await self.history_manager.add_record(
+                subscription_id, "suspended", {"reason": reason}
+            )
 
     async def resume_subscription(
         self, subscription_id: UUID, comment: str | None
     ) -> None:
-        await self.status_manager.resume(subscription_id, comment)
-        await self.history_manager.add_record(
-            subscription_id, "resumed", {"comment": comment} if comment else None
-        )
+        async with self.unit_of_work:
+            await self.status_manager.resume(subscription_id, comment)
+            await self.history_manager.add_record(
+                subscription_id, "resumed", {"comment": comment} if comment else None
+            )
 
     async def cancel_subscription(
         self, subscription_id: UUID, reason: str, immediate: bool
     ) -> None:
-        await self.status_manager.cancel(subscription_id, reason, immediate)
-        await self.history_manager.add_record(
-            subscription_id, "cancelled", {"reason": reason, "immediate": immediate}
-        )
+        async with self.unit_of_work:
+            await self.status_manager.cancel(subscription_id, reason, immediate)
+            await self.history_manager.add_record(
+                subscription_id,
+                "cancelled",
+                {"reason": reason, "immediate": immediate},
+            )
 
     async def get_subscription_history(
         self, subscription_id: UUID
@@ -82,3 +114,82 @@ class SubscriptionService:
         if query_dict is None:
             query_dict = {}
         return await self.repository.list_subscriptions(**query_dict or {})
+
+    async def get_subscription_page(
+        self,
+        cursor: Optional[UUID] = None,
+        limit: int = 100,
+        status: Optional[str] = None,
+    ) -> SubscriptionPage:
+        # Лишняя строка показывает, есть ли следующая страница
+        subscriptions = await self.repository.list_page(cursor, limit + 1, status)
+        items = [
+            SubscriptionResponse.model_validate(subscription)
+            for subscription in subscriptions[:limit]
+        ]
+        next_cursor = items[-1].id if len(subscriptions) > limit else None
+        return SubscriptionPage(items=items, next_cursor=next_cursor)
+
+    async def get_due_page(
+        self,
+        lookahead: timedelta,
+        after: Optional[tuple[datetime, UUID]] = None,
+        limit: int = 100,
+    ) -> DueSubscriptionPage:
+        """
+        Subscriptions to renew: active, auto-renewable and ending before
+        now + ``lookahead``, including those already past end_date.
+        """
+        subscriptions = await self.repository.list_due(
+            datetime.now(UTC) + lookahead, after, limit + 1
+        )
+        items = [
+            SubscriptionResponse.model_validate(subscription)
+            for subscription in subscriptions[:limit]
+        ]
+        next_cursor = None
+        if len(subscriptions) > limit:
+            next_cursor = encode_due_cursor(items[-1].end_date, items[-1].id)
+        return DueSubscriptionPage(items=items, next_cursor=next_cursor)
+
+    async def stream_subscriptions(
+        self, status: Optional[str] = None
+    ) -> AsyncIterator[SubscriptionResponse]:
+        async for row in self.repository.stream_subscriptions(status):
+            yield SubscriptionResponse.model_validate(row)
+
+    async def expire_subscriptions(
+        self, chunk_size: int = 1000, max_chunks: Optional[int] = None
+    ) -> ExpirationReport:
+        """
+        Expire every active subscription whose end_date has passed.
+
+        Each chunk is one transaction: the status UPDATE and the history
+        rows for the returned ids commit together, so an interrupted run
+        leaves no expired subscription without its history record.
+        """
+        started = time.perf_counter()
+        expired = chunks = 0
+        while max_chunks is None or chunks < max_chunks:
+            async with self.unit_of_work:
+                ids = await self.repository.expire_due(chunk_size)
+                await self.history_manager.add_records(
+                    ids, "expired", {"reason": "end_date passed"}
+                )
+            if not ids:
+                break
+            expired += len(ids)
+            chunks += 1
+            if len(ids) < chunk_size:
+                break
+
+        report = ExpirationReport(
+            expired=expired,
+            chunks=chunks,
+            elapsed_seconds=round(time.perf_counter() - started, 3),
+        )
+        logger.info(
+            "Expired %d subscriptions in %d chunks, %.3fs",
+            report.expired, report.chunks, report.elapsed_seconds,
+        )
+        return report
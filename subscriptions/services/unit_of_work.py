@@ -0,0 +1,23 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class UnitOfWork:
+    """
+    One transaction around a service operation.
+
+    Repositories and managers only flush; the block commits on exit or rolls
+    back on an exception, so a state change and its history record are
+    written together or not at all.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def __aenter__(self) -> "UnitOfWork":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            await self.session.commit()
+        else:
+            await self.session.rollback()
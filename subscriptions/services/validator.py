@@ -26,6 +26,15 @@ class SubscriptionValidator(ISubscriptionValidator):
         SubscriptionStatus.EXPIRED: {SubscriptionStatus.ACTIVE},
     }
 
+    @classmethod
+    def allowed_sources(cls, new_status: SubscriptionStatus) -> Set[SubscriptionStatus]:
+        """Статусы, из которых разрешен переход в new_status"""
+        return {
+            current
+            for current, targets in cls.ALLOWED_TRANSITIONS.items()
+            if new_status in targets
+        }
+
     async def validate_status_transition(
         self, current_status: str, new_status: str
     ) -> bool:
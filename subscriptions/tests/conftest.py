@@ -1,9 +1,15 @@
-from datetime import datetime, timedelta
+from datetime import UTC, datetime, timedelta
 from uuid import uuid4
 
 import pytest
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine
+)
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
 from subscriptions.core.config import settings
 from subscriptions.models.base_models import Base
@@ -57,3 +63,42 @@ async def active_subscription(db_session):
     db_session.add(subscription)
     await db_session.commit()
     return subscription
+
+
+@pytest.fixture
+def make_subscription():
+    """Фабрика несохраненных подписок: по умолчанию активная на 30 дней"""
+
+    def make(
+        end_date=None,
+        status=SubscriptionStatus.ACTIVE,
+        is_auto_renewable=False,
+    ):
+        end_date = end_date or datetime.now(UTC) + timedelta(days=30)
+        return Subscription(
+            user_id=uuid4(),
+            plan_type=SubscriptionPlanType.BASIC,
+            status=status,
+            start_date=end_date - timedelta(days=30),
+            end_date=end_date,
+            price=9.99,
+            is_auto_renewable=is_auto_renewable,
+            plan_id=uuid4(),
+        )
+
+    return make
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    """Фабрика сессий к чистой схеме; таблицы удаляются после теста"""
+    engine = create_async_engine(settings.database_url, poolclass=NullPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
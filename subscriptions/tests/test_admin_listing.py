@@ -0,0 +1,112 @@
+import json
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+
+from subscriptions.api.v1 import subscription_router
+from subscriptions.db.postgres import get_session
+from subscriptions.models.subscription import SubscriptionStatus
+from subscriptions.services.subscription_service import SubscriptionService
+
+pytestmark = pytest.mark.asyncio
+
+ACTIVE = 7
+EXPIRED = 3
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def subscriptions(session_factory, make_subscription):
+    async with session_factory() as session:
+        session.add_all(
+            make_subscription(status=status)
+            for status in [SubscriptionStatus.ACTIVE] * ACTIVE
+            + [SubscriptionStatus.EXPIRED] * EXPIRED
+        )
+        await session.commit()
+
+
+@pytest_asyncio.fixture
+async def client(session_factory, monkeypatch):
+    async def override_session():
+        async with session_factory() as session:
+            yield session
+
+    monkeypatch.setattr(subscription_router, "async_session", session_factory)
+    app = FastAPI()
+    app.include_router(subscription_router.router, prefix="/api/v1/subscription")
+    app.dependency_overrides[get_session] = override_session
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://test/api/v1/subscription"
+    ) as client:
+        yield client
+
+
+class TestSubscriptionPage:
+    async def test_pages_cover_all_rows_once(self, session_factory):
+        async with session_factory() as session:
+            service = SubscriptionService(session)
+            seen, cursor = [], None
+            while True:
+                page = await service.get_subscription_page(cursor, limit=3)
+                seen.extend(item.id for item in page.items)
+                cursor = page.next_cursor
+                if cursor is None:
+                    break
+
+        assert len(seen) == ACTIVE + EXPIRED
+        assert seen == sorted(seen)
+
+    async def test_exact_last_page_has_no_cursor(self, session_factory):
+        async with session_factory() as session:
+            page = await SubscriptionService(session).get_subscription_page(
+                limit=ACTIVE + EXPIRED
+            )
+
+        assert len(page.items) == ACTIVE + EXPIRED
+        assert page.next_cursor is None
+
+    async def test_stream_reads_all_rows(self, session_factory):
+        async with session_factory() as session:
+            service = SubscriptionService(session)
+            rows = [row async for row in service.stream_subscriptions()]
+
+        assert len(rows) == ACTIVE + EXPIRED
+
+
+class TestAdminEndpoints:
+    async def test_admin_all_filters_by_status(self, client):
+        response = await client.get(
+            "/admin/all", params={"status": "active", "limit": 5}
+        )
+
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["items"]) == 5
+        assert {item["status"] for item in page["items"]} == {"active"}
+
+        response = await client.get(
+            "/admin/all",
+            params={"status": "active", "limit": 5, "cursor": page["next_cursor"]},
+        )
+        page = response.json()
+        assert len(page["items"]) == ACTIVE - 5
+        assert page["next_cursor"] is None
+
+    async def test_admin_all_rejects_oversized_limit(self, client):
+        response = await client.get("/admin/all", params={"limit": 100_000})
+
+        assert response.status_code == 422
+
+    async def test_stream_is_ndjson(self, client):
+        response = await client.get(
+            "/admin/all/stream", params={"status": "expired"}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = response.text.splitlines()
+        assert len(lines) == EXPIRED
+        assert {json.loads(line)["status"] for line in lines} == {"expired"}
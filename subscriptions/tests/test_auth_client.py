@@ -0,0 +1,205 @@
+import asyncio
+import time
+
+import httpx
+import jwt
+import pytest
+import pytest_asyncio
+
+from subscriptions.core.auth_client import (
+    AuthClient,
+    AuthUnavailable,
+    CircuitBreaker,
+    InvalidCredentials
+)
+
+pytestmark = pytest.mark.asyncio
+
+ME_URL = "http://auth/api/v1/auth/me"
+USER = {"id": "42", "username": "user", "is_superuser": False, "roles": ["user"]}
+
+
+def make_token(exp_in=300, **claims):
+    return jwt.encode({"exp": int(time.time()) + exp_in, **claims}, "secret")
+
+
+class FakeAuth:
+    """auth /me: считает вызовы, умеет отвечать с задержкой и падать"""
+
+    def __init__(self):
+        self.calls = 0
+        self.status_code = 200
+        self.delay = 0.0
+        self.down = False
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.down:
+            raise httpx.ConnectError("auth is down", request=request)
+        assert request.headers["Authorization"].startswith("Bearer ")
+        if self.status_code != 200:
+            return httpx.Response(self.status_code, json={"detail": "error"})
+        return httpx.Response(200, json=USER)
+
+
+@pytest.fixture
+def fake_auth():
+    return FakeAuth()
+
+
+@pytest_asyncio.fixture
+async def client(fake_auth):
+    client = AuthClient(
+        ME_URL,
+        cache_ttl=30,
+        stale_ttl=300,
+        breaker=CircuitBreaker(fail_max=2, reset_timeout=60),
+        transport=httpx.MockTransport(fake_auth),
+    )
+    yield client
+    await client.aclose()
+
+
+class TestAuthClient:
+    async def test_returns_user_and_caches_it(self, client, fake_auth):
+        token = make_token()
+
+        assert await client.get_user(token) == USER
+        assert await client.get_user(token) == USER
+        assert fake_auth.calls == 1
+
+    async def test_cache_is_per_token(self, client, fake_auth):
+        await client.get_user(make_token(sub="a"))
+        await client.get_user(make_token(sub="b"))
+
+        assert fake_auth.calls == 2
+
+    async def test_concurrent_lookups_are_coalesced(self, client, fake_auth):
+        fake_auth.delay = 0.05
+        token = make_token()
+
+        users = await asyncio.gather(*(client.get_user(token) for _ in range(20)))
+
+        assert users == [USER] * 20
+        assert fake_auth.calls == 1
+        assert client._inflight == {}
+
+    async def test_cancelled_waiter_does_not_cancel_lookup(self, client, fake_auth):
+        fake_auth.delay = 0.05
+        token = make_token()
+
+        first = asyncio.ensure_future(client.get_user(token))
+        second = asyncio.ensure_future(client.get_user(token))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        assert await second == USER
+        assert fake_auth.calls == 1
+
+    async def test_rejected_token_is_not_cached(self, client, fake_auth):
+        fake_auth.status_code = 401
+        token = make_token()
+
+        for _ in range(2):
+            with pytest.raises(InvalidCredentials):
+                await client.get_user(token)
+        assert fake_auth.calls == 2
+        assert client.breaker.state == "closed"
+
+    async def test_unavailable_without_cached_user(self, client, fake_auth):
+        fake_auth.down = True
+
+        with pytest.raises(AuthUnavailable):
+            await client.get_user(make_token())
+
+    async def test_server_error_counts_as_failure(self, client, fake_auth):
+        fake_auth.status_code = 502
+
+        with pytest.raises(AuthUnavailable):
+            await client.get_user(make_token())
+        assert client.breaker.failures == 1
+
+    @pytest.mark.parametrize("status_code", [404, 422, 429])
+    async def test_client_errors_do_not_open_breaker(
+        self, client, fake_auth, status_code
+    ):
+        fake_auth.status_code = status_code
+
+        for _ in range(client.breaker.fail_max + 1):
+            with pytest.raises((InvalidCredentials, AuthUnavailable)):
+                await client.get_user(make_token())
+
+        assert client.breaker.state == "closed"
+        assert fake_auth.calls == client.breaker.fail_max + 1
+
+    async def test_rate_limited_serves_stale_user(self, client, fake_auth):
+        client.cache.ttl = 0
+        token = make_token()
+        assert await client.get_user(token) == USER
+
+        fake_auth.status_code = 429
+
+        assert await client.get_user(token) == USER
+        with pytest.raises(AuthUnavailable):
+            await client.get_user(make_token(sub="other"))
+
+    async def test_not_found_user_is_rejected(self, client, fake_auth):
+        fake_auth.status_code = 404
+
+        with pytest.raises(InvalidCredentials):
+            await client.get_user(make_token())
+
+    async def test_stale_user_served_while_auth_is_down(self, client, fake_auth):
+        # Ответ сразу перестает быть свежим и годится только как запасной
+        client.cache.ttl = 0
+        token = make_token()
+        await client.get_user(token)
+        fake_auth.down = True
+
+        assert await client.get_user(token) == USER
+        assert fake_auth.calls == 2
+
+    async def test_expired_token_is_never_served_stale(self, client, fake_auth):
+        token = make_token(exp_in=-1)
+        await client.get_user(token)
+        fake_auth.down = True
+
+        with pytest.raises(AuthUnavailable):
+            await client.get_user(token)
+
+    async def test_open_breaker_skips_auth(self, client, fake_auth):
+        fake_auth.down = True
+        for _ in range(2):
+            with pytest.raises(AuthUnavailable):
+                await client.get_user(make_token(sub="x"))
+        assert client.breaker.state == "open"
+
+        calls = fake_auth.calls
+        with pytest.raises(AuthUnavailable):
+            await client.get_user(make_token(sub="y"))
+        assert fake_auth.calls == calls
+
+    async def test_breaker_closes_after_successful_probe(self, client, fake_auth):
+        fake_auth.down = True
+        for _ in range(2):
+            with pytest.raises(AuthUnavailable):
+                await client.get_user(make_token(sub="x"))
+        client.breaker.reset_timeout = 0
+        fake_auth.down = False
+
+        assert await client.get_user(make_token(sub="y")) == USER
+        assert client.breaker.state == "closed"
+
+
+class TestCircuitBreaker:
+    async def test_half_open_lets_one_probe_through(self):
+        breaker = CircuitBreaker(fail_max=1, reset_timeout=0)
+        breaker.record_failure()
+
+        assert breaker.state == "half_open"
+        assert breaker.allow() is True
+        assert breaker.allow() is False
+
+        breaker.record_failure()
+        assert breaker.allow() is True
@@ -0,0 +1,110 @@
+import time
+from unittest.mock import patch
+
+import httpx
+import jwt
+import pytest
+from fastapi import FastAPI, Request
+
+from subscriptions.middlewares.auth_middleware import (
+    AuthConfig,
+    AuthMiddleware,
+    PublicPathMatcher
+)
+
+pytestmark = pytest.mark.asyncio
+
+SECRET = "test_secret_key"
+
+
+def make_token(exp_in=300, **claims):
+    return jwt.encode(
+        {"user_id": "42", "exp": int(time.time()) + exp_in, **claims}, SECRET
+    )
+
+
+def build_app(**config) -> FastAPI:
+    app = FastAPI(root_path="/api/subscriptions")
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    @app.get("/api/v1/subscription/me")
+    async def me(request: Request):
+        return request.state.user
+
+    app.add_middleware(AuthMiddleware, config=AuthConfig(secret_key=SECRET, **config))
+    return app
+
+
+@pytest.fixture
+def client():
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=build_app()), base_url="http://test"
+    )
+
+
+class TestPublicPathMatcher:
+    async def test_exact_and_doc_suffix_paths(self):
+        matcher = PublicPathMatcher(["/health"])
+
+        assert matcher.matches("/health", "/api/subscriptions/health")
+        assert matcher.matches(
+            "/api/openapi.json", "/api/subscriptions/api/openapi.json"
+        )
+        assert not matcher.matches("/api/v1/subscription/", "/api/v1/subscription/")
+        assert not matcher.matches("/healthz", "/healthz")
+
+
+class TestAuthMiddleware:
+    async def test_public_path_needs_no_token(self, client):
+        response = await client.get("/health")
+
+        assert response.status_code == 200
+
+    async def test_missing_header(self, client):
+        response = await client.get("/api/v1/subscription/me")
+
+        assert response.status_code == 401
+        assert response.json() == {"detail": "Missing authentication header"}
+
+    async def test_wrong_prefix(self, client):
+        response = await client.get(
+            "/api/v1/subscription/me", headers={"Authorization": "Token abc"}
+        )
+
+        assert response.status_code == 401
+
+    async def test_valid_token_sets_request_user(self, client):
+        response = await client.get(
+            "/api/v1/subscription/me",
+            headers={"Authorization": f"Bearer {make_token()}"},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["user_id"] == "42"
+
+    async def test_invalid_and_expired_tokens(self, client):
+        cases = (
+            (jwt.encode({"exp": int(time.time()) + 60}, "other"), "Invalid token"),
+            (make_token(exp_in=-10), "Token has expired"),
+        )
+        for token, detail in cases:
+            response = await client.get(
+                "/api/v1/subscription/me", headers={"Authorization": f"Bearer {token}"}
+            )
+            assert response.status_code == 401
+            assert response.json() == {"detail": detail}
+
+    async def test_verified_claims_are_cached(self, client):
+        headers = {"Authorization": f"Bearer {make_token()}"}
+
+        with patch(
+            "subscriptions.middlewares.auth_middleware.jwt.decode", wraps=jwt.decode
+        ) as decode:
+            for _ in range(3):
+                response = await client.get("/api/v1/subscription/me", headers=headers)
+                assert response.status_code == 200
+
+        assert decode.call_count == 1
@@ -0,0 +1,167 @@
+import os
+from contextlib import suppress
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from subscriptions.models.subscription import SubscriptionStatus
+from subscriptions.services.repository import SubscriptionRepository
+from subscriptions.services.subscription_service import (
+    SubscriptionService,
+    decode_due_cursor,
+    encode_due_cursor
+)
+
+pytestmark = pytest.mark.asyncio
+
+# Размер таблицы для проверки плана; 0 отключает тест
+EXPLAIN_ROWS = int(os.getenv("SUB_EXPLAIN_TEST_ROWS", "0"))
+
+
+@pytest_asyncio.fixture
+async def due(session_factory, make_subscription):
+    """Подписки, попадающие в окно 24 часа; остальные в него не входят"""
+    now = datetime.now(UTC)
+
+    def renewable(end_date, status=SubscriptionStatus.ACTIVE):
+        return make_subscription(end_date, status, is_auto_renewable=True)
+
+    due = [
+        renewable(now - timedelta(hours=2)),
+        renewable(now + timedelta(hours=1)),
+        renewable(now + timedelta(hours=1)),
+        renewable(now + timedelta(hours=20)),
+    ]
+    async with session_factory() as session:
+        session.add_all(due)
+        session.add_all(
+            [
+                renewable(now + timedelta(days=3)),
+                make_subscription(now + timedelta(hours=1)),
+                renewable(now + timedelta(hours=1), SubscriptionStatus.SUSPENDED),
+                renewable(now - timedelta(hours=1), SubscriptionStatus.EXPIRED),
+            ]
+        )
+        await session.commit()
+    return sorted(due, key=lambda item: (item.end_date, item.id))
+
+
+class TestDueSubscriptions:
+    async def test_window_selects_active_renewable(self, session_factory, due):
+        async with session_factory() as session:
+            page = await SubscriptionService(session).get_due_page(
+                timedelta(hours=24)
+            )
+
+        assert [item.id for item in page.items] == [item.id for item in due]
+        assert page.next_cursor is None
+
+    async def test_lookahead_narrows_window(self, session_factory, due):
+        async with session_factory() as session:
+            page = await SubscriptionService(session).get_due_page(timedelta(0))
+
+        assert [item.id for item in page.items] == [due[0].id]
+
+    async def test_keyset_pages_in_end_date_order(self, session_factory, due):
+        seen, after = [], None
+        async with session_factory() as session:
+            service = SubscriptionService(session)
+            while True:
+                page = await service.get_due_page(timedelta(hours=24), after, 1)
+                seen.extend(item.id for item in page.items)
+                if page.next_cursor is None:
+                    break
+                after = decode_due_cursor(page.next_cursor)
+
+        assert seen == [item.id for item in due]
+
+    async def test_cursor_round_trip_and_rejection(self):
+        end_date, subscription_id = datetime.now(UTC), uuid4()
+
+        cursor = encode_due_cursor(end_date, subscription_id)
+
+        assert decode_due_cursor(cursor) == (end_date, subscription_id)
+        with pytest.raises(ValueError):
+            decode_due_cursor("not-a-cursor")
+
+
+async def captured_query(method: str, *args):
+    """Запрос, который строит метод репозитория, без обращения к базе"""
+    captured = []
+
+    class CapturingSession:
+        async def execute(self, query):
+            captured.append(query)
+            raise LookupError
+
+    with suppress(LookupError):
+        await getattr(SubscriptionRepository(CapturingSession()), method)(*args)
+    return captured[0]
+
+
+@pytest.mark.skipif(
+    not EXPLAIN_ROWS, reason="set SUB_EXPLAIN_TEST_ROWS, e.g. 10000000"
+)
+class TestQueryPlans:
+    """
+    Регрессия планов: при большой таблице выборка к продлению и массовое
+    истечение должны идти по частичным индексам, а не последовательным
+    сканированием. Загрузка 10M строк занимает несколько минут, поэтому
+    все планы проверяются в одном тесте.
+    """
+
+    @pytest_asyncio.fixture
+    async def large_table(self, session_factory):
+        async with session_factory() as session:
+            await session.execute(
+                text(
+                    """
+                    INSERT INTO subscriptions (
+                        id, user_id, plan_type, status, start_date, end_date,
+                        price, is_auto_renewable, plan_id, created_at, updated_at
+                    )
+                    SELECT
+                        gen_random_uuid(), gen_random_uuid(), 'BASIC',
+                        (ARRAY['ACTIVE', 'EXPIRED', 'CANCELED', 'SUSPENDED'])
+                            [1 + g % 4]::subscriptionstatus,
+                        now() - interval '30 days',
+                        now() + (g % 365 - 180) * interval '1 day',
+                        9.99, g % 3 = 0, gen_random_uuid(), now(), now()
+                    FROM generate_series(1, :rows) AS g
+                    """
+                ),
+                {"rows": EXPLAIN_ROWS},
+            )
+            await session.execute(text("ANALYZE subscriptions"))
+            await session.commit()
+
+    async def explain(self, session_factory, query) -> str:
+        sql = query.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+        async with session_factory() as session:
+            result = await session.execute(text(f"EXPLAIN {sql}"))
+        return "\n".join(row[0] for row in result)
+
+    async def test_plans_use_partial_indexes(self, session_factory, large_table):
+        due_before = datetime.now(UTC) + timedelta(hours=24)
+        keyset = (datetime.now(UTC) - timedelta(days=90), uuid4())
+
+        for after in (None, keyset):
+            plan = await self.explain(
+                session_factory,
+                await captured_query("list_due", due_before, after, 101),
+            )
+            assert "idx_subscriptions_due_renewal" in plan, plan
+            assert "Seq Scan" not in plan, plan
+            assert "Sort" not in plan, plan
+
+        plan = await self.explain(
+            session_factory, await captured_query("expire_due", 1000)
+        )
+        assert "idx_subscriptions_active_end_date" in plan, plan
+        assert "Seq Scan" not in plan, plan
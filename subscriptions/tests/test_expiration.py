@@ -0,0 +1,103 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+
+from subscriptions.models.subscription import (
+    Subscription,
+    SubscriptionHistory,
+    SubscriptionStatus
+)
+from subscriptions.services.subscription_service import SubscriptionService
+
+pytestmark = pytest.mark.asyncio
+
+OVERDUE = 25
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def subscriptions(session_factory, make_subscription):
+    now = datetime.now(UTC)
+    async with session_factory() as session:
+        session.add_all(
+            make_subscription(now - timedelta(hours=1)) for _ in range(OVERDUE)
+        )
+        session.add_all(
+            [
+                make_subscription(now + timedelta(days=1)),
+                make_subscription(
+                    now - timedelta(days=1), SubscriptionStatus.SUSPENDED
+                ),
+                make_subscription(
+                    now - timedelta(days=1), SubscriptionStatus.CANCELED
+                ),
+            ]
+        )
+        await session.commit()
+
+
+async def count_by_status(session):
+    result = await session.execute(
+        select(Subscription.status, func.count()).group_by(Subscription.status)
+    )
+    return dict(result.all())
+
+
+class TestBulkExpiration:
+    async def test_expires_only_overdue_active(self, session_factory):
+        async with session_factory() as session:
+            report = await SubscriptionService(session).expire_subscriptions(
+                chunk_size=10
+            )
+
+        assert report.expired == OVERDUE
+        assert report.chunks == 3
+        assert report.elapsed_seconds >= 0
+
+        async with session_factory() as session:
+            counts = await count_by_status(session)
+        assert counts == {
+            SubscriptionStatus.EXPIRED: OVERDUE,
+            SubscriptionStatus.ACTIVE: 1,
+            SubscriptionStatus.SUSPENDED: 1,
+            SubscriptionStatus.CANCELED: 1,
+        }
+
+    async def test_history_row_per_expired_subscription(self, session_factory):
+        async with session_factory() as session:
+            await SubscriptionService(session).expire_subscriptions(chunk_size=10)
+
+            result = await session.execute(
+                select(SubscriptionHistory.subscription_id).filter(
+                    SubscriptionHistory.action == "expired"
+                )
+            )
+            history_ids = set(result.scalars().all())
+            result = await session.execute(
+                select(Subscription.id).filter(
+                    Subscription.status == SubscriptionStatus.EXPIRED
+                )
+            )
+
+        assert history_ids == set(result.scalars().all())
+        assert len(history_ids) == OVERDUE
+
+    async def test_max_chunks_bounds_a_run(self, session_factory):
+        async with session_factory() as session:
+            service = SubscriptionService(session)
+
+            first = await service.expire_subscriptions(chunk_size=10, max_chunks=1)
+            rest = await service.expire_subscriptions(chunk_size=10)
+
+        assert (first.expired, first.chunks) == (10, 1)
+        assert rest.expired == OVERDUE - 10
+
+    async def test_second_run_is_a_no_op(self, session_factory):
+        async with session_factory() as session:
+            service = SubscriptionService(session)
+            await service.expire_subscriptions()
+
+            report = await service.expire_subscriptions()
+
+        assert (report.expired, report.chunks) == (0, 0)
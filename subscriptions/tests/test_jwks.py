@@ -0,0 +1,122 @@
+import uuid
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock
+
+import httpx
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ed25519
+from jwt.algorithms import OKPAlgorithm
+
+from subscriptions.core.jwks import JWKSUnavailable, JWKSVerifier, claims_to_user
+
+pytestmark = pytest.mark.asyncio
+
+
+def make_key(kid):
+    private_key = ed25519.Ed25519PrivateKey.generate()
+    jwk = OKPAlgorithm.to_jwk(private_key.public_key(), as_dict=True)
+    return private_key, {**jwk, "kid": kid, "alg": "EdDSA", "use": "sig"}
+
+
+def make_token(private_key, kid, **extra):
+    now = datetime.now(UTC)
+    claims = {
+        "user_id": str(uuid.uuid4()),
+        "username": "user",
+        "is_superuser": False,
+        "roles": ["user"],
+        "token_type": "access",
+        "jti": str(uuid.uuid4()),
+        "iat": now,
+        "exp": now + timedelta(minutes=5),
+        **extra,
+    }
+    return jwt.encode(claims, private_key, algorithm="EdDSA", headers={"kid": kid})
+
+
+@pytest.fixture
+def signing_key():
+    return make_key("current")
+
+
+@pytest.fixture
+def verifier(signing_key):
+    verifier = JWKSVerifier("http://auth/.well-known/jwks.json")
+    verifier._fetch_jwks = AsyncMock(return_value={"keys": [signing_key[1]]})
+    return verifier
+
+
+class TestJWKSVerifier:
+    async def test_verifies_access_token(self, verifier, signing_key):
+        token = make_token(signing_key[0], "current", permissions_version=4)
+
+        user = claims_to_user(await verifier.verify(token))
+
+        assert user["username"] == "user"
+        assert user["roles"] == ["user"]
+        assert user["permissions_version"] == 4
+
+    async def test_keys_are_cached(self, verifier, signing_key):
+        for _ in range(3):
+            await verifier.verify(make_token(signing_key[0], "current"))
+
+        assert verifier._fetch_jwks.await_count == 1
+
+    async def test_rejects_refresh_token(self, verifier, signing_key):
+        token = make_token(signing_key[0], "current", token_type="refresh")
+
+        with pytest.raises(jwt.InvalidTokenError):
+            await verifier.verify(token)
+
+    async def test_rejects_expired_token(self, verifier, signing_key):
+        token = make_token(
+            signing_key[0], "current", exp=datetime.now(UTC) - timedelta(minutes=1)
+        )
+
+        with pytest.raises(jwt.ExpiredSignatureError):
+            await verifier.verify(token)
+
+    async def test_rejects_bad_signature(self, verifier):
+        other_key, _ = make_key("current")
+
+        with pytest.raises(jwt.InvalidSignatureError):
+            await verifier.verify(make_token(other_key, "current"))
+
+    async def test_unknown_kid_refreshes_keys(self, verifier, signing_key):
+        await verifier.verify(make_token(signing_key[0], "current"))
+        new_key = make_key("next")
+        verifier._fetch_jwks.return_value = {"keys": [signing_key[1], new_key[1]]}
+        verifier.min_refresh_interval = 0
+
+        claims = await verifier.verify(make_token(new_key[0], "next"))
+
+        assert claims["token_type"] == "access"
+        assert verifier._fetch_jwks.await_count == 2
+
+    async def test_unknown_kid_refresh_is_throttled(self, verifier, signing_key):
+        await verifier.verify(make_token(signing_key[0], "current"))
+        forged_key, _ = make_key("forged")
+
+        for _ in range(5):
+            with pytest.raises(jwt.InvalidKeyError):
+                await verifier.verify(make_token(forged_key, "forged"))
+
+        assert verifier._fetch_jwks.await_count == 1
+
+    async def test_unavailable_without_keys(self, verifier, signing_key):
+        verifier._fetch_jwks.side_effect = httpx.ConnectError("auth is down")
+
+        with pytest.raises(JWKSUnavailable):
+            await verifier.verify(make_token(signing_key[0], "current"))
+
+    async def test_stale_keys_kept_when_auth_is_down(self, verifier, signing_key):
+        await verifier.verify(make_token(signing_key[0], "current"))
+        verifier._fetch_jwks.side_effect = httpx.ConnectError("auth is down")
+        verifier.cache_ttl = 0
+        verifier.min_refresh_interval = 0
+
+        claims = await verifier.verify(make_token(signing_key[0], "current"))
+
+        assert claims["token_type"] == "access"
+        assert verifier._fetch_jwks.await_count == 2
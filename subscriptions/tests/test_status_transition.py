@@ -0,0 +1,166 @@
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event
+
+from subscriptions.core.exceptions import (
+    InvalidStatusTransitionException,
+    SubscriptionNotFoundException
+)
+from subscriptions.models.subscription import (
+    Subscription,
+    SubscriptionPlanType,
+    SubscriptionStatus
+)
+from subscriptions.services.status_manager import SubscriptionStatusManager
+from subscriptions.services.subscription_service import SubscriptionService
+from subscriptions.services.validator import SubscriptionValidator
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest_asyncio.fixture
+async def session(session_factory):
+    async with session_factory() as session:
+        yield session
+
+
+async def add_subscription(session, status):
+    now = datetime.now(UTC)
+    subscription = Subscription(
+        user_id=uuid4(),
+        plan_type=SubscriptionPlanType.BASIC,
+        status=status,
+        start_date=now,
+        end_date=now + timedelta(days=30),
+        price=9.99,
+        plan_id=uuid4(),
+    )
+    session.add(subscription)
+    await session.commit()
+    return subscription.id
+
+
+@pytest.fixture
+def statements(session):
+    """Тексты SQL, выполненные сессией во время теста"""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    engine = session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
+
+
+class TestAllowedSources:
+    async def test_sources_mirror_transition_table(self):
+        assert SubscriptionValidator.allowed_sources(SubscriptionStatus.ACTIVE) == {
+            SubscriptionStatus.PENDING,
+            SubscriptionStatus.SUSPENDED,
+            SubscriptionStatus.EXPIRED,
+        }
+        assert not SubscriptionValidator.allowed_sources(SubscriptionStatus.PENDING)
+
+
+class TestStatusTransition:
+    async def test_allowed_transition_is_one_update(self, session, statements):
+        subscription_id = await add_subscription(session, SubscriptionStatus.ACTIVE)
+        statements.clear()
+
+        subscription = await SubscriptionStatusManager(session).transition(
+            subscription_id, SubscriptionStatus.SUSPENDED
+        )
+
+        assert subscription.status == SubscriptionStatus.SUSPENDED
+        assert len(statements) == 1
+        assert statements[0].startswith("UPDATE subscriptions")
+
+    async def test_disallowed_transition_is_rejected(self, session):
+        subscription_id = await add_subscription(session, SubscriptionStatus.CANCELED)
+
+        with pytest.raises(InvalidStatusTransitionException) as error:
+            await SubscriptionStatusManager(session).transition(
+                subscription_id, SubscriptionStatus.ACTIVE
+            )
+
+        assert error.value.status_code == 400
+        service = SubscriptionService(session)
+        assert (await service.get_subscription(subscription_id)).status == "canceled"
+
+    async def test_missing_subscription_is_not_found(self, session):
+        with pytest.raises(SubscriptionNotFoundException):
+            await SubscriptionStatusManager(session).transition(
+                uuid4(), SubscriptionStatus.SUSPENDED
+            )
+
+    async def test_update_without_prior_read(self, session, statements):
+        subscription_id = await add_subscription(session, SubscriptionStatus.ACTIVE)
+        statements.clear()
+        end_date = datetime.now(UTC) + timedelta(days=60)
+
+        subscription = await SubscriptionService(session).repository.update(
+            subscription_id, {"end_date": end_date}
+        )
+
+        assert subscription.end_date == end_date
+        assert not [sql for sql in statements if sql.startswith("SELECT")]
+
+    async def test_update_missing_subscription(self, session):
+        with pytest.raises(SubscriptionNotFoundException):
+            await SubscriptionService(session).repository.update(
+                uuid4(), {"is_auto_renewable": True}
+            )
+
+
+class TestUnitOfWork:
+    async def test_status_and_history_share_one_commit(self, session):
+        subscription_id = await add_subscription(session, SubscriptionStatus.ACTIVE)
+        commits = []
+
+        def record(conn):
+            commits.append(conn)
+
+        engine = session.bind.sync_engine
+        event.listen(engine, "commit", record)
+        try:
+            await SubscriptionService(session).suspend_subscription(
+                subscription_id, "Payment failed"
+            )
+        finally:
+            event.remove(engine, "commit", record)
+
+        assert len(commits) == 1
+        history = await SubscriptionService(session).get_subscription_history(
+            subscription_id
+        )
+        assert [entry.action for entry in history] == ["suspended"]
+
+    async def test_failed_history_rolls_back_status(self, session, monkeypatch):
+        subscription_id = await add_subscription(session, SubscriptionStatus.ACTIVE)
+        service = SubscriptionService(session)
+
+        async def fail(*args, **kwargs):
+            raise RuntimeError("history unavailable")
+
+        monkeypatch.setattr(service.history_manager, "add_record", fail)
+        with pytest.raises(RuntimeError):
+            await service.suspend_subscription(subscription_id, "Payment failed")
+
+        subscription = await service.get_subscription(subscription_id)
+        assert subscription.status == SubscriptionStatus.ACTIVE
+
+    async def test_resume_without_comment_records_history(self, session):
+        subscription_id = await add_subscription(session, SubscriptionStatus.SUSPENDED)
+        service = SubscriptionService(session)
+
+        await service.resume_subscription(subscription_id, None)
+
+        history = await service.get_subscription_history(subscription_id)
+        assert [(entry.action, entry.details) for entry in history] == [
+            ("resumed", {})
+        ]